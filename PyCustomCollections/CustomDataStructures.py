@@ -7,12 +7,42 @@
 
 from __future__ import annotations
 
+import asyncio
+import gc
+import json
 import logging
+import pickle
+import re
+import struct
+import sys
 import traceback
-from difflib import get_close_matches as fmatch
-from collections import defaultdict, Counter
+import zlib
+from mmap import mmap, ACCESS_READ
+from multiprocessing import get_all_start_methods, get_context
+from os import PathLike, fstat, fspath, replace
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from difflib import get_close_matches as fmatch, SequenceMatcher
+from collections import defaultdict, Counter, OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from copy import copy
+from functools import lru_cache, partial, reduce, wraps
+from heapq import merge, nlargest, nsmallest
+from inspect import signature
+from keyword import iskeyword
+from itertools import accumulate, chain, compress, groupby, islice, repeat
+from operator import and_, or_, is_, itemgetter, sub, eq, ne, lt, le, gt, ge
 from argparse import Namespace
-from typing import Hashable, Any, Union, Optional, List, Tuple, Type, Iterable, Dict, Callable, no_type_check, Generator
+from threading import Condition, Lock, active_count, get_ident, local
+from weakref import finalize
+from typing import Hashable, Any, Union, Optional, List, Tuple, Type, Iterable, Iterator, Dict, Callable, \
+    no_type_check, Generator, AsyncIterator, SupportsIndex
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None  # type: ignore
 
 
 VERSION = '1.0a'
@@ -618,6 +648,170 @@ class IndexList(KeyedList):
         return results
 
 
+class Tokenizer:
+    """ <a name="Tokenizer"></a>
+        Tokenizer turns a line of text into a row, a list of strings, and is what 'read_rows' and 'KeyedTable.ingest'
+        use to split log files and command output. How it splits depends on which argument is given:
+
+        * Nothing: splits on runs of whitespace like str.split(). 'maxsplit' limits the number of splits which keeps
+            spaces in the last column, IE: the COMMAND column of 'ps aux'.
+        * delimiter: splits on the delimiter like str.split(delimiter, maxsplit). Cells are stripped of surrounding
+            whitespace unless strip=False.
+        * widths: cuts the line into fixed width cells. A width of None takes the rest of the line. Cells are stripped
+            unless strip=False.
+        * pattern: a regular expression, either a string or compiled. The groups of the first match in the line become
+            the cells and the names of named groups become 'columns'.
+
+        Calling the Tokenizer returns the row or None for lines that should be skipped, which are blank lines and lines
+        the pattern does not match.
+
+        :var columns: A dictionary of column name -> number taken from the named groups of 'pattern', otherwise empty.
+    """
+
+    def __init__(self, delimiter: Optional[str] = None, widths: Optional[Iterable[Optional[int]]] = None,
+                 pattern: Optional[Union[str, re.Pattern]] = None, maxsplit: int = -1, strip: bool = True):
+        if sum(option is not None for option in (delimiter, widths, pattern)) > 1:
+            raise ValueError('Only one of delimiter, widths or pattern can be used')
+        self.delimiter = delimiter
+        self.maxsplit = maxsplit
+        self.strip = strip
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.columns: dict = {}
+        if self.pattern is not None:
+            self.columns = {name: number - 1 for name, number in self.pattern.groupindex.items()}
+        self.slices: Optional[List[slice]] = None
+        if widths is not None:
+            self.slices = []
+            start = 0
+            for width in widths:
+                self.slices.append(slice(start, None if width is None else start + width))
+                if width is None:
+                    break
+                start += width
+
+    def __call__(self, line: str) -> Optional[list]:
+        line = line.rstrip('\r\n')
+        if self.pattern is not None:
+            match = self.pattern.search(line)
+            return None if match is None else list(match.groups())
+        if not line or line.isspace():
+            return None
+        if self.slices is not None:
+            cells = [line[cut] for cut in self.slices]
+        elif self.delimiter is not None:
+            cells = line.split(self.delimiter, self.maxsplit)
+        else:
+            return line.split(None, self.maxsplit)
+        return [cell.strip() for cell in cells] if self.strip else cells
+
+    def with_maxsplit(self, maxsplit: int) -> Tokenizer:
+        """ Returns a copy of this Tokenizer that splits at most 'maxsplit' times """
+        tokenizer = copy(self)
+        tokenizer.maxsplit = maxsplit
+        return tokenizer
+
+    def for_header(self, names: list) -> Tokenizer:
+        """ Returns the Tokenizer to use for the rows below a header row of 'names'. When splitting on whitespace
+            without a maxsplit that is a copy that splits each row into at most as many cells as the header has, so
+            the last column keeps its spaces. Otherwise it is this Tokenizer.
+        """
+        if self.pattern is None and self.slices is None and self.delimiter is None and self.maxsplit < 0:
+            return self.with_maxsplit(len(names) - 1)
+        return self
+
+
+def read_lines(source: Any, encoding: str = 'utf-8') -> Generator[str, None, None]:
+    """ Generator that yields the lines of a source one at a time. The source can be a path, which is opened and
+        closed again once the generator is done, a file object, the stdout of a subprocess or a Popen object itself, or
+        any other iterable of lines. Lines that are bytes are decoded using 'encoding'.
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, encoding=encoding, errors='replace') as lines:
+            yield from lines
+        return None
+    if not hasattr(source, '__iter__') and hasattr(source, 'stdout'):
+        source = source.stdout
+    for line in source:
+        yield line.decode(encoding, 'replace') if isinstance(line, bytes) else line
+
+
+def read_rows(source: Any, tokenizer: Optional[Tokenizer] = None, skip: int = 0,
+              encoding: str = 'utf-8') -> Generator[list, None, None]:
+    """ Generator that reads a source line by line, read 'read_lines', and yields every line split by 'tokenizer' into
+        a row. Only one line is held in memory at a time. Lines the tokenizer skips are not yielded.
+
+    :param source: A path, file object, subprocess stdout or iterable of lines.
+    :param tokenizer: (Tokenizer) defaults to Tokenizer() which splits on whitespace.
+    :param skip: (int: 0) the number of lines to skip first.
+    :param encoding: (str: utf-8) used to open paths and decode bytes.
+    :return: Generator of lists
+    """
+    tokenizer = tokenizer or Tokenizer()
+    lines = read_lines(source, encoding)
+    try:
+        for row in map(tokenizer, islice(lines, skip, None)):
+            if row is not None:
+                yield row
+    finally:
+        lines.close()
+
+
+@lru_cache(maxsize=None)
+def record_class(fields: Tuple[Tuple[Hashable, int], ...]) -> Type[tuple]:
+    """ Returns the row class of a KeyedTable created with records=True. It is a tuple with empty __slots__, so it is
+        no larger than a tuple, plus a read only attribute for every column named with a valid identifier that does
+        not clash with a method of tuple or start with an underscore. Tables with the same columns share the class.
+
+    :param fields: A tuple of the (name, number) pairs of the columns of the table.
+    :return: A subclass of tuple
+    """
+    namespace: Dict[str, Any] = {'__slots__': (), '_fields': fields, '__reduce__': _reduce_record}
+    for name, number in fields:
+        if isinstance(name, str) and name.isidentifier() and not iskeyword(name) and not name.startswith('_') and \
+                not hasattr(tuple, name):
+            namespace[name] = property(itemgetter(number), doc=f'The {name!r} column of the row')
+    return type('Record', (tuple,), namespace)
+
+
+def _reduce_record(record: tuple) -> tuple:
+    """ The __reduce__ of the classes made by 'record_class', which pickles a record as its fields and cells """
+    return _make_record, (getattr(record, '_fields'), tuple(record))
+
+
+def _make_record(fields: Tuple[Tuple[Hashable, int], ...], cells: tuple) -> tuple:
+    """ Rebuilds a pickled record """
+    return record_class(fields)(cells)
+
+
+_gc_pauses: Dict[str, Any] = {'count': 0, 'resume': False}
+_gc_pauses_lock = Lock()
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """ Pauses the garbage collector for the duration of a with block, or of a function when used as a decorator. The
+        collector otherwise keeps rescanning every container made while building large tables, indexes or results,
+        which can make bulk work like 'IndexedTable.load', 'join' or 'group_by' over millions of rows twice as slow.
+        IE: with paused_gc(): table = IndexedTable.load('ps.snapshot'). Apart from building the index of a large
+        IndexedTable, the tables leave the collector alone, so pausing it is up to the caller, who knows whether any
+        cyclic garbage can pile up meanwhile.
+        Pauses are counted across threads, the collector is only turned back on when the last one ends and only if
+        it was on when the first one began.
+    """
+    with _gc_pauses_lock:
+        if not _gc_pauses['count']:
+            _gc_pauses['resume'] = gc.isenabled()
+            gc.disable()
+        _gc_pauses['count'] += 1
+    try:
+        yield
+    finally:
+        with _gc_pauses_lock:
+            _gc_pauses['count'] -= 1
+            if not _gc_pauses['count'] and _gc_pauses['resume']:
+                gc.enable()
+
+
 class KeyedTable(list):
     """ <a name="KeyedTable"></a>
         KeyedTable is designed to act like a Table. A list of lists where it's rows are numbered and its columns are
@@ -626,16 +820,101 @@ class KeyedTable(list):
         represent a position in each item on the KeyedList. For example: a template of {'ID': 0} means that:
         KeyedList['ID'] would return all the values of item[0] in its list or [item[0] for item in self].
 
+        Numeric columns can be filtered with 'indices_of_where', which converts the column once with 'typed_column'
+        and keeps it until the table is changed. If NumPy is installed int and float columns become NumPy arrays and
+        the comparisons run over the whole array at once, otherwise it falls back to plain Python lists.
+
+        Setting frozen=True on init stores every row added to the table as a tuple, which is smaller than a list and
+        cannot be changed behind the back of the table, or of the index of an IndexedTable. Setting records=True stores
+        them as instances of 'row_type' instead, a tuple that also reads its cells as attributes named after the
+        columns. IE: table[0].PID. Rows of any other type are converted as they are added, lists passed to 'index',
+        'count', 'remove' and 'in' are compared as tuples. ColumnarTable and MappedTable build new rows every time
+        they are read and ignore both.
+
         :var columns: A dictionary. Its values MUST BE INTEGERS
+        :var generation: An int that is bumped by every list method that changes the rows.
+        :var frozen: True when rows are stored as tuples.
+        :var records: True when rows are stored as 'row_type' records.
     """
 
     columns: dict = {}
+    generation: int = 0
+    frozen: bool = False
+    records: bool = False
+    _comparisons: Dict[str, Callable] = {'==': eq, '!=': ne, '<': lt, '<=': le, '>': gt, '>=': ge}
 
-    def __init__(self, *args, columns: Optional[Dict] = None):
+    def __init__(self, *args, columns: Optional[Dict] = None, frozen: Optional[bool] = None,
+                 records: Optional[bool] = None):
         self.columns = columns or {}
         if len([value for value in self.columns.values() if type(value) != int]) > 0:
             raise TypeError('The columns dictionary values must be integers')
-        super().__init__(*args)
+        if frozen is not None:
+            self.frozen = frozen
+        if records is not None:
+            self.records = records
+        self.__typed: dict = {}
+        self.__typed_generation = -1
+        super().__init__(*map(self._frozen, args))
+
+    @property
+    def row_type(self) -> type:
+        """ The type rows are stored as, list unless the table was created with frozen or records """
+        if self.records:
+            return record_class(tuple(self.columns.items()))
+        return tuple if self.frozen else list
+
+    def __setitem__(self, index, value):
+        self.generation += 1
+        super().__setitem__(index, self._frozen(value) if isinstance(index, slice) else self._frozen_row(value))
+
+    def __contains__(self, value: Any) -> bool:
+        return super().__contains__(self._probe(value))
+
+    def __delitem__(self, index):
+        self.generation += 1
+        super().__delitem__(index)
+
+    def __iadd__(self, other):  # type: ignore[misc]
+        self.generation += 1
+        return super().__iadd__(self._frozen(other))
+
+    def append(self, value: Any) -> None:
+        self.generation += 1
+        super().append(self._frozen_row(value))
+
+    def extend(self, values: Iterable) -> None:
+        self.generation += 1
+        super().extend(self._frozen(values))
+
+    def insert(self, index, value) -> None:
+        self.generation += 1
+        super().insert(index, self._frozen_row(value))
+
+    def index(self, value: Any, *args) -> int:  # type: ignore[override]
+        return super().index(self._probe(value), *args)
+
+    def count(self, value: Any) -> int:
+        return super().count(self._probe(value))
+
+    def pop(self, index=-1):
+        self.generation += 1
+        return super().pop(index)
+
+    def remove(self, value) -> None:
+        self.generation += 1
+        super().remove(self._probe(value))
+
+    def clear(self) -> None:
+        self.generation += 1
+        super().clear()
+
+    def reverse(self) -> None:
+        self.generation += 1
+        super().reverse()
+
+    def sort(self, key=None, reverse=False):
+        self.generation += 1
+        super().sort(key=key, reverse=reverse)
 
     @no_type_check
     def __getitem__(self, item: Union[Hashable, slice]) -> list:
@@ -648,7 +927,7 @@ class KeyedTable(list):
             indices = int(item)
         else:
             indices = self.columns[item]
-        return [value[indices] for value in self]
+        return list(self._cells(indices))
 
     def get(self, item: Hashable, default: Any = None) -> Union[list, Any]:
         """ This attempts to emulate the dictionary 'get' method behavior. It will use the 'item' to do a get on the
@@ -663,16 +942,11 @@ class KeyedTable(list):
         """
 
         try:
-            if isinstance(item, int) and (not self.columns or item not in self.columns):
-                indices = item
-            elif not self.columns and isinstance(item, str) and item.isdigit():
-                indices = int(item)
-            else:
-                indices = self.columns[item]
+            indices = self._column_number(item)
         except:
             return default
         else:
-            return [value[indices] for value in self]
+            return list(self._cells(indices))
 
     def get_cell(self, row: int, col: Hashable, default: Any = None) -> Any:
         """ This requires a row specified by an integer and a column specified by a Hashable (usually str) type.
@@ -706,16 +980,11 @@ class KeyedTable(list):
         """
 
         try:
-            if isinstance(col, int) and (not self.columns or col not in self.columns):
-                indices = col
-            elif not self.columns and isinstance(col, str) and col.isdigit():
-                indices = int(col)
-            else:
-                indices = self.columns[col]
+            indices = self._column_number(col)
         except:
             return default
         else:
-            return (value[indices] for value in self)
+            return self._cells(indices)
 
     def iter_row(self, row: int, default: Any = None) -> Union[Iterable, Any]:
         """ Again this has the 'default' parameter which helps this method behave like a dictionary's 'get' method in
@@ -731,6 +1000,239 @@ class KeyedTable(list):
             return default
         return (item for item in self[row])
 
+    def ingest(self, source: Any, tokenizer: Optional[Tokenizer] = None, header: bool = False, skip: int = 0,
+               batch_size: int = 10000, encoding: str = 'utf-8') -> int:
+        """ Reads rows from a log file or command output and adds them to the end of the table through 'extend', at
+            most 'batch_size' rows at a time. The source is read one line at a time so ingesting a large file holds no
+            more than one batch of rows beyond what the table itself stores.
+
+            With header=True the first row becomes 'columns'. When splitting on whitespace the rows that follow are
+            split into no more cells than the header has, so the last column keeps its spaces. Otherwise a pattern
+            with named groups sets 'columns' when the table does not have any yet.
+
+        :param source: A path, file object, subprocess stdout (or Popen object) or iterable of lines.
+        :param tokenizer: (Tokenizer) defaults to Tokenizer() which splits on whitespace.
+        :param header: (bool: False) whether the first row, after 'skip', holds the column names.
+        :param skip: (int: 0) the number of lines to skip first.
+        :param batch_size: (int: 10000) the number of rows passed to 'extend' at once.
+        :param encoding: (str: utf-8) used to open paths and decode bytes.
+        :return: int (the number of rows added)
+        """
+        tokenizer = tokenizer or Tokenizer()
+        lines = read_lines(source, encoding)
+        count = 0
+        try:
+            rows = (row for row in map(tokenizer, islice(lines, skip, None)) if row is not None)
+            if header:
+                names = next(rows, None)
+                if names is None:
+                    return 0
+                self.columns = {name: number for number, name in enumerate(names)}
+                tokenizer = tokenizer.for_header(names)
+                rows = (row for row in map(tokenizer, lines) if row is not None)
+            elif tokenizer.columns and not self.columns:
+                self.columns = dict(tokenizer.columns)
+            for batch in iter(lambda: list(islice(rows, batch_size)), []):
+                self.extend(batch)
+                count += len(batch)
+        finally:
+            lines.close()
+        return count
+
+    def typed_column(self, column: Hashable, column_type: Callable = float) -> Union[list, Any]:
+        """ Returns every cell of a column converted by 'column_type'. The column is only converted the first time and
+            the result is kept until the table changes, so do not modify it. If NumPy is installed and column_type is
+            int or float this is a NumPy array and cells of a float column that cannot be converted are NaN. Otherwise,
+            including an int column with such cells or with values too large for an int64 array, this is a list and
+            those cells are None.
+
+        :param column: (Hashable) the column name or number. Raises a KeyError if it cannot be found.
+        :param column_type: (Callable: float) a type such as int or float.
+        :return: NumPy array or list
+        """
+        return self._typed_values(self._column_number(column), column_type)[0]
+
+    def indices_of_where(self, column: Hashable, op: str, value: Any, column_type: Callable = float) -> Iterable:
+        """ Returns an iterable of the row numbers, in ascending order, where the cell of 'column' converted by
+            'column_type' compares to 'value'. Cells that cannot be converted never match. 'value' is converted by
+            'column_type' as well so 'table.indices_of_where('RSS', '>', '1024', int)' works.
+
+        :param column: (Hashable) the column name or number.
+        :param op: (str) one of '==', '!=', '<', '<=', '>', '>=', 'between' or 'isin'. 'between' takes a pair of
+            (low, high) which are both included and 'isin' takes an iterable of values.
+        :param value: The value to compare against.
+        :param column_type: (Callable: float) read 'typed_column' for more information.
+        :return: iterator
+        """
+        values = self.typed_column(column, column_type)
+        if op == 'between':
+            low, high = (column_type(bound) for bound in value)
+        elif op == 'isin':
+            wanted = {column_type(item) for item in value}
+        elif op in self._comparisons:
+            compare, target = self._comparisons[op], column_type(value)
+        else:
+            raise ValueError(f'Unknown operator {op!r} must be one of {", ".join(self._comparisons)}, between or isin')
+        if isinstance(values, list):
+            cells = ((row, cell) for row, cell in enumerate(values) if cell is not None and cell == cell)
+            if op == 'between':
+                return iter([row for row, cell in cells if low <= cell <= high])
+            if op == 'isin':
+                return iter([row for row, cell in cells if cell in wanted])
+            return iter([row for row, cell in cells if compare(cell, target)])
+        if op == 'between':
+            mask = (values >= low) & (values <= high)
+        elif op == 'isin':
+            mask = np.isin(values, list(wanted))
+        else:
+            mask = compare(values, target)
+            if op == '!=' and values.dtype.kind == 'f':
+                mask &= ~np.isnan(values)
+        return iter(np.flatnonzero(mask).tolist())
+
+    def indices_of_top_k(self, column: Hashable, k: int = 1, column_type: Callable = float,
+                         reverse: bool = False) -> Iterable:
+        """ Returns an iterable of the row numbers of the first k rows 'sort_by_column' would give, without sorting or
+            changing the table: the rows with the k smallest cells of 'column' converted by 'column_type', smallest
+            first, or with reverse=True the k largest, largest first. Rows with equal cells keep their order and cells
+            that cannot be converted are left out. It takes a single pass over the column keeping a heap of k rows, or
+            a partition of the column if NumPy is installed, instead of sorting all of it.
+
+        :param column: (Hashable) the column name or number.
+        :param k: (int: 1) the number of rows.
+        :param column_type: (Callable: float) read 'typed_column' for more information.
+        :param reverse: (bool: False) whether the largest cells come first.
+        :return: iterator
+        """
+        values = self.typed_column(column, column_type)
+        if k <= 0:
+            return iter([])
+        if isinstance(values, list):
+            converted = [row for row, value in enumerate(values) if value is not None and value == value]
+            return iter((nlargest if reverse else nsmallest)(k, converted, key=values.__getitem__))
+        rows = np.flatnonzero(~np.isnan(values)) if values.dtype.kind == 'f' else np.arange(len(values))
+        keys = -values[rows] if reverse else values[rows]
+        if k < len(rows):
+            bound = keys[np.argpartition(keys, k - 1)[k - 1]]
+            below = np.flatnonzero(keys < bound)
+            picked = np.sort(np.concatenate((below, np.flatnonzero(keys == bound)[:k - len(below)])))
+            rows, keys = rows[picked], keys[picked]
+        return iter(rows[np.argsort(keys, kind='stable')].tolist())
+
+    def top_k(self, column: Hashable, k: int = 1, column_type: Callable = float, reverse: bool = False) -> KeyedTable:
+        """ Returns a new KeyedTable, with the same columns, of the rows found by 'indices_of_top_k' in that order. The
+            table itself is not sorted. IE: table.top_k('%CPU', 20, reverse=True) for the 20 busiest processes.
+        """
+        return KeyedTable([self[index] for index in self.indices_of_top_k(column, k, column_type, reverse)],
+                          columns=self.columns)
+
+    def nsmallest(self, column: Hashable, k: int = 1, column_type: Callable = float) -> KeyedTable:
+        """ Returns the k rows with the smallest cells in a column, smallest first. Read 'top_k' """
+        return self.top_k(column, k, column_type)
+
+    def nlargest(self, column: Hashable, k: int = 1, column_type: Callable = float) -> KeyedTable:
+        """ Returns the k rows with the largest cells in a column, largest first. Read 'top_k' """
+        return self.top_k(column, k, column_type, reverse=True)
+
+    def group_by(self, column: Hashable, sort: bool = True) -> GroupBy:
+        """ Groups the rows by their cell in a column and returns a GroupBy. Its 'agg' method returns a new KeyedTable
+            with one row per group, read the GroupBy doc string for more information.
+            IE: table.group_by('USER').sum('RSS', int)
+
+        :param column: (Hashable) the column name or number.
+        :param sort: (bool: True) whether the groups are sorted by their value, otherwise they are in the order they
+            were first seen. Values that cannot be compared to each other are always left in that order.
+        :return: GroupBy
+        """
+        groups: Dict[Any, array] = defaultdict(partial(array, 'I'))
+        for position, value in enumerate(self._cells(self._column_number(column))):
+            groups[value].append(position)
+        return GroupBy(self, column, groups, sort)
+
+    def join(self, other: KeyedTable, on: Union[Hashable, Tuple[Hashable, Hashable]], how: str = 'inner',
+             suffix: str = '_right') -> KeyedTable:
+        """ Joins the rows of this table to the rows of another table with an equal cell in a key column, like a SQL
+            join. It is a hash join: the row numbers of one table are grouped by their key in a single pass, or read
+            from the postings of an IndexedTable with column_index=True, and the rows of the other are streamed through
+            those groups, so neither table is copied. With how='inner' the smaller table is grouped unless only the
+            larger one has a column index, with how='left' it is always the other table.
+
+            The result is a new KeyedTable with a row for each pair of joined rows, ordered by the rows of this table
+            and then by the rows of the other. Each is the cells of the row of this table followed by the cells of the
+            row of the other without its key column, short rows are padded with None. Rows too short to have the key
+            column have no match. Its columns are the columns of this table followed by the columns of the other, names
+            that are already used get 'suffix' added. If that name is also used a ValueError is raised.
+            IE: ps.join(netstat, on='PID', how='left')
+
+        :param other: (KeyedTable) the table to join to.
+        :param on: (Hashable or Tuple) the key column of both tables or a pair of (column of this, column of other).
+        :param how: (str: 'inner') 'inner' only keeps rows with a match in both tables, 'left' also keeps the rows of
+            this table without one and the cells of the other table are None.
+        :param suffix: (str: '_right') added to the names of the columns of other that this table already uses.
+        :return: KeyedTable
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError(f"Unknown join {how!r} must be 'inner' or 'left'")
+        left, right = on if isinstance(on, tuple) else (on, on)
+        leftNumber, rightNumber = self._column_number(left), other._column_number(right)
+        columns = dict(self.columns)
+        rightColumns = []
+        for name, number in other.columns.items():
+            if number == rightNumber:
+                continue
+            if name in columns:
+                name = f'{name}{suffix}'
+                if name in columns:
+                    raise ValueError(f'The column {name!r} already exists, pick another suffix')
+            columns[name] = number
+            rightColumns.append((name, number - (number > rightNumber)))
+
+        pairs: Iterable
+        leftIndexed = isinstance(self, IndexedTable) and self._column_postings(left) is not None
+        rightIndexed = isinstance(other, IndexedTable) and other._column_postings(right) is not None
+        if how == 'inner' and not rightIndexed and (leftIndexed or len(self) < len(other)):
+            lookup, leftWidth = self._join_lookup(left)
+            rightWidth = rightNumber + 1
+            matches: list = []
+            for j, cells in enumerate(other):
+                if len(cells) > rightNumber:
+                    rightWidth = max(rightWidth, len(cells))
+                    members = lookup.get(cells[rightNumber])
+                    if members:
+                        matches.extend(zip(members, repeat(cells)))
+            matches.sort(key=itemgetter(0))
+            pairs = ((self[i], cells) for i, cells in matches)
+        else:
+            lookup, rightWidth = other._join_lookup(right)
+            leftWidth = leftNumber + 1
+            pairs = []
+            for row in self:
+                members = None
+                if len(row) > leftNumber:
+                    leftWidth = max(leftWidth, len(row))
+                    members = lookup.get(row[leftNumber])
+                if members:
+                    pairs.extend(zip(repeat(row), map(other.__getitem__, members)))
+                elif how == 'left':
+                    pairs.append((row, None))
+        rightWidth -= 1
+        columns.update((name, leftWidth + number) for name, number in rightColumns)
+
+        rows = []
+        for cells, rightCells in pairs:
+            row = list(cells)
+            if len(row) < leftWidth:
+                row += [None] * (leftWidth - len(row))
+            if rightCells is None:
+                row += [None] * rightWidth
+            else:
+                row += rightCells[:rightNumber]
+                row += rightCells[rightNumber + 1:]
+                if len(rightCells) <= rightWidth:
+                    row += [None] * (rightWidth + 1 - len(rightCells))
+            rows.append(row)
+        return KeyedTable(rows, columns=columns)
+
     def sort_by_column(self, column: Hashable, column_type: Callable, reverse: bool = False) -> None:
         """ A special version of the builtin sort method in List. This is used to take advantage of the keyed/labeled
             columns in the KeyedTable. There are no safety built into this function and it can raise an exception
@@ -742,13 +1244,1488 @@ class KeyedTable(list):
         :param reverse: Same as reverse in List's 'sort' method.
         :return: None
         """
+        number = self._column_number(column)
+        keys, clean = self._typed_values(number, column_type)
+        if not clean:
+            keys = [column_type(value) for value in self._cells(number)]
+        if isinstance(keys, list):
+            self._reorder(sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse))
+        elif reverse:
+            self._reorder((len(keys) - 1 - np.argsort(keys[::-1], kind='stable'))[::-1].tolist())
+        else:
+            self._reorder(np.argsort(keys, kind='stable').tolist())
+
+    def _cells(self, number: int) -> Iterable:
+        """ Helper function that iterates over the cell at position 'number' of every row """
+        return (value[number] for value in self)
+
+    def _join_lookup(self, column: Hashable) -> Tuple[Dict[Any, array], int]:
+        """ Helper function for 'join' that groups the row numbers by their cell in a column in one pass over the rows
+            and also returns the length of the longest row. Rows too short to have the column are left out.
+        """
+        number = self._column_number(column)
+        width = number + 1
+        lookup: Dict[Any, array] = defaultdict(partial(array, 'I'))
+        for position, row in enumerate(self):
+            if len(row) > number:
+                width = max(width, len(row))
+                lookup[row[number]].append(position)
+        return lookup, width
+
+    def _frozen(self, rows: Iterable) -> Iterable:
+        """ Helper function that converts rows to 'row_type' when the table was created with frozen or records """
+        if not (self.frozen or self.records):
+            return rows
+        return list(map(self._frozen_row, rows))
+
+    def _frozen_row(self, row: Any) -> Any:
+        """ Helper function that converts a single row like '_frozen' """
+        if not (self.frozen or self.records):
+            return row
+        rowType = self.row_type
+        return row if row.__class__ is rowType else rowType(row)
+
+    def _probe(self, value: Any) -> Any:
+        """ Helper function that turns a list into a tuple so it can be compared with the rows of a frozen table """
+        if (self.frozen or self.records) and isinstance(value, list):
+            return tuple(value)
+        return value
+
+    def _reorder(self, order: Iterable) -> None:
+        """ Helper function that moves the row at position order[i] to position i """
+        rows = list(self)
+        self.generation += 1
+        super().__setitem__(slice(None), [rows[i] for i in order])
+
+    def _typed_values(self, number: int, column_type: Callable) -> Tuple[Any, bool]:
+        """ Helper function behind 'typed_column' that also returns whether every cell could be converted """
+        if self.__typed_generation != self.generation:
+            self.__typed = {}
+            self.__typed_generation = self.generation
+        key = (number, column_type)
+        if key not in self.__typed:
+            self.__typed[key] = self._typed_cells(list(self._cells(number)), column_type)
+        return self.__typed[key]
+
+    @staticmethod
+    def _typed_cells(cells: list, column_type: Callable) -> Tuple[Any, bool]:
+        """ Helper function that converts cells by 'column_type' into a NumPy array when it can and a list when it
+            cannot. Also returns whether every cell could be converted. An int column that does not fit an int64 array,
+            because of cells that cannot be converted or that are too large, stays a list so nothing is rounded.
+        """
+        numeric = np is not None and column_type in (int, float)
+        if numeric:
+            try:
+                return np.array(cells, dtype=column_type), True  # type: ignore[call-overload]
+            except (TypeError, ValueError, OverflowError):
+                pass
+        values: list = []
+        for cell in cells:
+            try:
+                values.append(column_type(cell))
+            except (TypeError, ValueError, OverflowError):
+                values.append(None)
+        clean = all(value is not None for value in values)
+        if numeric and column_type is float:
+            return np.array([np.nan if value is None else value for value in values], dtype=float), clean
+        return values, clean
+
+    def _column_number(self, column: Hashable) -> int:
+        """ Helper function that resolves a column name (or number) into the position of that column within each row.
+            Raises a KeyError if the column cannot be found within 'columns'.
+        """
         if isinstance(column, int) and (not self.columns or column not in self.columns):
-            indices = column
-        elif not self.columns and isinstance(column, str) and column.isdigit():
-            indices = int(column)
+            return column
+        if not self.columns and isinstance(column, str) and column.isdigit():
+            return int(column)
+        return self.columns[column]
+
+
+class GroupBy:
+    """ <a name="GroupBy"></a>
+        GroupBy is what 'group_by' of a KeyedTable returns. It holds the row numbers of each distinct value of a column
+        and its 'agg' method, or the shortcuts 'count', 'sum', 'min', 'max', 'mean' and 'distinct', returns a new
+        KeyedTable with one row per group: the value of the grouped column followed by a cell per aggregate.
+        IE: table.group_by('USER').agg('count', ('sum', 'RSS', int), top=('max', 'RSS', int))
+
+        The column is read once when grouping and each group keeps its row numbers in an array. Numeric aggregates
+        read their column with 'typed_column', so the conversion is shared with 'indices_of_where' and
+        'sort_by_column', and cells that cannot be converted are left out. If NumPy is installed each aggregate is
+        computed for every group at once, otherwise each group is reduced in a single pass over its rows.
+
+        The groups are of the rows the table had when it was grouped, 'agg' raises a RuntimeError if it has changed.
+
+        :var table: The KeyedTable that was grouped.
+        :var column: The column the rows were grouped by.
+        :var keys: The value of each group, sorted unless the table was grouped with sort=False.
+        :var members: The row numbers of each group, in the same order as 'keys'.
+    """
+
+    aggregates = ('count', 'sum', 'min', 'max', 'mean', 'distinct')
+
+    def __init__(self, table: KeyedTable, column: Hashable, groups: Dict[Any, array], sort: bool = True):
+        self.table = table
+        self.column = column
+        self.generation = table.generation
+        keys = list(groups)
+        if sort:
+            try:
+                keys = sorted(keys)
+            except TypeError:
+                pass
+        self.keys = keys
+        self.members = [groups[key] for key in keys]
+        self.__grouped: Optional[Tuple[Any, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[Tuple[Any, array]]:
+        return zip(self.keys, self.members)
+
+    def agg(self, *aggregates, **named) -> KeyedTable:
+        """ Returns a new KeyedTable with a row for each group holding the value of the group followed by the result of
+            each aggregate. Its columns are named after the grouped column and the aggregates.
+
+        :param aggregates: Each is either 'count', the number of rows in the group, or a tuple of (aggregate, column) or
+            (aggregate, column, column_type) where aggregate is one of 'count', 'sum', 'min', 'max', 'mean' or
+            'distinct' and column_type defaults to float. With a column 'count' is the number of cells that could be
+            converted and 'distinct' is the number of different cells, which are not converted. The columns of the
+            result are named like 'sum(RSS)', or just 'count'. Groups without a converted cell get 0 for 'sum' and None
+            for 'min', 'max' and 'mean'.
+        :param named: The same as aggregates but the keyword is the name of the column. IE: total=('sum', 'RSS')
+        :return: KeyedTable
+        """
+        if self.table.generation != self.generation:
+            raise RuntimeError('The table has changed since it was grouped')
+        specs = [self._spec(aggregate) for aggregate in aggregates]
+        names = [func if column is None else f'{func}({column})' for func, column, _ in specs]
+        specs += [self._spec(aggregate) for aggregate in named.values()]
+        columns = {self.column: 0}
+        cells = [self.keys]
+        lock = self.table.lock if isinstance(self.table, (IndexedTable, ShardedIndexedTable)) else None
+        with lock.reading() if lock is not None else nullcontext():
+            for name, spec in zip(names + list(named), specs):
+                columns[name] = len(cells)
+                cells.append(self._aggregate(*spec))
+        return KeyedTable([list(row) for row in zip(*cells)], columns=columns)
+
+    def count(self) -> KeyedTable:
+        """ Returns the number of rows in each group, read 'agg' for more information """
+        return self.agg('count')
+
+    def sum(self, column: Hashable, column_type: Callable = float) -> KeyedTable:
+        """ Returns the sum of a column for each group, read 'agg' for more information """
+        return self.agg(('sum', column, column_type))
+
+    def min(self, column: Hashable, column_type: Callable = float) -> KeyedTable:
+        """ Returns the smallest value of a column for each group, read 'agg' for more information """
+        return self.agg(('min', column, column_type))
+
+    def max(self, column: Hashable, column_type: Callable = float) -> KeyedTable:
+        """ Returns the largest value of a column for each group, read 'agg' for more information """
+        return self.agg(('max', column, column_type))
+
+    def mean(self, column: Hashable, column_type: Callable = float) -> KeyedTable:
+        """ Returns the mean of a column for each group, read 'agg' for more information """
+        return self.agg(('mean', column, column_type))
+
+    def distinct(self, column: Hashable) -> KeyedTable:
+        """ Returns the number of different cells of a column for each group, read 'agg' for more information """
+        return self.agg(('distinct', column))
+
+    def _spec(self, aggregate: Any) -> Tuple[str, Optional[Hashable], Callable]:
+        """ Helper function that turns an aggregate passed to 'agg' into (aggregate, column, column_type) """
+        parts = (aggregate,) if isinstance(aggregate, str) else tuple(aggregate)
+        func, column, columnType = (parts + (None, float)[len(parts) - 1:])[:3]
+        if func not in self.aggregates:
+            raise ValueError(f'Unknown aggregate {func!r} must be one of {", ".join(self.aggregates)}')
+        if column is None and func != 'count':
+            raise ValueError(f'The aggregate {func!r} needs a column')
+        return func, column, columnType
+
+    def _aggregate(self, func: str, column: Optional[Hashable], column_type: Callable) -> list:
+        """ Helper function that computes one aggregate for every group """
+        if column is None:
+            return [len(member) for member in self.members]
+        number = self.table._column_number(column)
+        if func == 'distinct':
+            cells = list(self.table._cells(number))
+            return [len(set(map(cells.__getitem__, member))) for member in self.members]
+        values = self.table._typed_values(number, column_type)[0]
+        if isinstance(values, list):
+            return [self._reduce(func, [value for value in map(values.__getitem__, member)
+                                        if value is not None and value == value], column_type)
+                    for member in self.members]
+        if not self.members:
+            return []
+        order, starts = self._grouped()
+        grouped = values[order]
+        valid = ~np.isnan(grouped) if grouped.dtype.kind == 'f' else np.ones(len(grouped), dtype=bool)
+        counts = np.add.reduceat(valid.astype(np.intp), starts).tolist()
+        if func == 'count':
+            return counts
+        if func == 'mean':
+            totals = np.add.reduceat(np.where(valid, grouped, 0), starts).tolist()
+            return [total / count if count else None for total, count in zip(totals, counts)]
+        if func == 'sum':
+            results = np.add.reduceat(np.where(valid, grouped, 0), starts).tolist()
+        else:
+            results = (np.fmin if func == 'min' else np.fmax).reduceat(grouped, starts).tolist()
+        return [column_type(result) if count or func == 'sum' else None for result, count in zip(results, counts)]
+
+    @staticmethod
+    def _reduce(func: str, values: list, column_type: Callable) -> Any:
+        """ Helper function that computes one aggregate of a group from its converted cells """
+        if func == 'count':
+            return len(values)
+        if func == 'sum':
+            return sum(values) if values else column_type(0)
+        if not values:
+            return None
+        if func == 'mean':
+            return sum(values) / len(values)
+        return min(values) if func == 'min' else max(values)
+
+    def _grouped(self) -> Tuple[Any, Any]:
+        """ Helper function that returns the row numbers of every group one after another, as a NumPy array, and the
+            position within it where each group starts. It is built the first time a NumPy aggregate needs it.
+        """
+        if self.__grouped is None:
+            order = array('I')
+            for member in self.members:
+                order.extend(member)
+            starts = np.array(list(accumulate(map(len, self.members[:-1]), initial=0)), dtype=np.intp)
+            self.__grouped = (np.asarray(order), starts)
+        return self.__grouped
+
+
+class ColumnarTable(KeyedTable):
+    """ <a name="ColumnarTable"></a>
+        ColumnarTable is a KeyedTable that stores its cells column by column: one list per column position instead of
+        one list per row. It keeps the row oriented API of KeyedTable, 'table[0]' still returns a row and
+        'table['ID']' returns a column, but column access ('get', 'iter_column', 'sort_by_column') and 'sort' work on
+        a single list and a table of many short rows uses far less memory than a list of lists.
+
+        Rows are built on the fly whenever they are read, so the list returned by 'table[0]' or by iterating over the
+        table is a copy. Changing it does not change the table, use 'table[0] = row' instead. Rows do not need to be
+        the same length, the missing cells of shorter rows are filled in with a private placeholder that is never
+        returned.
+
+        Setting encoded=True on init dictionary encodes the cells. Every distinct cell value is stored once in a shared
+        vocabulary and the columns become arrays of 4 byte codes into it, so a table repeating a small vocabulary of
+        users, states or host names shrinks by an order of magnitude. Rows are decoded as they are read and hold the
+        one stored copy of each value. Cells must be hashable and equal cells of the same type, like two equal
+        strings, come back as the same object.
+
+        The list the class inherits from is kept empty. The list operators, comparisons, copy and pickle are overridden
+        to work on the rows, but code that reads the list directly in C, like json.dumps or list.__len__, sees no
+        rows. Pass it 'list(table)' instead.
+
+        ColumnarIndexedTable is the IndexedTable version of this class.
+
+        :var encoded: True when the cells are dictionary encoded.
+    """
+
+    _MISSING: Any = object()
+    encoded: bool = False
+
+    def __init__(self, *args, columns: Optional[Dict] = None, encoded: Optional[bool] = None):
+        if encoded is not None:
+            self.encoded = encoded
+        self.__data: List[Any] = []
+        self.__values: list = [self._MISSING]
+        self.__codes: dict = {self._MISSING: 0}
+        self.__length = 0
+        self.__ragged = False
+        super().__init__(columns=columns)
+        if args:
+            ColumnarTable.extend(self, *args)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __bool__(self) -> bool:
+        return self.__length > 0
+
+    def __iter__(self) -> Iterator[list]:
+        if not self.__data:
+            return ([] for _ in range(self.__length))
+        if self.encoded:
+            rows = zip(*(map(self.__values.__getitem__, column) for column in self.__data))
+        else:
+            rows = zip(*self.__data)
+        if self.__ragged:
+            return (self._strip(row) for row in rows)
+        return map(list, rows)
+
+    def __reversed__(self) -> Iterator[list]:
+        return (self._row(position) for position in range(self.__length - 1, -1, -1))
+
+    def __contains__(self, value: Any) -> bool:
+        return any(row == value for row in self)
+
+    def __eq__(self, other: Any) -> bool:
+        return list(self) == self._compared(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __lt__(self, other: Any) -> bool:
+        return list(self) < self._compared(other)
+
+    def __le__(self, other: Any) -> bool:
+        return list(self) <= self._compared(other)
+
+    def __gt__(self, other: Any) -> bool:
+        return list(self) > self._compared(other)
+
+    def __ge__(self, other: Any) -> bool:
+        return list(self) >= self._compared(other)
+
+    def __add__(self, other: Iterable) -> list:  # type: ignore[override]
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable) -> list:
+        return list(other) + list(self)
+
+    def __iadd__(self, other: Iterable) -> 'ColumnarTable':  # type: ignore[override, misc]
+        self.extend(other)
+        return self
+
+    def __mul__(self, count: SupportsIndex) -> list:  # type: ignore[override]
+        return list(self) * count
+
+    __rmul__ = __mul__  # type: ignore[assignment]
+
+    def __imul__(self, count: SupportsIndex) -> 'ColumnarTable':  # type: ignore[override, misc]
+        rows = list(self) * count
+        self.clear()
+        self.extend(rows)
+        return self
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        return partial(type(self), columns=self.columns, encoded=self.encoded), (list(self),)
+
+    @no_type_check
+    def __getitem__(self, item: Union[Hashable, slice]) -> list:
+        if isinstance(item, int):
+            return self._row(item)
+        if isinstance(item, slice):
+            return [self._row(position) for position in range(*item.indices(self.__length))]
+        return super().__getitem__(item)
+
+    @no_type_check
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            rows = list(self)
+            rows[index] = value
+            self._load(rows)
+            return
+        position = self._position(index)
+        value = list(value)
+        self.generation += 1
+        self._widen(len(value))
+        if len(value) < len(self.__data):
+            self.__ragged = True
+        for column, cell in zip(self.__data, self._stored(value)):
+            column[position] = cell
+
+    def __delitem__(self, index: Union[int, slice]) -> None:  # type: ignore[override]
+        if isinstance(index, slice):
+            rows = list(self)
+            del rows[index]
+            self._load(rows)
+            return
+        position = self._position(index)
+        self.generation += 1
+        for column in self.__data:
+            del column[position]
+        self.__length -= 1
+
+    def append(self, value: Any) -> None:
+        ColumnarTable.insert(self, self.__length, value)
+
+    def extend(self, values: Iterable) -> None:
+        for value in values:
+            ColumnarTable.insert(self, self.__length, value)
+
+    def insert(self, index: int, value: Any) -> None:  # type: ignore[override]
+        value = list(value)
+        self.generation += 1
+        self._widen(len(value))
+        if len(value) < len(self.__data):
+            self.__ragged = True
+        for column, cell in zip(self.__data, self._stored(value)):
+            column.insert(index, cell)
+        self.__length += 1
+
+    def pop(self, index: int = -1) -> list:  # type: ignore[override]
+        if not self.__length:
+            raise IndexError('pop from empty list')
+        position = self._position(index)
+        row = self._row(position)
+        self.generation += 1
+        for column in self.__data:
+            del column[position]
+        self.__length -= 1
+        return row
+
+    def remove(self, value: Any) -> None:
+        ColumnarTable.pop(self, self.index(value))
+
+    def index(self, value: Any, start: int = 0, stop: int = sys.maxsize) -> int:  # type: ignore[override]
+        for position in range(*slice(start, stop).indices(self.__length)):
+            if self._row(position) == value:
+                return position
+        raise ValueError(f'{value!r} is not in list')
+
+    def count(self, value: Any) -> int:  # type: ignore[override]
+        return sum(1 for row in self if row == value)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.__data = []
+        self.__values = [self._MISSING]
+        self.__codes = {self._MISSING: 0}
+        self.__length = 0
+        self.__ragged = False
+
+    def copy(self) -> list:  # type: ignore[override]
+        return list(self)
+
+    def reverse(self) -> None:
+        self.generation += 1
+        for column in self.__data:
+            column.reverse()
+
+    def sort(self, key: Optional[Callable] = None, reverse: bool = False) -> None:  # type: ignore[override]
+        rows = list(self)
+        self._reorder(sorted(range(len(rows)), key=rows.__getitem__ if key is None else lambda i: key(rows[i]),
+                             reverse=reverse))
+
+    def get_cell(self, row: int, col: Hashable, default: Any = None) -> Any:
+        if len(self) < abs(row) or not isinstance(col, int) or self.__ragged or (self.columns and col in self.columns):
+            return super().get_cell(row, col, default)
+        if self.encoded:
+            return self.__values[self.__data[col][row]]
+        return self.__data[col][row]
+
+    def _cells(self, number: int) -> Iterable:
+        """ Column helper that returns the column list itself instead of building the column row by row """
+        if self.__ragged or not -len(self.__data) <= number < len(self.__data):
+            return super()._cells(number)
+        if self.encoded:
+            return map(self.__values.__getitem__, self.__data[number])
+        return iter(self.__data[number])
+
+    def _reorder(self, order: Iterable) -> None:
+        order = list(order)
+        self.generation += 1
+        self.__data = [self._column(map(column.__getitem__, order)) for column in self.__data]
+
+    def _row(self, index: int) -> list:
+        """ Helper function that builds the row at position 'index' from the columns """
+        position = self._position(index)
+        cells = [column[position] for column in self.__data]
+        if self.encoded:
+            cells = list(map(self.__values.__getitem__, cells))
+        if self.__ragged:
+            return self._strip(cells)
+        return cells
+
+    @staticmethod
+    def _compared(other: Any) -> Any:
+        """ Helper function that turns another ColumnarTable into a list of its rows before comparing to it """
+        return list(other) if isinstance(other, ColumnarTable) else other
+
+    def _strip(self, cells: Iterable) -> list:
+        """ Helper function that drops the placeholders a shorter row was filled in with """
+        missing = self._MISSING
+        return [cell for cell in cells if cell is not missing]
+
+    def _position(self, index: int) -> int:
+        """ Helper function that turns a (possibly negative) row number into a position, the same as a list would """
+        position = index + self.__length if index < 0 else index
+        if not 0 <= position < self.__length:
+            raise IndexError('list index out of range')
+        return position
+
+    def _widen(self, width: int) -> None:
+        """ Helper function that adds columns, filled with the placeholder, until there are at least 'width' """
+        if width > len(self.__data):
+            if self.__length:
+                self.__ragged = True
+            missing = self._stored([self._MISSING])[0]
+            self.__data.extend(self._column(repeat(missing, self.__length)) for _ in range(width - len(self.__data)))
+
+    def _column(self, cells: Iterable) -> Any:
+        """ Helper function that builds a column, an array of codes when encoded or a list otherwise """
+        return array('I', cells) if self.encoded else list(cells)
+
+    def _stored(self, row: list) -> list:
+        """ Helper function that returns the cells of a row, padded to the width of the table, the way the columns
+            store them. When encoded that is their code, and values not seen before are added to the vocabulary. A
+            value equal to one of another type, like 1 and 1.0, is keyed on its type as well so it keeps its own code.
+        """
+        cells = row + [self._MISSING] * (len(self.__data) - len(row))
+        if not self.encoded:
+            return cells
+        values, codes = self.__values, self.__codes
+        stored = []
+        for cell in cells:
+            key = cell
+            code = codes.get(key)
+            while code is not None and values[code].__class__ is not cell.__class__:
+                key = (cell.__class__, key)
+                code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(values)
+                values.append(cell)
+            stored.append(code)
+        return stored
+
+    def _load(self, rows: Iterable) -> None:
+        """ Helper function that replaces every row in the table """
+        rows = list(rows)
+        ColumnarTable.clear(self)
+        ColumnarTable.extend(self, rows)
+
+
+class MappedTable(KeyedTable):
+    """ <a name="MappedTable"></a>
+        MappedTable is a read only KeyedTable over a text file, like a large command dump or log. Instead of reading
+        the file into a list of lists it maps the file into memory with mmap and only keeps where each line starts and
+        ends, 16 bytes per row. Rows are decoded and split by 'tokenizer' every time they are read. Opening a file of
+        several GB takes about as long as finding its line breaks, which is done with NumPy when it is installed.
+
+        Empty lines are left out. Lines the tokenizer skips, like lines a pattern does not match, come back as empty
+        rows. 'skip' and 'header' work the same as for 'KeyedTable.ingest'.
+
+        The methods that would change the table raise a TypeError, the same as FrozenDict. Rows are copies so changing
+        one changes nothing. Call 'close' (or use the table in a with statement) to release the file.
+
+        MappedIndexedTable is the IndexedTable version of this class. It builds its index while reading through the
+        mapped file once and takes the same arguments followed by those of IndexedTable.
+
+        :var path: The path of the mapped file.
+        :var tokenizer: The Tokenizer used to split lines into rows.
+        :var encoding: The encoding used to decode lines.
+    """
+
+    def __init__(self, path: Any = None, tokenizer: Optional[Tokenizer] = None, header: bool = False, skip: int = 0,
+                 encoding: str = 'utf-8', columns: Optional[Dict] = None):
+        super().__init__(columns=columns)
+        self.path = path
+        self.tokenizer = tokenizer or Tokenizer()
+        self.encoding = encoding
+        self.__arguments = (path, tokenizer, header, skip, encoding)
+        self.__columns = columns
+        self.__map: Optional[mmap] = None
+        self.__starts = array('q')
+        self.__ends = array('q')
+        if path is not None:
+            self._map_lines(skip, header)
+
+    @staticmethod
+    def _readonly(*args, **kwargs):
+        raise TypeError('Cannot modify a MappedTable')
+
+    __setitem__ = __delitem__ = __iadd__ = append = extend = insert = pop = remove = clear = reverse = sort = \
+        _reorder = _readonly
+
+    def __enter__(self) -> MappedTable:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __bool__(self) -> bool:
+        return len(self.__starts) > 0
+
+    def __iter__(self) -> Iterator[list]:
+        if self.__map is None:
+            return iter(())
+        mapped, encoding, tokenizer = self.__map, self.encoding, self.tokenizer
+        return (tokenizer(mapped[start:end].decode(encoding, 'replace')) or []
+                for start, end in zip(self.__starts, self.__ends))
+
+    def __reversed__(self) -> Iterator[list]:
+        return (self._row(position) for position in range(len(self) - 1, -1, -1))
+
+    def __contains__(self, value: Any) -> bool:
+        return any(row == value for row in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (MappedTable, ColumnarTable)):
+            other = list(other)
+        return list(self) == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        """ Pickles the table as the arguments it was opened with so it maps the file at 'path' again when it is
+            unpickled, instead of copying its rows. A table that was closed comes back empty.
+        """
+        return partial(type(self), columns=self.__columns), self.__arguments if self.__map is not None else ()
+
+    @no_type_check
+    def __getitem__(self, item: Union[Hashable, slice]) -> list:
+        if isinstance(item, int):
+            return self._row(item)
+        if isinstance(item, slice):
+            return [self._row(position) for position in range(*item.indices(len(self)))]
+        return super().__getitem__(item)
+
+    def index(self, value: Any, start: int = 0, stop: int = sys.maxsize) -> int:  # type: ignore[override]
+        for position in range(*slice(start, stop).indices(len(self))):
+            if self._row(position) == value:
+                return position
+        raise ValueError(f'{value!r} is not in list')
+
+    def count(self, value: Any) -> int:  # type: ignore[override]
+        return sum(1 for row in self if row == value)
+
+    def copy(self) -> list:  # type: ignore[override]
+        return list(self)
+
+    def close(self) -> None:
+        """ Releases the mapped file. The table is empty afterwards. """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__starts = array('q')
+        self.__ends = array('q')
+
+    def _row(self, index: int) -> list:
+        """ Helper function that decodes and splits the row at position 'index' """
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError('list index out of range')
+        line = self.__map[self.__starts[position]:self.__ends[position]].decode(self.encoding, 'replace')  # type: ignore
+        return self.tokenizer(line) or []
+
+    def _map_lines(self, skip: int, header: bool) -> None:
+        """ Helper function that maps the file and records where each non empty line starts and ends """
+        with open(self.path, 'rb') as file:
+            if not fstat(file.fileno()).st_size:
+                return None
+            self.__map = mapped = mmap(file.fileno(), 0, access=ACCESS_READ)
+        begin = 0
+        for _ in range(skip):
+            begin = mapped.find(b'\n', begin) + 1
+            if not begin:
+                return None
+        if np is not None:
+            data = np.frombuffer(mapped, dtype=np.uint8)
+            breaks = np.flatnonzero(data[begin:] == 10) + begin
+            starts = np.concatenate(([begin], breaks + 1))
+            ends = np.append(breaks, len(mapped))
+            ends -= (ends > starts) & (data[ends - 1] == 13)
+            keep = ends > starts
+            self.__starts.frombytes(starts[keep].astype(np.int64).tobytes())
+            self.__ends.frombytes(ends[keep].astype(np.int64).tobytes())
+            del data, breaks, starts, ends, keep
+        else:
+            find, size = mapped.find, len(mapped)
+            while begin < size:
+                end = find(b'\n', begin)
+                if end < 0:
+                    end = size
+                stop = end - 1 if end > begin and mapped[end - 1] == 13 else end
+                if stop > begin:
+                    self.__starts.append(begin)
+                    self.__ends.append(stop)
+                begin = end + 1
+        if header and self.__starts:
+            names = self._row(0)
+            del self.__starts[0]
+            del self.__ends[0]
+            self.columns = {name: number for number, name in enumerate(names)}
+            self.tokenizer = self.tokenizer.for_header(names)
+        elif self.tokenizer.columns and not self.columns:
+            self.columns = dict(self.tokenizer.columns)
+
+
+class NGramIndex:
+    """ <a name="NGramIndex"></a>
+        NGramIndex maps every n-gram, a substring of length 'n', of a collection of strings back to the strings it was
+        found in. Any string that contains a keyword must also contain every n-gram of that keyword which makes it
+        possible to find a small set of candidates for a 'keyword in key' search without comparing every key.
+
+        IndexedTable uses this when 'ngram' is set on init to speed up explicit=False searches. Keys that are not
+        strings are never added.
+
+        :var n: The length of each gram.
+        :var grams: A defaultdict of sets mapping each gram to the keys it was found in.
+    """
+
+    def __init__(self, keys: Iterable = (), n: int = 3):
+        if n < 1:
+            raise ValueError('The length of an n-gram must be at least 1')
+        self.n = n
+        self.grams: defaultdict = defaultdict(set)
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self.grams)
+
+    def split(self, value: str) -> set:
+        """ Returns the set of n-grams found within the value """
+        return {value[i:i + self.n] for i in range(len(value) - self.n + 1)}
+
+    def add(self, key: Hashable) -> None:
+        """ Adds the key under each of its n-grams. Non string keys are ignored. """
+        if isinstance(key, str):
+            for gram in self.split(key):
+                self.grams[gram].add(key)
+
+    def discard(self, key: Hashable) -> None:
+        """ Removes the key from each of its n-grams and drops grams that are left empty """
+        if isinstance(key, str):
+            for gram in self.split(key):
+                keys = self.grams.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.grams[gram]
+
+    def candidates(self, keyword: Hashable) -> Optional[set]:
+        """ Returns the keys that contain every n-gram of the keyword. These still need a final 'keyword in key' check.
+            None is returned when the keyword is too short to be split or isn't a string, in which case the caller has
+            to fall back to checking every key.
+        """
+        if not isinstance(keyword, str) or len(keyword) < self.n:
+            return None
+        postings = sorted((self.grams.get(gram, ()) for gram in self.split(keyword)), key=len)
+        if not postings[0]:
+            return set()
+        return set(postings[0]).intersection(*postings[1:])
+
+
+class FuzzyIndex:
+    """ <a name="FuzzyIndex"></a>
+        FuzzyIndex is a drop in replacement for 'difflib.get_close_matches' over a collection of strings that is
+        searched many times. It returns exactly what 'get_close_matches' would return but only computes the expensive
+        SequenceMatcher 'ratio' for keys that can still reach the cutoff.
+
+        The 'quick_ratio' of difflib is an upper bound of 'ratio' based on how many characters two strings have in
+        common (counting repeats). FuzzyIndex keeps an inverted index where 'levels[(char, k)]' holds every key that
+        has the character at least k times. Counting how often each key shows up in the levels of a word gives the
+        number of shared characters for every key at once, which is exactly the 'quick_ratio' numerator. Keys that
+        share no characters, or too few for their length, are never scored.
+
+        IndexedTable uses this when 'fuzzy_index' is set on init. Keys that are not strings are never added.
+
+        :var keys: A set of all keys.
+        :var levels: A defaultdict of sets mapping (character, count) to keys.
+    """
+
+    def __init__(self, keys: Iterable = ()):
+        self.keys: set = set()
+        self.levels: defaultdict = defaultdict(set)
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key: Hashable) -> None:
+        """ Adds a key to the index. Non string keys are ignored. """
+        if isinstance(key, str) and key not in self.keys:
+            self.keys.add(key)
+            for char, count in Counter(key).items():
+                for level in range(1, count + 1):
+                    self.levels[(char, level)].add(key)
+
+    def discard(self, key: Hashable) -> None:
+        """ Removes a key from the index if it is there """
+        if isinstance(key, str) and key in self.keys:
+            self.keys.discard(key)
+            for char, count in Counter(key).items():
+                for level in range(1, count + 1):
+                    keys = self.levels[(char, level)]
+                    keys.discard(key)
+                    if not keys:
+                        del self.levels[(char, level)]
+
+    def get_close_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> list:
+        """ Same as 'difflib.get_close_matches(word, keys, n, cutoff)' """
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+        if cutoff <= 0.0 or not word:
+            return fmatch(word, self.keys, n=n, cutoff=cutoff)
+
+        shared = Counter(chain.from_iterable(self.levels.get((char, level), ())
+                                             for char, count in Counter(word).items()
+                                             for level in range(1, count + 1)))
+        result = []
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        for key, matches in shared.items():
+            if 2.0 * matches / (len(key) + len(word)) >= cutoff:
+                matcher.set_seq1(key)
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    result.append((ratio, key))
+        return [key for score, key in nlargest(n, result)]
+
+
+class RangeIndex:
+    """ <a name="RangeIndex"></a>
+        RangeIndex keeps the cells of one column, converted by 'column_type', in sorted order next to the row id each
+        cell came from. Range, min/max and top-k lookups are then a binary search plus the rows found instead of a pass
+        over the whole column.
+
+        The keys are kept in a list of sorted chunks of around 'load' keys, the same layout the sortedcontainers
+        package uses, along with the largest key of every chunk. Adding or removing a key is a binary search over the
+        chunks and a list insert or delete within a single chunk, so it stays cheap no matter how large the column
+        gets. Adding keys larger than any before them, like the time stamps of new log lines, just fills the last
+        chunk.
+
+        IndexedTable builds one for every column in 'range_columns' and keeps it up to date as rows are added and
+        removed. Cells that cannot be converted, or that convert to NaN, are left out.
+
+        :var column_type: The callable used to convert the cells. IE: int, float or datetime.fromisoformat
+        :var keys: A list of sorted lists of converted cells.
+        :var ids: A list of lists holding the row id of every key in 'keys'.
+        :var maxes: The largest key of each list in 'keys'.
+    """
+
+    load: int = 1000
+
+    def __init__(self, pairs: Iterable = (), column_type: Callable = float):
+        self.column_type = column_type
+        self.keys: List[list] = []
+        self.ids: List[list] = []
+        self.maxes: list = []
+        self.length = 0
+        self.update(pairs)
+
+    def __len__(self):
+        return self.length
+
+    def items(self) -> Iterator[Tuple[Any, int]]:
+        """ Returns an iterator of (key, rowId) pairs sorted by key """
+        return zip(chain.from_iterable(self.keys), chain.from_iterable(self.ids))
+
+    def convert(self, value: Any) -> Any:
+        """ Returns the value converted by 'column_type' or None if it cannot be converted """
+        try:
+            key = self.column_type(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return None if key != key else key
+
+    def add(self, value: Any, rowId: int) -> None:
+        """ Adds the cell 'value' of the row 'rowId' """
+        key = self.convert(value)
+        if key is not None:
+            self._insert(key, rowId)
+
+    def update(self, pairs: Iterable) -> None:
+        """ Adds an iterable of (value, rowId) pairs """
+        batch = sorted(((key, rowId) for key, rowId in ((self.convert(value), rowId) for value, rowId in pairs)
+                        if key is not None), key=itemgetter(0))
+        if not batch:
+            return None
+        if self.maxes and batch[0][0] < self.maxes[-1]:
+            for key, rowId in batch:
+                self._insert(key, rowId)
+            return None
+        if self.keys and len(self.keys[-1]) < self.load:
+            self.keys[-1].extend(map(itemgetter(0), batch))
+            self.ids[-1].extend(map(itemgetter(1), batch))
+            self.length += len(batch)
+            self.maxes[-1] = self.keys[-1][-1]
+            self._split(len(self.keys) - 1)
+            return None
+        for start in range(0, len(batch), self.load):
+            chunk = batch[start:start + self.load]
+            self.keys.append(list(map(itemgetter(0), chunk)))
+            self.ids.append(list(map(itemgetter(1), chunk)))
+            self.maxes.append(chunk[-1][0])
+        self.length += len(batch)
+
+    def discard(self, value: Any, rowId: int) -> None:
+        """ Removes the cell 'value' of the row 'rowId' if it is there """
+        key = self.convert(value)
+        if key is None:
+            return None
+        for chunk in range(bisect_left(self.maxes, key), len(self.maxes)):
+            keys, ids = self.keys[chunk], self.ids[chunk]
+            if keys[0] > key:
+                return None
+            for position in range(bisect_left(keys, key), bisect_right(keys, key)):
+                if ids[position] == rowId:
+                    del keys[position]
+                    del ids[position]
+                    self.length -= 1
+                    if keys:
+                        self.maxes[chunk] = keys[-1]
+                    else:
+                        del self.keys[chunk]
+                        del self.ids[chunk]
+                        del self.maxes[chunk]
+                    return None
+
+    def between(self, low: Any = None, high: Any = None, include_low: bool = True, include_high: bool = True) -> list:
+        """ Returns the row ids with a key between low and high, sorted by key. Leaving out low or high leaves the range
+            open on that end. Strings are converted by 'column_type' first so low and high can be written the same
+            way as the cells, a string that cannot be converted raises a ValueError.
+        """
+        first, start = 0, 0
+        last, stop = len(self.maxes), 0
+        if low is not None:
+            low = self._bound('low', low)
+            find = bisect_left if include_low else bisect_right
+            first = find(self.maxes, low)
+            if first == len(self.maxes):
+                return []
+            start = find(self.keys[first], low)
+        if high is not None:
+            high = self._bound('high', high)
+            find = bisect_right if include_high else bisect_left
+            last = find(self.maxes, high)
+            if last < len(self.maxes):
+                stop = find(self.keys[last], high)
+        if first > last or (first == last and start >= stop):
+            return []
+        if first == last:
+            return self.ids[first][start:stop]
+        rows = self.ids[first][start:]
+        for chunk in range(first + 1, last):
+            rows.extend(self.ids[chunk])
+        if last < len(self.ids):
+            rows.extend(self.ids[last][:stop])
+        return rows
+
+    def smallest(self, k: int = 1) -> list:
+        """ Returns the row ids of the k smallest keys, smallest first. Equal keys are in ascending row id order. """
+        return list(islice(chain.from_iterable(map(sorted, self.groups())), max(k, 0)))
+
+    def largest(self, k: int = 1) -> list:
+        """ Returns the row ids of the k largest keys, largest first. Equal keys are in ascending row id order. """
+        return list(islice(chain.from_iterable(map(sorted, self.groups(largest=True))), max(k, 0)))
+
+    def groups(self, largest: bool = False) -> Iterator[list]:
+        """ Yields a list of the row ids of each distinct key, smallest key first or with largest=True largest first.
+            The row ids within a list are in no particular order.
+        """
+        if largest:
+            keys = chain.from_iterable(map(reversed, reversed(self.keys)))
+            ids = chain.from_iterable(map(reversed, reversed(self.ids)))
+        else:
+            keys, ids = chain.from_iterable(self.keys), chain.from_iterable(self.ids)
+        for _, group in groupby(zip(keys, ids), key=itemgetter(0)):
+            yield [rowId for _, rowId in group]
+
+    def min(self, default: Any = None) -> Any:
+        """ Returns the smallest key or default if there are none """
+        return self.keys[0][0] if self.keys else default
+
+    def max(self, default: Any = None) -> Any:
+        """ Returns the largest key or default if there are none """
+        return self.maxes[-1] if self.maxes else default
+
+    def remap(self, mapping: Callable) -> None:
+        """ Replaces every row id by mapping(rowId) """
+        self.ids = [list(map(mapping, ids)) for ids in self.ids]
+
+    def _bound(self, name: str, value: Any) -> Any:
+        """ Helper function for 'between' that converts a bound given as a string or raises a ValueError """
+        if not isinstance(value, str):
+            return value
+        key = self.convert(value)
+        if key is None:
+            raise ValueError(f'The {name} bound {value!r} cannot be converted by {self.column_type!r}')
+        return key
+
+    def _insert(self, key: Any, rowId: int) -> None:
+        """ Helper function that adds a converted key to the chunk it belongs in """
+        self.length += 1
+        if not self.maxes:
+            self.keys.append([key])
+            self.ids.append([rowId])
+            self.maxes.append(key)
+            return None
+        chunk = min(bisect_right(self.maxes, key), len(self.maxes) - 1)
+        keys = self.keys[chunk]
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        self.ids[chunk].insert(position, rowId)
+        self.maxes[chunk] = keys[-1]
+        self._split(chunk)
+
+    def _split(self, chunk: int) -> None:
+        """ Helper function that splits a chunk that grew past twice 'load' into chunks of 'load' keys """
+        keys, ids = self.keys[chunk], self.ids[chunk]
+        if len(keys) <= self.load << 1:
+            return None
+        load = self.load
+        self.keys[chunk:chunk + 1] = [keys[start:start + load] for start in range(0, len(keys), load)]
+        self.ids[chunk:chunk + 1] = [ids[start:start + load] for start in range(0, len(ids), load)]
+        self.maxes[chunk:chunk + 1] = [keys[min(start + load, len(keys)) - 1] for start in range(0, len(keys), load)]
+
+
+class PostingsArray(array):
+    """ <a name="PostingsArray"></a>
+        PostingsArray is a sorted array of unsigned ints used as the postings (the set of row numbers) of a single key
+        when an IndexedTable is created with compact=True. It costs 4 bytes per row number instead of the tens of bytes
+        a Python set spends per entry. It has the part of the set API that IndexedTable uses so it can be used as the
+        default factory of the index defaultdict.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, rows: Iterable = ()):
+        return super().__new__(cls, 'I', rows)
+
+    def __contains__(self, row) -> bool:
+        i = bisect_left(self, row)
+        return i < len(self) and self[i] == row
+
+    @property
+    def bits(self) -> int:
+        """ The row numbers as a bitmap (a Python int with bit 'row' set for each row) """
+        return PostingsBitmap.encode(self)
+
+    def add(self, row: int) -> None:
+        if not self or row > self[-1]:
+            self.append(row)
+        elif row not in self:
+            insort(self, row)
+
+    def update(self, rows: Iterable) -> None:
+        """ Adds many row numbers at once. This is fastest when they are sorted and after every row already here. """
+        rows = list(dict.fromkeys(rows))
+        if rows and (not self or rows[0] > self[-1]) and rows == sorted(rows):
+            self.extend(rows)
         else:
-            indices = self.columns[column]
-        super().sort(key=lambda x: column_type(x[indices]), reverse=reverse)
+            for row in rows:
+                self.add(row)
+
+    def discard(self, row: int) -> None:
+        i = bisect_left(self, row)
+        if i < len(self) and self[i] == row:
+            del self[i]
+
+    def remove(self, row: int) -> None:
+        if row not in self:
+            raise KeyError(row)
+        self.discard(row)
+
+    def union(self, other: Iterable) -> PostingsArray:
+        return PostingsArray(sorted(set(self).union(other)))
+
+
+class PostingsBitmap:
+    """ <a name="PostingsBitmap"></a>
+        PostingsBitmap stores the postings of a single key as a bitmap, a Python int where bit 'row' is set for each
+        row the key is found in. IndexedTable switches the postings of a key from a PostingsArray to a PostingsBitmap
+        once the key is found in more than 1 of every 32 rows, at which point the bitmap is the smaller of the two.
+        Because Python ints are immutable every 'add' or 'discard' copies the bitmap, so these are best updated in
+        batches.
+
+        :var bits: The bitmap.
+    """
+
+    __slots__ = ('bits',)
+    _BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+    _NON_ZERO = re.compile(b'[^\x00]')
+
+    def __init__(self, rows: Union[Iterable, int] = ()):
+        self.bits = rows if isinstance(rows, int) else self.encode(rows)
+
+    def __iter__(self):
+        return iter(self.decode(self.bits))
+
+    def __len__(self):
+        return self.count(self.bits)
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __contains__(self, row) -> bool:
+        return isinstance(row, int) and row >= 0 and bool(self.bits >> row & 1)
+
+    def add(self, row: int) -> None:
+        self.bits |= 1 << row
+
+    def update(self, rows: Iterable) -> None:
+        """ Adds many row numbers at once with a single OR """
+        self.bits |= self.encode(rows)
+
+    def discard(self, row: int) -> None:
+        if row in self:
+            self.bits ^= 1 << row
+
+    def remove(self, row: int) -> None:
+        if row not in self:
+            raise KeyError(row)
+        self.bits ^= 1 << row
+
+    def union(self, other: Iterable) -> PostingsBitmap:
+        if isinstance(other, (PostingsArray, PostingsBitmap)):
+            return PostingsBitmap(self.bits | other.bits)
+        return PostingsBitmap(self.bits | self.encode(other))
+
+    @staticmethod
+    def count(bits: int) -> int:
+        """ Counts the rows of a bitmap, using int.bit_count where there is one (Python 3.10+) """
+        bitCount = getattr(bits, 'bit_count', None)
+        return bitCount() if bitCount is not None else bin(bits).count('1')
+
+    @staticmethod
+    def encode(rows: Iterable) -> int:
+        """ Builds a bitmap out of an iterable of row numbers """
+        rows = rows if isinstance(rows, (list, array)) else list(rows)
+        if not rows:
+            return 0
+        buffer = bytearray((max(rows) >> 3) + 1)
+        for row in rows:
+            buffer[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(buffer, 'little')
+
+    @classmethod
+    def decode(cls, bits: int) -> list:
+        """ Returns the sorted row numbers of a bitmap. Runs of empty bytes are skipped by the regex engine. """
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        byteBits = cls._BYTE_BITS
+        rows: list = []
+        for match in cls._NON_ZERO.finditer(data):
+            start = match.start()
+            base = start << 3
+            rows.extend(base + bit for bit in byteBits[data[start]])
+        return rows
+
+
+class SnapshotFile:
+    """ <a name="SnapshotFile"></a>
+        SnapshotFile reads and writes the container format used by 'IndexedTable.save' and 'IndexedTable.load'. A
+        snapshot starts with a fixed header, the magic bytes, the format version and the size and crc32 of a table of
+        contents. The table of contents is JSON and lists the offset, size, crc32 and compression of each named
+        section. Sections are zlib compressed byte strings, often arrays written by 'pack'.
+
+        Opening a snapshot memory maps it and checks the header and table of contents. The checksum of a section is
+        only checked when it is read, so a section that is never read is never paged in. A ValueError is raised for a
+        file that is not a snapshot, has another version or fails a checksum.
+
+        :var path: The path of the snapshot.
+        :var sections: The table of contents, a dict of name -> [offset, size, crc32, compressed].
+    """
+
+    MAGIC = b'PCCSNAP\x00'
+    VERSION = 1
+    _HEADER = struct.Struct('<8sHIQ')
+
+    def __init__(self, path: Union[str, PathLike]):
+        self.path = path
+        with open(path, 'rb') as file:
+            size = fstat(file.fileno()).st_size
+            if size < self._HEADER.size:
+                raise ValueError(f'{fspath(path)!r} is not a snapshot')
+            self.__map: Optional[mmap] = mmap(file.fileno(), 0, access=ACCESS_READ)
+        magic, version, crc, length = self._HEADER.unpack_from(self.__map)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f'{fspath(path)!r} is not a snapshot')
+        if version != self.VERSION:
+            self.close()
+            raise ValueError(f'{fspath(path)!r} is a version {version} snapshot, this is version {self.VERSION}')
+        contents = self.__map[self._HEADER.size:self._HEADER.size + length]
+        if len(contents) != length or zlib.crc32(contents) != crc:
+            self.close()
+            raise ValueError(f'{fspath(path)!r} has a corrupt table of contents')
+        self.sections: Dict[str, list] = json.loads(contents)
+
+    def __enter__(self) -> SnapshotFile:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def read(self, name: str) -> bytes:
+        """ Returns the decompressed contents of a section after checking its crc32 """
+        if self.__map is None:
+            raise ValueError('The snapshot is closed')
+        offset, size, crc, compressed = self.sections[name]
+        data = self.__map[offset:offset + size]
+        if len(data) != size or zlib.crc32(data) != crc:
+            raise ValueError(f'The {name!r} section of {fspath(self.path)!r} fails its checksum')
+        return zlib.decompress(data) if compressed else data
+
+    def close(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    @classmethod
+    def write(cls, path: Union[str, PathLike], sections: Dict[str, bytes], level: int = 1) -> None:
+        """ Writes sections to a new snapshot. The snapshot is written next to 'path' first and then moved over it, so
+            an interrupted write never leaves half a snapshot behind.
+
+        :param path: (str/PathLike) where to write the snapshot.
+        :param sections: (dict) of name -> bytes.
+        :param level: (int: 1) the zlib compression level, 0 stores the sections as they are.
+        :return: None
+        """
+        contents: Dict[str, list] = {}
+        blobs = []
+        for name, data in sections.items():
+            compressed = level > 0
+            if compressed:
+                data = zlib.compress(data, level)
+            contents[name] = [0, len(data), zlib.crc32(data), compressed]
+            blobs.append(data)
+        # The offsets depend on the length of the table of contents which depends on the offsets
+        table = b''
+        while True:
+            offset = cls._HEADER.size + len(table)
+            for entry, data in zip(contents.values(), blobs):
+                entry[0] = offset
+                offset += len(data)
+            resized = json.dumps(contents).encode()
+            if len(resized) == len(table):
+                break
+            table = resized
+        table = resized
+        temporary = fspath(path) + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, zlib.crc32(table), len(table)))
+            file.write(table)
+            for data in blobs:
+                file.write(data)
+        replace(temporary, path)
+
+    @staticmethod
+    def pack(values: Union[list, array], typecode: Optional[str] = None) -> bytes:
+        """ Packs a list or array of ints into the bytes of the smallest array that holds them, signed only when one of
+            them is negative, or an array of 'typecode', behind a one byte typecode. Arrays are written little endian.
+        """
+        if typecode is None:
+            smallest, largest = min(values, default=0), max(values, default=0)
+            if smallest < 0:
+                typecode = next(code for code in 'bhiq' if -smallest <= 1 << (array(code).itemsize << 3) - 1 and
+                                largest < 1 << (array(code).itemsize << 3) - 1)
+            else:
+                typecode = next(code for code in 'BHIQ' if largest < 1 << (array(code).itemsize << 3))
+        packed = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        if sys.byteorder == 'big':
+            packed = array(typecode, packed)
+            packed.byteswap()
+        return typecode.encode() + packed.tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> array:
+        """ The reverse of 'pack' """
+        unpacked = array(chr(data[0]))
+        unpacked.frombytes(data[1:])
+        if sys.byteorder == 'big':
+            unpacked.byteswap()
+        return unpacked
+
+
+class ReadWriteLock:
+    """ <a name="ReadWriteLock"></a>
+        ReadWriteLock lets any number of threads hold it for reading at once, or a single thread hold it for writing.
+        It is what IndexedTable uses when created with thread_safe=True.
+
+        Writers are preferred: once a writer is waiting new readers wait behind it, so a steady stream of searches
+        cannot hold off an ingest thread forever. The lock is reentrant. A thread holding it for reading can read
+        again, and a thread holding it for writing can read or write again, which is what lets the search methods
+        call each other and 'extend' call 'append'. Asking to write while holding it only for reading would wait
+        forever on itself, so that raises a RuntimeError instead.
+
+        Use 'reading' and 'writing' as context managers.
+    """
+
+    def __init__(self) -> None:
+        self.__condition = Condition(Lock())
+        self.__local = local()
+        self.__readers = 0
+        self.__waiting = 0
+        self.__writer: Optional[int] = None
+        self.__writes = 0
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """ Holds the lock for reading for the duration of a with statement """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """ Holds the lock for writing for the duration of a with statement """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def acquire_read(self) -> None:
+        depth = getattr(self.__local, 'depth', 0)
+        with self.__condition:
+            if not depth and self.__writer != get_ident():
+                while self.__writer is not None or self.__waiting:
+                    self.__condition.wait()
+            self.__readers += 1
+        self.__local.depth = depth + 1
+
+    def release_read(self) -> None:
+        self.__local.depth -= 1
+        with self.__condition:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self.__condition:
+            if self.__writer == get_ident():
+                self.__writes += 1
+                return None
+            if getattr(self.__local, 'depth', 0):
+                raise RuntimeError('Cannot write while holding a ReadWriteLock for reading')
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = get_ident()
+            self.__writes = 1
+
+    def release_write(self) -> None:
+        with self.__condition:
+            self.__writes -= 1
+            if not self.__writes:
+                self.__writer = None
+                self.__condition.notify_all()
+
+
+def read_locked(func: Callable) -> Callable:
+    """ Decorator for the methods of IndexedTable that read the index. When the table was created with thread_safe=True
+        the method runs holding its lock for reading. Iterators are read into a list before the lock is released so
+        they never see the index change under them.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        if lock is None:
+            return func(self, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            result = func(self, *args, **kwargs)
+            if isinstance(result, Iterator):
+                return iter(list(result))
+            return result
+        finally:
+            lock.release_read()
+
+    return wrapper
+
+
+def write_locked(func: Callable) -> Callable:
+    """ Decorator for the methods of IndexedTable that change the rows or the index. When the table was created with
+        thread_safe=True the method runs holding its lock for writing.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        if lock is None:
+            return func(self, *args, **kwargs)
+        lock.acquire_write()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return wrapper
+
+
+_worker_rows: Any = None
+
+
+def _share_rows(rows: list) -> None:
+    """ The initializer of forked worker processes of 'IndexedTable.build_index'. The rows are inherited by the fork
+        instead of being pickled and are only kept within the worker, so tables building at the same time never see
+        each other's rows.
+    """
+    global _worker_rows
+    _worker_rows = rows
+
+
+@paused_gc()
+def _chunk_postings(start: int, stop: int, offset: int, column_index: bool, rows: Optional[list] = None) -> list:
+    """ Builds the postings of rows[start:stop] in a worker process of 'IndexedTable.build_index'. When the workers are
+        forked the rows are read from those given to '_share_rows' instead of being sent to them.
+
+    :param start: (int) the first row of the chunk.
+    :param stop: (int) the row after the last row of the chunk.
+    :param offset: (int) the row id of the first row of the chunk.
+    :param column_index: (bool) also build the per-column postings.
+    :param rows: (list: None) the rows of the chunk when they are sent to the worker instead.
+    :return: list of (keys, counts, row ids) for the index followed by one for each column when column_index is True.
+        The row ids of every key follow each other in the order of 'keys', 'counts' says how many each key has. Arrays
+        are much faster to pickle back to the parent than sets.
+    """
+    if rows is None:
+        rows = _worker_rows[start:stop]
+    parts: List[defaultdict] = [defaultdict(list)]
+    for i, items in enumerate(rows, start=offset):
+        for item in items:
+            parts[0][item].append(i)
+        if column_index:
+            for column, item in enumerate(items, start=1):
+                if column == len(parts):
+                    parts.append(defaultdict(list))
+                parts[column][item].append(i)
+    return [(list(postings), array('I', map(len, postings.values())),
+             array('I', chain.from_iterable(postings.values()))) for postings in parts]
+
+
+def cached_indices(func: Callable) -> Callable:
+    """ Decorator for the 'indices_of' methods of IndexedTable. When the table has a cache_size the output of the method
+        is kept in the LRU cache of the table keyed on the name of the method, its arguments and the explicit,
+        ignore_case and ordered settings in effect. Keyword arguments left at their default are filled in so passing
+        them or not makes no difference. Calls with unhashable arguments are not cached.
+    """
+
+    defaults = {name: parameter.default for name, parameter in signature(func).parameters.items()
+                if parameter.default is not parameter.empty}
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self.cache_size:
+            return func(self, *args, **kwargs)
+        options = dict(defaults)
+        options.update(zip(('explicit', 'ignore_case', 'ordered'),
+                           self._processKwargs('explicit', 'ignore_case', 'ordered', **kwargs)))
+        options.update(kwargs)
+        return self._cached((func.__name__, args, tuple(sorted(options.items()))), func, *args, **kwargs)
+
+    return wrapper
 
 
 class IndexedTable(KeyedTable):
@@ -763,7 +2740,7 @@ class IndexedTable(KeyedTable):
         always return iterators of ints.
 
         Here are the common parameters found in most methods and there default values:
-        explicit=True | ignore_case=False | ordered=True | convert=True | similarity=0.6
+        explicit=True | ignore_case=False | ordered=True | convert=True | lazy=False | similarity=0.6
 
         * explicit: This implies the lookup wil do a '=='. IE: key == item. When False it does: key in item.
         * ignore_case: When True this will do a 'lower()' on the value in question, this assumes string, on both the
@@ -772,20 +2749,130 @@ class IndexedTable(KeyedTable):
             on it.
         * convert: This will always return a new IndexedTable, even if empty, unless it is false then it will return
             a list.
+        * lazy: When True the search methods return an IndexedTableView instead. It only holds the row numbers of the
+            results and reads the rows from this table so nothing is copied or indexed. This takes precedence over
+            convert.
         * similarity: This is only associated with fuzzy methods and is an indication as to how similar the keyword
             needs to be to the item.
 
-        The default values for explicit, ignore_case, ordered, and convert can be changed on init.
+        The default values for explicit, ignore_case, ordered, convert and lazy can be changed on init.
+
+        Setting column_index=True on init will also build per-column postings (column -> value -> row set) next to the
+        main index. This makes 'search_by_column', 'correlation' and 'has_pair' dictionary lookups instead of a scan
+        over every row in a column at the cost of a second set of postings.
+
+        Case-insensitive exact lookups are answered by a shadow index that maps the lower case version of every key
+        in the index to the original keys. It is built lazily the first time it is needed and then kept in sync with
+        the index until the next 'build_index'.
+
+        Setting ngram on init, for example ngram=3, enables an NGramIndex over the keys of the index that narrows down
+        explicit=False searches to the keys sharing every n-gram with the keyword before the final 'keyword in key'
+        check. With ignore_case the grams are taken from the lower case keys of the shadow index instead. Keywords
+        shorter than ngram still check every key. Both gram indexes are built lazily like the shadow index.
+
+        Setting fuzzy_index=True on init makes the fuzzy_ methods that match against the keys of the index use a
+        FuzzyIndex instead of 'difflib.get_close_matches'. The results are the same, only fewer keys get scored.
+
+        Setting compact=True on init stores postings as a PostingsArray, or a PostingsBitmap for keys found in many
+        rows, instead of a set. This shrinks the index several times over and turns the AND/OR of 'search' and
+        'correlation' into bitwise operations on Python ints. Appending to a key that is already a bitmap copies it,
+        so prefer 'extend' with batches of rows over many calls to 'append' on a compact table.
+
+        The postings hold row ids instead of positions so that 'insert', 'pop', 'remove', 'reverse', 'sort' and
+        'sort_by_column' only update the postings of the rows they add or remove instead of rebuilding the index.
+        While rows are only added to the end and removed from either end the row id is the position plus an offset.
+        Anything else switches the table to a list of row ids, which costs a pass over the rows but no re-indexing.
+        'build_index' numbers the rows by position again.
+
+        Setting delta on init, for example delta=1024, makes 'append' and 'extend' add the postings of new rows to a
+        small delta segment instead of the index. Searches read both. Once the delta segment holds 'delta' rows, or
+        when 'merge_delta' is called, it is merged into the index in one batch. This is mostly useful together with
+        compact=True where it turns many bitmap copies into one per key and merge.
+
+        Setting cache_size on init keeps the output of up to that many 'indices_of' calls in an LRU cache, which the
+        search methods also go through. 'generation' is bumped by every method that changes the rows and drops the
+        cached results. Use 'cache_info' to see how well the cache is doing.
+
+        Setting range_columns on init, a dict of column -> column_type such as {'RSS': int}, keeps a RangeIndex for
+        each of those columns. They answer 'range_search', 'indices_of_smallest', 'indices_of_largest', 'min_value' and
+        'max_value' with a binary search instead of a scan, and are kept up to date as rows are added and removed.
+        'build_range_index' adds one to an existing table.
+
+        'save' writes the rows, columns, options and index to a compressed snapshot and 'load' reads them back without
+        rebuilding the index. See SnapshotFile for the format.
+
+        Setting workers on init, for example workers=os.cpu_count(), builds the postings of at least
+        'parallel_threshold' rows at a time in that many processes, each indexing one chunk of the rows, and merges
+        them. This covers building the index on init, 'build_index' and large calls to 'extend'. 'build_index' also
+        takes workers, in which case the threshold does not apply. Where processes are forked, as on Linux, the rows
+        are not even pickled to them. While other threads are running the processes are spawned and sent their rows
+        instead, as forking a process with threads can hang. The garbage collector is paused while building the index
+        of more than 'gc_threshold' rows at once, read 'paused_gc'.
+
+        Setting thread_safe=True on init lets one thread add rows while others search. The methods that read the index
+        hold 'lock', a ReadWriteLock, for reading and the methods that change the rows or the index hold it for
+        writing, so searches run side by side and only wait for a write in progress. 'indices_of' methods return
+        their indices already read into a list. Iterating over the table itself and reading the rows of a lazy
+        result are not covered, hold 'lock' for reading around those or any other group of calls that must see the
+        same rows.
+
+        The 'a' versions of the search methods, like 'asearch' or 'afuzzy_column', are coroutines for asyncio code.
+        They run the search in an executor, the default thread pool of the event loop unless one is passed as
+        executor, so a long search does not hold up the rest of the loop. 'aiter_indices' and 'aiter_rows' do the
+        same and then yield the results a batch at a time. Cancelling one stops waiting for the search but cannot
+        interrupt it, so it runs to the end in its thread. Use thread_safe=True if the table is changed while they
+        run.
 
     """
 
+    parallel_threshold = 100000
+    gc_threshold = 10000
+
     def __init__(self, *args, columns: Optional[Dict] = None,
-                 explicit: bool = True, ignore_case: bool = False, ordered: bool = True, convert: bool = True):
+                 explicit: bool = True, ignore_case: bool = False, ordered: bool = True, convert: bool = True,
+                 lazy: bool = False, column_index: bool = False, ngram: int = 0, fuzzy_index: bool = False,
+                 compact: bool = False, delta: int = 0, cache_size: int = 0, range_columns: Optional[Dict] = None,
+                 workers: int = 0, thread_safe: bool = False, frozen: bool = False, records: bool = False):
+        self.thread_safe = thread_safe
+        self.frozen = frozen
+        self.records = records
+        self.lock: Optional[ReadWriteLock] = ReadWriteLock() if thread_safe else None
         self.explicit = explicit
         self.ignore_case = ignore_case
         self.ordered = ordered
         self.convert = convert
-        self.__index: defaultdict = defaultdict(set)
+        self.lazy = lazy
+        self.column_index = column_index
+        self.ngram = ngram
+        self.fuzzy_index = fuzzy_index
+        self.compact = compact
+        self.delta = delta
+        self.cache_size = cache_size
+        self.range_columns = dict(range_columns or {})
+        self.workers = workers
+        self.generation = 0
+        self.__cache: OrderedDict = OrderedDict()
+        self.__cache_lock: Any = Lock() if thread_safe else nullcontext()
+        self.__cache_generation = 0
+        self.__caching = local()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__index: defaultdict = defaultdict(self._postings_type())
+        self.__column_postings: dict = {}
+        self.__folded: Optional[defaultdict] = None
+        self.__grams: Optional[NGramIndex] = None
+        self.__folded_grams: Optional[NGramIndex] = None
+        self.__fuzzy: Optional[FuzzyIndex] = None
+        self.__base = 0
+        self.__next_row_id = 0
+        self.__row_ids: Optional[list] = None
+        self.__positions: Optional[dict] = None
+        self.__shift = 0
+        self.__delta: dict = {}
+        self.__delta_start = 0
+        self.__pending = 0
+        self.__ranges: dict = {}
         if len(args) == 1 and isinstance(args[0], (IndexedTable, KeyedTable)):
             super().__init__(*args, columns=args[0].columns)
             tmpDefaultDict = getattr(args[0], '_IndexedTable__index')
@@ -795,120 +2882,274 @@ class IndexedTable(KeyedTable):
             super().__init__(*args, columns=columns)
         if len(self) > 0:
             self.build_index()
+        else:
+            self._build_ranges()
 
     def __str__(self):
         return '\n'.join((' '.join(item) for item in self))
 
-    def build_index(self, rebuild=True) -> None:
-        """ This builds the Index using a 'hidden' variable '__index' which is a defaultdict whose values are sets """
+    def __getattr__(self, name: str) -> Any:
+        """ Decodes the postings of a table loaded with lazy_postings=True the first time anything uses the index """
+        if name in ('_IndexedTable__index', '_IndexedTable__column_postings') and \
+                '_IndexedTable__snapshot' in self.__dict__:
+            self._load_postings(*self.__dict__.pop('_IndexedTable__snapshot'))
+            return self.__dict__[name]
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        """ Pickles the table as its rows, columns and options. The index is rebuilt when it is unpickled. """
+        return partial(type(self), columns=self.columns, **self._options()), (list(self),)
+
+    @write_locked
+    def build_index(self, rebuild=True, workers: Optional[int] = None) -> None:
+        """ This builds the Index using a 'hidden' variable '__index' which is a defaultdict whose values are sets. When
+            workers is more than 1 the rows are indexed in that many processes, read the Class doc string.
+        """
         if self.__index:
             if rebuild:
-                self.__index = defaultdict(set)
+                self.__index = defaultdict(self._postings_type())
             else:
                 return None
+        self.generation += 1
+        self.__base = 0
+        self.__next_row_id = len(self)
+        self.__row_ids = None
+        self.__positions = None
+        self.__shift = 0
+        self.__delta = {}
+        self.__pending = 0
+        self.__column_postings = {}
+        self.__folded = None
+        self.__grams = None
+        self.__folded_grams = None
+        self.__fuzzy = None
+        with paused_gc() if len(self) > self.gc_threshold else nullcontext():
+            self._add_rows(0, self, workers)
+        self._build_ranges()
+
+    @write_locked
+    def build_range_index(self, column: Hashable, column_type: Callable = float) -> None:
+        """ Builds a RangeIndex over a column, replacing the one already there, and adds it to 'range_columns' so it
+            is kept up to date from now on.
+
+        :param column: (Hashable) the column name or number. Raises a KeyError if it cannot be found.
+        :param column_type: (Callable: float) converts the cells into something that can be sorted. IE: int, float or
+            datetime.fromisoformat
+        :return: None
+        """
+        number = self._column_number(column)
+        self.range_columns[column] = column_type
+        self.__ranges[number] = RangeIndex(((row[number], rowId) for row, rowId in
+                                            zip(self, self._row_ids_at(range(len(self)))) if len(row) > number),
+                                           column_type)
+        self.generation += 1
+
+    @write_locked
+    def merge_delta(self) -> None:
+        """ Merges the postings of the rows held in the delta segment into the index. This happens on its own once
+            the delta segment holds 'delta' rows.
+        """
+        if not self.__delta:
+            return None
+        for column, delta in self.__delta.items():
+            index = self.__index if column is None else self.__column_postings[column]
+            if self.compact:
+                self._update_postings(index, delta)
+            else:
+                for key, rows in delta.items():
+                    index[key].update(rows)
+        self.__delta = {}
+        self.__pending = 0
+
+    @write_locked
+    def save(self, path: Union[str, PathLike], level: int = 1) -> None:
+        """ Writes the rows, columns, options and postings of the table to a snapshot that 'load' reads back without
+            rebuilding the index. Each distinct cell is written once and the rows become arrays of numbers into that
+            list of cells. The postings of each key are written as the gaps between its row numbers, small numbers
+            that compress well, except for the bitmaps of a compact table which are written as they are. Rows waiting
+            in the delta segment are merged first. The cells, column names and options are pickled so only load
+            snapshots you trust, and the column types of range_columns must be picklable, IE: int, not a lambda.
+
+        :param path: (str/PathLike) where to write the snapshot, an existing file is replaced.
+        :param level: (int: 1) the zlib compression level, 0 turns compression off. Higher levels save little space
+            on postings and take several times longer.
+        :return: None
+        """
+        self.merge_delta()
+        keys = list(self.__index)
+        keyIds: dict = dict(zip(keys, range(len(keys))))
+        try:
+            cells = array('Q', chain.from_iterable(map(keyIds.__getitem__, row) for row in self))
+            exact = all(map(is_, map(type, chain.from_iterable(self)), map(type, map(keys.__getitem__, cells))))
+        except KeyError:
+            exact = False
+        lookup: Callable = keyIds.__getitem__
+        if not exact:
+            # Equal cells of different types, IE: 1 and 1.0, share a key within the index so number them by type too
+            keyIds = {(key.__class__, key): keyId for keyId, key in enumerate(keys)}
+
+            def lookup(cell: Any) -> int:
+                keyId = keyIds.get((cell.__class__, cell))
+                if keyId is None:
+                    keyId = keyIds[(cell.__class__, cell)] = len(keys)
+                    keys.append(cell)
+                return keyId
+
+            cells = array('Q', map(lookup, chain.from_iterable(self)))
+        lengths = array('Q', map(len, self))
+        width = lengths[0] if lengths and lengths.count(lengths[0]) == len(lengths) else None
+        sections = {'cells': SnapshotFile.pack(cells)}
+        if width is None:
+            sections['lengths'] = SnapshotFile.pack(lengths)
+        sections.update(self._pack_postings('index', self.__index.values()))
+        for number, postings in self.__column_postings.items():
+            sections[f'column.{number}.keys'] = SnapshotFile.pack(array('Q', map(lookup, postings)))
+            sections.update(self._pack_postings(f'column.{number}', postings.values()))
+        sections['meta'] = pickle.dumps({'columns': self.columns, 'options': self._options(), 'rows': len(self),
+                                         'width': width, 'column_postings': list(self.__column_postings)},
+                                        pickle.HIGHEST_PROTOCOL)
+        sections['keys'] = pickle.dumps(keys, pickle.HIGHEST_PROTOCOL)
+        SnapshotFile.write(path, sections, level=level)
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike], lazy_postings: bool = False) -> IndexedTable:
+        """ Reads back a table written by 'save' with the same rows, columns, options and index. Range indexes are
+            rebuilt from the rows. Raises a ValueError when the file is not a snapshot, was written by another version
+            of the format or fails a checksum.
+
+        :param path: (str/PathLike) the snapshot.
+        :param lazy_postings: (bool: False) keeps the snapshot memory mapped and only decodes the postings the first
+            time the index is used, which makes loading a table that is only read from, or only appended to later,
+            about as fast as reading its rows.
+        :return: a new table of this class, IE: ColumnarIndexedTable.load stores the rows by column.
+        """
+        snapshot = SnapshotFile(path)
+        try:
+            meta = pickle.loads(snapshot.read('meta'))
+            keys = pickle.loads(snapshot.read('keys'))
+            cells = list(map(keys.__getitem__, SnapshotFile.unpack(snapshot.read('cells'))))
+            width = meta['width']
+            if width is None:
+                cellIter = iter(cells)
+                rows = [list(islice(cellIter, length)) for length in SnapshotFile.unpack(snapshot.read('lengths'))]
+            elif width:
+                rows = [cells[i:i + width] for i in range(0, len(cells), width)]
+            else:
+                rows = [[] for _ in range(meta['rows'])]
+            del cells
+            table = cls(columns=meta['columns'], **meta['options'])
+            super(IndexedTable, table).extend(rows)
+            table.__next_row_id = len(rows)
+            table._build_ranges()
+            if lazy_postings:
+                del table.__index, table.__column_postings
+                table.__dict__['_IndexedTable__snapshot'] = (snapshot, keys, meta['column_postings'])
+            else:
+                table._load_postings(snapshot, keys, meta['column_postings'])
+        except BaseException:
+            snapshot.close()
+            raise
+        return table
+
+    def cache_info(self) -> NamespaceDict:
+        """ Returns the hits, misses and evictions of the result cache along with its size and cache_size """
+        return NamespaceDict(hits=self.__hits, misses=self.__misses, evictions=self.__evictions,
+                             size=len(self.__cache), cache_size=self.cache_size)
+
+    @write_locked
+    def cache_clear(self) -> None:
+        """ Empties the result cache and resets its statistics """
+        self.__cache.clear()
+        self.__hits = self.__misses = self.__evictions = 0
+
+    @read_locked
+    def explain(self, method: str, *args, **kwargs) -> list:
+        """ Runs an AND 'search' or a 'correlation' and reports how it was planned. Both estimate the rows matching
+            each keyword or pair from the size of their postings, start with the smallest and then only check the
+            rows that are left against the others. A pair on a column without postings is estimated from the postings
+            of its keywords within the index.
+
+        :param method: (str) Either 'search' or 'correlation'.
+        :param args: The keywords or pairs, the same as the method being explained.
+        :param explicit: (bool: True) read the Class doc string for more information.
+        :param ignore_case: (bool: False) read the Class doc string for more information.
+        :return: list of NamespaceDicts, one per keyword or pair in the order they were evaluated. Each has the 'term',
+            its 'estimate', the 'rows' left after it and the 'step' taken: 'union' when all its rows were found,
+            'probe' when only the rows left were checked and 'skipped' when no rows were left.
+        """
 
-        for i, items in enumerate(self):
-            for item in items:
-                self.__index[item].add(i)
+        explicit, ignore_case = self._processKwargs('explicit', 'ignore_case', **kwargs)
+        if method == 'search':
+            terms = self._search_terms(args, explicit, ignore_case)
+        elif method == 'correlation':
+            terms = self._correlation_terms(args, explicit, ignore_case)
+        else:
+            raise ValueError(f"explain only supports 'search' and 'correlation' not {method!r}")
+        self._run_plan(terms)
+        return [NamespaceDict(term=term['term'], estimate=term['estimate'], rows=term['rows'], step=term['step'])
+                for term in terms]
 
+    @read_locked
     def has_value(self, value: Hashable, **kwargs) -> bool:
         """ Returns true if the value exists within the index. """
         explicit, ignore_case = self._processKwargs('explicit', 'ignore_case', **kwargs)
         if explicit is True and ignore_case is False:
             return value in self.__index
         if explicit is True and ignore_case is True:
-            value = getattr(value, 'lower', dummy_func)()
-            for item in self.__index:
-                if value == getattr(item, 'lower', dummy_func)():
-                    return True
-            return False
-        if explicit is False and ignore_case is False:
-            for item in self.__index:
-                if value in item:
-                    return True
-            return False
-        if explicit is False and ignore_case is True:
-            value = getattr(value, 'lower', dummy_func)()
-            for item in self.__index:
-                if value in getattr(item, 'lower', dummy_func)():
-                    return True
+            return self._fold(value) in self._folded_index()
+        if explicit is False:
+            for _ in self._keys_containing(value, ignore_case):
+                return True
             return False
         return False
 
+    @read_locked
     def has_pair(self, column, value, **kwargs) -> bool:
         """ Looks for a value within a column and returns True if it exists """
         explicit, ignore_case = self._processKwargs('explicit', 'ignore_case', **kwargs)
-        if explicit is True and ignore_case is False:
-            if value not in self.__index:
-                return False
-            for item in self.iter_column(column):
-                if value == item:
-                    return True
-            return False
-        if explicit is True and ignore_case is True:
-            value = getattr(value, 'lower', dummy_func)()
-            for item in self.iter_column(column):
-                if value == getattr(item, 'lower', dummy_func)():
-                    return True
-            return False
-        if explicit is False and ignore_case is True:
-            value = getattr(value, 'lower', dummy_func)()
-            for item in self.iter_column(column):
-                if value in getattr(item, 'lower', dummy_func)():
-                    return True
-            return False
-        if explicit is False and ignore_case is False:
-            for item in self.iter_column(column):
-                if value in item:
-                    return True
+        postings = self._column_postings(column)
+        if postings is not None:
+            return self._has_column_value(postings, value, explicit, ignore_case)
+        try:
+            number = self._column_number(column)
+        except KeyError:
             return False
-        return False
-
+        rows = self._union(self._key_postings(dict.fromkeys(self._matching_keys(value, explicit, ignore_case))))
+        match = self._cell_matcher([value], explicit, ignore_case)
+        rowIds = PostingsBitmap.decode(rows) if isinstance(rows, int) else rows
+        return any(number < len(self[position]) and match(self[position][number])
+                   for position in self._row_positions(rowIds))
+
+    @read_locked
+    @cached_indices
     def indices_of_value_by_keyword(self, keyword, **kwargs) -> Iterable:
         """
             Helper function for value_by_keyword returns an iterable object of indices as does all 'indices_of' methods
         """
 
         explicit, ignore_case, ordered = self._processKwargs('explicit', 'ignore_case', 'ordered',  **kwargs)
-        output = iter(())
-        if explicit is True and ignore_case is False:
-            output = (index for index in self.__index.get(keyword, ()))
-        if explicit is False and ignore_case is False:
-            output = (index for key in self.__index if keyword in key for index in self.__index[key])
-        if explicit is True and ignore_case is True:
-            keyword = getattr(keyword, 'lower', dummy_func)()
-            output = (index for key in self.__index if keyword == getattr(key, 'lower', dummy_func)()
-                      for index in self.__index[key])
-        if explicit is False and ignore_case is True:
-            keyword = getattr(keyword, 'lower', dummy_func)()
-            output = (index for key in self.__index if keyword in getattr(key, 'lower', dummy_func)()
-                      for index in self.__index[key])
-        return self._ordered(output, ordered=ordered)
+        output = (index for postings in self._key_postings(self._matching_keys(keyword, explicit, ignore_case))
+                  for index in postings)
+        return self._ordered(self._row_positions(output), ordered=ordered)
 
+    @read_locked
     def value_by_keyword(self, keyword, **kwargs):
         """ Searches the dataset using a single keyword. A simpler version of the search method."""
-        return self._convert([self[index]
-                              for index in self.indices_of_value_by_keyword(keyword, **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_value_by_keyword(keyword, **kwargs), **kwargs)
 
+    @read_locked
+    @cached_indices
     def indices_of_search(self, *args, AND=False, **kwargs) -> Iterable:
         """ Helper function for search returns an iterable object of indices as does all 'indices_of' methods """
         explicit, ignore_case, ordered = self._processKwargs('explicit', 'ignore_case', 'ordered', **kwargs)
         if AND is True:
-            sets = [set(self.indices_of_value_by_keyword(keyword,
-                                                         explicit=explicit,
-                                                         ignore_case=ignore_case,
-                                                         ordered=False))
-                    for keyword in args]
-            return iter(self._ordered(set.intersection(*sets), ordered=ordered))
-        else:
-            return iter(self._ordered({index for keyword in args
-                                       for index in self.indices_of_value_by_keyword(keyword,
-                                                                                     explicit=explicit,
-                                                                                     ignore_case=ignore_case,
-                                                                                     ordered=False)},
+            return iter(self._indices(self._run_plan(self._search_terms(args, explicit, ignore_case)),
                                       ordered=ordered))
+        sets = [self._union(self._key_postings(self._matching_keys(keyword, explicit, ignore_case)))
+                for keyword in args]
+        return iter(self._indices(reduce(or_, sets, self._union(())), ordered=ordered))
 
+    @read_locked
     def search(self, *args, AND=False, **kwargs) -> Iterable:
         """ This can take an undefined number of keywords via *args parameter. It searches the dataset using all these
             keywords using its helper method indices_of_search. It takes the indices provided by indices_of_search
@@ -923,40 +3164,50 @@ class IndexedTable(KeyedTable):
         :param ignore_case: (bool: False) read the Class doc string for more information.
         :param ordered: (bool: True) read the Class doc string for more information.
         :param convert: (bool: True) read the Class doc string for more information.
-        :return: Iterable (IndexedTable or List)
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
         """
 
-        return self._convert([self[index]
-                              for index in self.indices_of_search(*args, AND=AND, **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_search(*args, AND=AND, **kwargs), **kwargs)
 
+    @read_locked
+    @cached_indices
     def indices_of_search_by_column(self, column: Hashable, keywords, **kwargs) -> Iterable:
         """
             Helper function for search_by_column returns an iterable object of indices as does all 'indices_of' methods
         """
 
         explicit, ignore_case, ordered = self._processKwargs('explicit', 'ignore_case', 'ordered', **kwargs)
-        columnIter = self.iter_column(column, default=None)
-        output: Union[Generator, Iterable] = iter(())
-        if columnIter is None:
-            return output
         if isinstance(keywords, str):
             keywords = [keywords]
         if ignore_case is True:
             keywords = [getattr(key, 'lower', dummy_func)() for key in keywords]
+        postings = self._column_postings(column)
+        if postings is not None:
+            rows = (index for values in self._key_postings(self._column_values(postings, keywords, explicit,
+                                                                               ignore_case), column)
+                    for index in values)
+            return self._ordered(self._row_positions(rows), ordered=ordered)
+
+        columnIter = self.iter_column(column, default=None)
+        output: Union[Generator, Iterable] = iter(())
+        if columnIter is None:
+            return output
 
         if explicit is True and ignore_case is False:
             output = (index for index, value in enumerate(columnIter) if value in keywords)
         if explicit is False and ignore_case is False:
             output = (index for index, value in enumerate(columnIter) for key in keywords if key in value)
         if explicit is True and ignore_case is True:
+            folded = self._folded_index()
             output = (index for index, value in enumerate(columnIter)
-                      for key in keywords if key == getattr(value, 'lower', dummy_func)())
+                      for key in keywords if value in folded.get(key, ()))
         if explicit is False and ignore_case is True:
             output = (index for index, value in enumerate(columnIter)
                       for key in keywords if key in getattr(value, 'lower', dummy_func)())
         return self._ordered(output, ordered=ordered)
 
+    @read_locked
     def search_by_column(self, column: Hashable, keywords: Union[str, tuple], **kwargs) -> Iterable:
         """ This uses a pair of data. A column which should be a value that can be found in the 'columns' KeyedList
             class variable or a column number. And 1 or more keywords. The keywords must be a string which is treated
@@ -968,27 +3219,22 @@ class IndexedTable(KeyedTable):
         :param ignore_case: (bool: False) read the Class doc string for more information.
         :param ordered: (bool: True) read the Class doc string for more information.
         :param convert: (bool: True) read the Class doc string for more information.
-        :return: Iterable (IndexedTable or List)
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
         """
 
-        return self._convert([self[index]
-                              for index in self.indices_of_search_by_column(column, keywords, **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_search_by_column(column, keywords, **kwargs), **kwargs)
 
+    @read_locked
+    @cached_indices
     def indices_of_correlation(self, *args, **kwargs) -> Iterable:
         """ Helper function for correlation returns an iterable object of indices as does all 'indices_of' methods """
 
         explicit, ignore_case, ordered = self._processKwargs('explicit', 'ignore_case', 'ordered', **kwargs)
-        parameters = ('column', 'keywords', 'explicit', 'ignore_case')
-        sets = []
-        for searchPair in args:
-            searchPair = dict(zip(parameters, searchPair))
-            if len(searchPair) < 3:
-                searchPair.update({'explicit': explicit, 'ignore_case': ignore_case})
-            searchPair.update({'ordered': False})
-            sets.append(set(self.indices_of_search_by_column(**searchPair)))
-        return iter(self._ordered(set.intersection(*sets), ordered=ordered))
+        return iter(self._indices(self._run_plan(self._correlation_terms(args, explicit, ignore_case)),
+                                  ordered=ordered))
 
+    @read_locked
     def correlation(self, *args, **kwargs) -> Iterable:
         """ This acts similar to 'search_by_column' in that it looks for pairs as in ('COLUMN_NAME', 'search_value').
             It however, can take multiple such pairs. Each pair is a tuple and the length of the tuple must be either,
@@ -1003,13 +3249,149 @@ class IndexedTable(KeyedTable):
         :param ignore_case: (bool: False) read the Class doc string for more information.
         :param ordered: (bool: True) read the Class doc string for more information.
         :param convert: (bool: True) read the Class doc string for more information.
-        :return: Iterable (IndexedTable or List)
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
+        """
+
+        return self._result(self.indices_of_correlation(*args, **kwargs), **kwargs)
+
+    @read_locked
+    def where(self, column: Hashable, op: str, value: Any, column_type: Callable = float, **kwargs) -> Iterable:
+        """ Returns the rows where the cell of 'column' converted by 'column_type' compares to 'value'. IE:
+            where('%CPU', '>=', 50) or where('PID', 'isin', ('1', '2'), int). This uses 'indices_of_where' from
+            KeyedTable, read its doc string for more information.
+
+        :param column: (Hashable) the column name or number.
+        :param op: (str) one of '==', '!=', '<', '<=', '>', '>=', 'between' or 'isin'.
+        :param value: The value to compare against, a pair of (low, high) for 'between' or an iterable for 'isin'.
+        :param column_type: (Callable: float) a type such as int or float.
+        :param convert: (bool: True) read the Class doc string for more information.
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
         """
 
-        return self._convert([self[index]
-                              for index in self.indices_of_correlation(*args, **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_where(column, op, value, column_type), **kwargs)
 
+    @read_locked
+    @cached_indices
+    def indices_of_range(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                         include_high: bool = True, **kwargs) -> Iterable:
+        """ Helper function for range_search. Uses the RangeIndex of the column and raises a KeyError if there isn't
+            one. Without ordered the row numbers come back sorted by the value in the column.
+        """
+        ordered = self._processKwargs('ordered', **kwargs)
+        rows = self._row_positions(self._range_index(column).between(low, high, include_low, include_high))
+        return iter(sorted(rows) if ordered else list(rows))
+
+    @read_locked
+    def range_search(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                     include_high: bool = True, **kwargs) -> Iterable:
+        """ Returns the rows where the cell of 'column', converted by the column_type of its RangeIndex, is between
+            low and high. IE: range_search('TIME', '2024-05-01T10:00', '2024-05-01T11:00', include_high=False). Low and
+            high that are strings are converted the same way as the cells. This needs a RangeIndex on the column, read
+            the Class doc string for more information.
+
+        :param column: (Hashable) the column name or number.
+        :param low: The lower bound or None for no lower bound.
+        :param high: The upper bound or None for no upper bound.
+        :param include_low: (bool: True) whether rows equal to low are included.
+        :param include_high: (bool: True) whether rows equal to high are included.
+        :param ordered: (bool: True) read the Class doc string for more information.
+        :param convert: (bool: True) read the Class doc string for more information.
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
+        """
+
+        return self._result(self.indices_of_range(column, low, high, include_low, include_high, **kwargs), **kwargs)
+
+    @read_locked
+    @cached_indices
+    def indices_of_smallest(self, column: Hashable, k: int = 1, **kwargs) -> Iterable:
+        """ Returns the row numbers of the k rows with the smallest values in a column, smallest first. Rows with
+            equal values keep their order. This needs a RangeIndex on the column.
+        """
+        return self._ranked_positions(self._range_index(column), k, largest=False)
+
+    @read_locked
+    @cached_indices
+    def indices_of_largest(self, column: Hashable, k: int = 1, **kwargs) -> Iterable:
+        """ Returns the row numbers of the k rows with the largest values in a column, largest first. Rows with
+            equal values keep their order. This needs a RangeIndex on the column.
+        """
+        return self._ranked_positions(self._range_index(column), k, largest=True)
+
+    @read_locked
+    def min_value(self, column: Hashable, default: Any = None) -> Any:
+        """ Returns the smallest converted value in a column, or default if there is none. Needs a RangeIndex. """
+        return self._range_index(column).min(default)
+
+    @read_locked
+    def max_value(self, column: Hashable, default: Any = None) -> Any:
+        """ Returns the largest converted value in a column, or default if there is none. Needs a RangeIndex. """
+        return self._range_index(column).max(default)
+
+    @read_locked
+    @cached_indices
+    def indices_of_top_k(self, column: Hashable, k: int = 1, column_type: Callable = float, reverse: bool = False,
+                         **kwargs) -> Iterable:
+        """ The same as 'indices_of_top_k' of KeyedTable, but if the column has a RangeIndex with the same column_type
+            the rows are read from it instead of converting the column. Either way rows with equal cells keep their
+            order.
+        """
+        ranges = self.__ranges.get(self._column_number(column))
+        if ranges is None or ranges.column_type is not column_type:
+            return super().indices_of_top_k(column, k, column_type, reverse)
+        return self._ranked_positions(ranges, k, largest=reverse)
+
+    @read_locked
+    def top_k(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+              reverse: bool = False, **kwargs) -> Iterable:
+        """ Returns the rows found by 'indices_of_top_k' in that order, without sorting or reindexing the table.
+
+        :param column: (Hashable) the column name or number.
+        :param k: (int: 1) the number of rows.
+        :param column_type: (Callable: float) read 'typed_column' for more information.
+        :param reverse: (bool: False) whether the largest cells come first.
+        :param convert: (bool: True) read the Class doc string for more information.
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
+        """
+        return self._result(self.indices_of_top_k(column, k, column_type, reverse), **kwargs)
+
+    def nsmallest(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+                  convert: Optional[bool] = None, lazy: Optional[bool] = None) -> Iterable:
+        """ Returns the k rows with the smallest cells in a column, smallest first. Read 'top_k', convert and lazy
+            left at None use the setting of the table.
+        """
+        return self.top_k(column, k, column_type, **IndexedTable._result_options(convert, lazy))
+
+    def nlargest(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+                 convert: Optional[bool] = None, lazy: Optional[bool] = None) -> Iterable:
+        """ Returns the k rows with the largest cells in a column, largest first. Read 'nsmallest' """
+        return self.top_k(column, k, column_type, reverse=True, **IndexedTable._result_options(convert, lazy))
+
+    @read_locked
+    def group_by(self, column: Hashable, sort: bool = True) -> GroupBy:
+        """ The same as 'group_by' of KeyedTable, but with column_index=True the groups are read from the postings of
+            the column instead of its cells. Rows too short to have the column are left out instead of raising.
+        """
+        postings = self._column_postings(column)
+        if postings is None:
+            return super().group_by(column, sort)
+        groups = {}
+        for value in postings:
+            member = array('I', self._indices(self._union(self._key_postings((value,), column))))
+            if member:
+                groups[value] = member
+        return GroupBy(self, column, groups, sort)
+
+    @read_locked
+    def join(self, other: KeyedTable, on: Union[Hashable, Tuple[Hashable, Hashable]], how: str = 'inner',
+             suffix: str = '_right') -> KeyedTable:
+        """ The same as 'join' of KeyedTable, read its doc string for more information """
+        return super().join(other, on, how, suffix)
+
+    @read_locked
     def incomplete_row_search(self, *args, words_left: float = 0.4, **kwargs) -> Iterable:
         """ This is a special search tool that doesn't have a 'indices_of' paired method. It is meant to run a search
             against a whole line instead of just a single entry. It also is meant to be able to return values even
@@ -1027,11 +3409,12 @@ class IndexedTable(KeyedTable):
         :param ignore_case: (bool: False) read the Class doc string for more information.
         :param ordered: (bool: True) read the Class doc string for more information.
         :param convert: (bool: True) read the Class doc string for more information.
-        :return: Iterable (IndexedTable or List)
+        :param lazy: (bool: False) read the Class doc string for more information.
+        :return: Iterable (IndexedTable, IndexedTableView or List)
         """
 
-        explicit, ignore_case, ordered, convert = self._processKwargs('explicit', 'ignore_case',
-                                                                      'ordered', 'convert', **kwargs)
+        explicit, ignore_case, ordered, convert, lazy = self._processKwargs('explicit', 'ignore_case', 'ordered',
+                                                                            'convert', 'lazy', **kwargs)
 
         string_list: list[str] = []
         if len(args) == 1:
@@ -1044,33 +3427,39 @@ class IndexedTable(KeyedTable):
                                                                           explicit=explicit,
                                                                           ignore_case=ignore_case)]
         if not newSearchList:
-            return self._convert([[]], convert=True)
+            return self._result((), lazy=True) if lazy else self._convert([[]], convert=True)
 
         if len(newSearchList) < 2:
-            return self._convert([[]], convert=True)
+            return self._result((), lazy=True) if lazy else self._convert([[]], convert=True)
 
         if float(len(newSearchList)) / float(len(string_list)) < words_left:
-            return self._convert([[]], convert=True)
+            return self._result((), lazy=True) if lazy else self._convert([[]], convert=True)
 
         return self.search(*string_list, AND=True, explicit=explicit, ignore_case=ignore_case,
-                           convert=convert, ordered=ordered)
+                           convert=convert, ordered=ordered, lazy=lazy)
 
+    @read_locked
     def fuzzy_has_value(self, value: str, similarity=0.6) -> bool:
         """ Like its 'has_value' cousin however this uses a tool from 'difflib' to do a fuzzy match """
-        return len(fmatch(value, self.__index, n=1, cutoff=similarity)) > 0
+        return len(self._fuzzy_matches(value, n=1, cutoff=similarity)) > 0
 
+    @read_locked
     def fuzzy_get_values(self, value: str, similarity=0.6) -> list:
         """ Like 'fuzzy_has_value' but instead returns the keywords found if any """
-        return fmatch(value, self.__index, n=len(self.__index), cutoff=similarity)
+        return self._fuzzy_matches(value, n=len(self.__index), cutoff=similarity)
 
+    @read_locked
     def fuzzy_has_pair(self, column, value, similarity=0.6) -> bool:
         """ Like its 'has_pair' cousin however this uses a tool from 'difflib' to do a fuzzy match """
         return len(fmatch(value, self.get(column, ()), n=1, cutoff=similarity)) > 0
 
+    @read_locked
     def fuzzy_get_pairs(self, column, value, similarity=0.6) -> list:
         """ Like 'fuzzy_has_pair' but instead returns teh keywords found if any """
         return fmatch(value, self.get(column, ()), n=len(self.__index), cutoff=similarity)
 
+    @read_locked
+    @cached_indices
     def indices_of_fuzzy_search(self, *args, similarity=0.6, AND=False, **kwargs) -> Iterable:
         """ Helper function for fuzzy_search returns an iterable object of indices as does all 'indices_of' methods """
 
@@ -1084,42 +3473,54 @@ class IndexedTable(KeyedTable):
         number = len(self.__index)
         lists = []
         for keyword in args:
-            for match in fmatch(keyword, self.__index, n=number, cutoff=similarity):
-                lists.extend(list(self.__index[match]))
+            for match in self._fuzzy_matches(keyword, n=number, cutoff=similarity):
+                for postings in self._key_postings((match,)):
+                    lists.extend(postings)
 
         if not lists:
             return ()
         if AND is True:
-            return iter(self._ordered(_and_helper(lists), ordered=ordered))
+            return iter(self._ordered(self._row_positions(_and_helper(lists)), ordered=ordered))
         else:
-            return iter(self._ordered(set(lists), ordered=ordered))
+            return iter(self._ordered(self._row_positions(set(lists)), ordered=ordered))
 
+    @read_locked
     def fuzzy_search(self, *args, similarity=0.6, AND=False, **kwargs) -> Iterable:
         """ Like the 'search' method but instead uses tool a from 'difflib' to do a fuzzy match """
-        return self._convert([self[index]
-                              for index in self.indices_of_fuzzy_search(*args, similarity=similarity,
-                                                                        AND=AND, **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_fuzzy_search(*args, similarity=similarity, AND=AND, **kwargs),
+                            **kwargs)
 
+    @read_locked
+    @cached_indices
     def indices_of_fuzzy_column(self, column: str, keywords, similarity=0.6, **kwargs) -> Iterable:
         """ Helper function for fuzzy_column returns an iterable object of indices as does all 'indices_of' methods """
         if isinstance(keywords, str):
             keywords = [keywords]
         length = len(self.__index)
-        out = {index
-               for keyword in keywords
-               for match in set(fmatch(keyword, self.iter_column(column), n=length, cutoff=similarity))
-               for index in self.__index[match]}
-        return iter(self._ordered(out, ordered=self._processKwargs('ordered', **kwargs)))
-
+        if self.fuzzy_index:
+            postings = self._column_postings(column)
+            values = set(self.iter_column(column, default=())) if postings is None else postings
+            out = {index
+                   for keyword in keywords
+                   for match in self._fuzzy_matches(keyword, n=length, cutoff=similarity) if match in values
+                   for rows in self._key_postings((match,))
+                   for index in rows}
+        else:
+            out = {index
+                   for keyword in keywords
+                   for match in set(fmatch(keyword, self.iter_column(column), n=length, cutoff=similarity))
+                   for rows in self._key_postings((match,))
+                   for index in rows}
+        return iter(self._ordered(self._row_positions(out), ordered=self._processKwargs('ordered', **kwargs)))
+
+    @read_locked
     def fuzzy_column(self, column: str, keywords, similarity=0.6, **kwargs) -> Iterable:
         """ Like the 'search_by_column' method but instead uses tool a from 'difflib' to do a fuzzy match """
-        return self._convert([self[index]
-                              for index in self.indices_of_fuzzy_column(column, keywords,
-                                                                        similarity=similarity,
-                                                                        **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_fuzzy_column(column, keywords, similarity=similarity, **kwargs),
+                            **kwargs)
 
+    @read_locked
+    @cached_indices
     def indices_of_fuzzy_correlation(self, *args, similarity=0.6, **kwargs):
         """
             Helper function for fuzzy_correlation returns an iterable object of indices as does all 'indices_of' methods
@@ -1132,19 +3533,277 @@ class IndexedTable(KeyedTable):
             sets.append(set(self.indices_of_fuzzy_column(*searchPair, ordered=False)))
         return iter(self._ordered(set.intersection(*sets), ordered=self._processKwargs('ordered', **kwargs)))
 
+    @read_locked
     def fuzzy_correlation(self, *args, similarity=0.6, **kwargs):
         """ Like the 'correlation' method but instead uses tool a from 'difflib' to do a fuzzy match """
-        return self._convert([self[index]
-                              for index in self.indices_of_fuzzy_correlation(*args,
-                                                                             similarity=similarity,
-                                                                             **kwargs)],
-                             convert=self._processKwargs('convert', **kwargs))
+        return self._result(self.indices_of_fuzzy_correlation(*args, similarity=similarity, **kwargs),
+                            **kwargs)
+
+    async def asearch(self, *args, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'search' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.search, *args, executor=executor, **kwargs)
+
+    async def avalue_by_keyword(self, keyword, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'value_by_keyword' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.value_by_keyword, keyword, executor=executor, **kwargs)
+
+    async def asearch_by_column(self, column: Hashable, keywords, executor: Optional[Executor] = None,
+                                **kwargs) -> Iterable:
+        """ 'search_by_column' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.search_by_column, column, keywords, executor=executor, **kwargs)
+
+    async def acorrelation(self, *args, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'correlation' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.correlation, *args, executor=executor, **kwargs)
+
+    async def awhere(self, column: Hashable, op: str, value: Any, column_type: Callable = float,
+                     executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'where' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.where, column, op, value, column_type, executor=executor, **kwargs)
+
+    async def arange_search(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                            include_high: bool = True, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'range_search' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.range_search, column, low, high, include_low, include_high,
+                                   executor=executor, **kwargs)
+
+    async def aincomplete_row_search(self, *args, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'incomplete_row_search' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.incomplete_row_search, *args, executor=executor, **kwargs)
+
+    async def afuzzy_search(self, *args, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'fuzzy_search' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.fuzzy_search, *args, executor=executor, **kwargs)
+
+    async def afuzzy_column(self, column: str, keywords, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'fuzzy_column' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.fuzzy_column, column, keywords, executor=executor, **kwargs)
+
+    async def afuzzy_correlation(self, *args, executor: Optional[Executor] = None, **kwargs) -> Iterable:
+        """ 'fuzzy_correlation' run in an executor so the event loop keeps running, read the Class doc string """
+        return await self._offload(self.fuzzy_correlation, *args, executor=executor, **kwargs)
+
+    async def aiter_indices(self, method: str, *args, batch_size: int = 1000, executor: Optional[Executor] = None,
+                            **kwargs) -> AsyncIterator[int]:
+        """ Runs the 'indices_of' method of a search, for example 'search' or 'fuzzy_column', in an executor and
+            yields the row numbers it found. It gives the event loop a turn after every batch_size of them.
+
+        :param method: (str) The name of the search, with or without 'indices_of_' in front of it.
+        :param args: The arguments of the search.
+        :param batch_size: (int: 1000) How many row numbers to yield between turns of the event loop.
+        :param executor: (Executor: None) Where to run the search, the default executor of the loop when None.
+        :return: AsyncIterator of ints
+        """
+        if not method.startswith('indices_of_'):
+            method = 'indices_of_' + method
+        indices = await self._offload(lambda: list(getattr(self, method)(*args, **kwargs)), executor=executor)
+        for start in range(0, len(indices), batch_size):
+            for index in indices[start:start + batch_size]:
+                yield index
+            await asyncio.sleep(0)
+
+    async def aiter_rows(self, method: str, *args, batch_size: int = 1000, executor: Optional[Executor] = None,
+                         **kwargs) -> AsyncIterator[list]:
+        """ Runs a search, for example 'search' or 'incomplete_row_search', in an executor and yields the rows it found.
+            It gives the event loop a turn after every batch_size of them. The rows are the ones found by the search
+            even if the table changes while they are being yielded.
+
+        :param method: (str) The name of the search method.
+        :param args: The arguments of the search.
+        :param batch_size: (int: 1000) How many rows to yield between turns of the event loop.
+        :param executor: (Executor: None) Where to run the search, the default executor of the loop when None.
+        :return: AsyncIterator of rows
+        """
+        kwargs.update(convert=False, lazy=False)
+        rows = list(await self._offload(getattr(self, method), *args, executor=executor, **kwargs))
+        for start in range(0, len(rows), batch_size):
+            for row in rows[start:start + batch_size]:
+                yield row
+            await asyncio.sleep(0)
+
+    async def _offload(self, func: Callable, *args, executor: Optional[Executor] = None, **kwargs) -> Any:
+        """ Helper function that runs func in an executor, the default one of the running loop unless executor is
+            given, and waits for it without blocking the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+    def _cached(self, key: tuple, func: Callable, *args, **kwargs) -> Iterable:
+        """ Helper function for 'cached_indices' that returns the cached indices for a key or calls func to fill it.
+            Only the outermost call is cached, 'indices_of' methods called by another one go straight to func. The
+            outermost call is tracked per thread, so readers sharing the lock of a thread_safe table do not see it.
+        """
+        caching = self.__caching
+        if getattr(caching, 'active', False):
+            return func(self, *args, **kwargs)
+        try:
+            with self.__cache_lock:
+                if self.__cache_generation != self.generation:
+                    self.__cache.clear()
+                    self.__cache_generation = self.generation
+                indices = self.__cache.get(key)
+                if indices is not None:
+                    self.__hits += 1
+                    self.__cache.move_to_end(key)
+                else:
+                    self.__misses += 1
+        except TypeError:
+            return func(self, *args, **kwargs)
+        if indices is not None:
+            return iter(indices)
+        caching.active = True
+        try:
+            indices = tuple(func(self, *args, **kwargs))
+        finally:
+            caching.active = False
+        with self.__cache_lock:
+            self.__cache[key] = indices
+            if len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+                self.__evictions += 1
+        return iter(indices)
+
+    def _search_terms(self, keywords: Iterable, explicit: bool, ignore_case: bool) -> list:
+        """ Helper function that turns the keywords of an AND search into terms for '_run_plan' """
+        terms = []
+        for keyword in keywords:
+            postings = list(self._key_postings(self._matching_keys(keyword, explicit, ignore_case)))
+            terms.append({'term': keyword, 'postings': postings, 'estimate': sum(map(len, postings))})
+        return terms
+
+    def _correlation_terms(self, pairs: Iterable, explicit: bool, ignore_case: bool) -> list:
+        """ Helper function that turns the pairs of a correlation into terms for '_run_plan'. Pairs on a column without
+            postings use the postings of the matching keys of the index instead, which also hold the rows where the
+            keywords are found in other columns, so their rows are then checked against the cell within the column.
+        """
+        parameters = ('column', 'keywords', 'explicit', 'ignore_case')
+        terms = []
+        for searchPair in pairs:
+            term = dict(zip(parameters, searchPair))
+            if len(term) < 3:
+                term.update({'explicit': explicit, 'ignore_case': ignore_case})
+            term['explicit'], term['ignore_case'] = self._processKwargs('explicit', 'ignore_case', **term)
+            term['term'] = searchPair
+            if isinstance(term['keywords'], str):
+                term['keywords'] = [term['keywords']]
+            columnPostings = self._column_postings(term['column'])
+            term['check'] = None
+            if columnPostings is not None:
+                values = self._column_values(columnPostings, term['keywords'], term['explicit'], term['ignore_case'])
+                postings = list(self._key_postings(dict.fromkeys(values), term['column']))
+            else:
+                try:
+                    term['check'] = self._column_number(term['column'])
+                    keys = (key for keyword in term['keywords']
+                            for key in self._matching_keys(keyword, term['explicit'], term['ignore_case']))
+                    postings = list(self._key_postings(dict.fromkeys(keys)))
+                except KeyError:
+                    postings = []
+            term.update(postings=postings, estimate=sum(map(len, postings)))
+            terms.append(term)
+        return terms
+
+    def _run_plan(self, terms: list) -> Union[set, int]:
+        """ Helper function that ANDs together the rows of terms, cheapest estimate first, and records what it did in
+            each term for 'explain'. Once rows are found the remaining terms are only probed with them when that is
+            cheaper than finding all of their rows, which is always the case for a term that checks cells. On a compact
+            table the other terms are always ANDed as bitmaps. It stops as soon as no rows are left.
+        """
+        terms.sort(key=itemgetter('estimate'))
+        rows: Union[set, int, None] = None
+        for term in terms:
+            if rows is None:
+                rows = self._term_rows(term)
+                step = 'union'
+            elif not rows:
+                step = 'skipped'
+            elif term.get('check') is not None or \
+                    (not self.compact and self._count(rows) * len(term['postings']) < term['estimate']):
+                rows = self._probe_rows(term, rows)
+                step = 'probe'
+            else:
+                rows = and_(rows, self._term_rows(term))
+                step = 'union'
+            term.update(step=step, rows=self._count(rows))
+        return self._union(()) if rows is None else rows
+
+    def _term_rows(self, term: dict) -> Union[set, int]:
+        """ Helper function for '_run_plan' that finds every row of a term """
+        rows = self._union(term['postings'])
+        if term.get('check') is not None and rows:
+            return self._probe_rows(term, rows)
+        return rows
+
+    def _probe_rows(self, term: dict, rows: Union[set, int]) -> Union[set, int]:
+        """ Helper function for '_run_plan' that keeps the rows which also match a term, either by looking them up in
+            its postings or by checking their cell within the column.
+        """
+        rowIds = PostingsBitmap.decode(rows) if isinstance(rows, int) else list(rows)
+        column = term.get('check')
+        if column is None:
+            kept: Iterable = (row for row in rowIds if any(row in postings for postings in term['postings']))
+        else:
+            match = self._cell_matcher(term['keywords'], term['explicit'], term['ignore_case'])
+            kept = (row for row, position in zip(rowIds, self._row_positions(rowIds)) if match(self[position][column]))
+        return PostingsBitmap.encode(kept) if self.compact else set(kept)
+
+    def _cell_matcher(self, keywords: list, explicit: bool, ignore_case: bool) -> Callable:
+        """ Helper function that returns a test for a single cell that agrees with the scan in
+            'indices_of_search_by_column'
+        """
+        if ignore_case is True:
+            keywords = [self._fold(key) for key in keywords]
+        if explicit is True:
+            keys = set(keywords)
+            if ignore_case is True:
+                return lambda value: self._fold(value) in keys
+            return keys.__contains__
+        if ignore_case is True:
+            return lambda value: any(key in self._fold(value) for key in keywords)
+        return lambda value: any(key in value for key in keywords)
+
+    @staticmethod
+    def _count(rows: Union[set, int]) -> int:
+        """ Helper function that counts the rows within a set or a bitmap """
+        return PostingsBitmap.count(rows) if isinstance(rows, int) else len(rows)
+
+    def _options(self) -> dict:
+        """ Helper function that returns the keyword arguments of __init__, except columns, as the table has them """
+        parameters = chain(signature(IndexedTable.__init__).parameters.values(),
+                           signature(type(self).__init__).parameters.values())
+        return {parameter.name: getattr(self, parameter.name) for parameter in parameters
+                if parameter.kind is parameter.KEYWORD_ONLY and parameter.name != 'columns'}
 
     def _processKwargs(self, *args, **kwargs):
         if len(args) > 1:
             return [kwargs.get(key, getattr(self, key, None)) for key in args]
         return kwargs.get(args[0], getattr(self, args[0], None))
 
+    def _postings_type(self) -> Type:
+        """ Helper function that returns the default factory of the postings of the index """
+        return PostingsArray if self.compact else set
+
+    def _union(self, postings: Iterable) -> Union[set, int]:
+        """ Helper function that ORs together postings into a set or, when compact is True, a bitmap """
+        if self.compact:
+            return reduce(or_, (posting.bits for posting in postings), 0)
+        return set().union(*postings)
+
+    def _indices(self, rows: Union[set, int], ordered=True) -> Iterable:
+        """ Helper function that turns the output of '_union' back into indices. Bitmaps decode already sorted. """
+        if isinstance(rows, int):
+            if self.__row_ids is None:
+                return iter(PostingsBitmap.decode(rows >> self.__base))
+            return self._ordered(self._row_positions(PostingsBitmap.decode(rows)), ordered=ordered)
+        return self._ordered(self._row_positions(rows), ordered=ordered)
+
+    def _matching_keys(self, keyword, explicit: bool, ignore_case: bool) -> Iterable:
+        """ Helper function that returns the keys within the index that match a keyword """
+        if explicit is True and ignore_case is False:
+            return (keyword,) if keyword in self.__index else ()
+        if explicit is True and ignore_case is True:
+            return self._folded_index().get(self._fold(keyword), ())
+        return self._keys_containing(keyword, ignore_case)
+
     def _ordered(self, indices, ordered=True) -> Iterable:
         """ Helper function to order indices when asked or simply return indices unaffected """
         if ordered:
@@ -1153,76 +3812,1448 @@ class IndexedTable(KeyedTable):
             return iter(indices)
         return indices
 
+    @staticmethod
+    def _result_options(convert: Optional[bool], lazy: Optional[bool]) -> dict:
+        """ Helper function that turns the convert and lazy parameters into keyword arguments for '_result', leaving
+            out those that are None so the setting of the table is used.
+        """
+        return {name: value for name, value in (('convert', convert), ('lazy', lazy)) if value is not None}
+
+    def _result(self, indices: Iterable, **kwargs) -> Iterable:
+        """ Helper function that turns the output of an 'indices_of' method into what the public search methods return.
+            With lazy this is an IndexedTableView over the rows, otherwise the rows are copied out and passed to
+            '_convert'.
+        """
+        if self._processKwargs('lazy', **kwargs):
+            return IndexedTableView(self, indices)
+        return self._convert([self[index] for index in indices], convert=self._processKwargs('convert', **kwargs))
+
     def _convert(self, output, convert=True) -> Iterable:
         """ Helper function to convert a new Table (ie: a list of lists) into an IndexedTable if convert is True """
         if convert:
-            return IndexedTable(output, columns=self.columns)
+            return IndexedTable(output, columns=self.columns, frozen=self.frozen, records=self.records)
         return output
 
     def _update_index(self, index, obj, remove=False) -> None:
-        """ Helper func used by List override methods to update the index dict instead of rebuilding from scratch """
+        """ Helper func used by List override methods to update the index dict instead of rebuilding from scratch.
+            'index' is the row id of the removed row, or of the first of the added rows.
+        """
         if remove is True:
-            for item in obj:
+            removed = []
+            delta = self.__delta.get(None, {})
+            for item in dict.fromkeys(obj):
                 self.__index[item].remove(index)
-                if not self.__index[item]:
+                if not self.__index[item] and item not in delta:
                     del self.__index[item]
+                    removed.append(item)
+            if self.column_index:
+                self._update_column_postings(index, [obj], remove=True)
+            self._remove_index_keys(removed)
         elif isinstance(obj, IndexedTable):
+            newKeys = [key for key in obj.__index if key not in self.__index]
             for key, value in obj.__index.items():
                 self.__index[key] = self.__index[key].union(value)
+            for column, postings in obj.__column_postings.items():
+                columnPostings = self.__column_postings.setdefault(column, defaultdict(self._postings_type()))
+                for key, value in postings.items():
+                    columnPostings[key] = columnPostings[key].union(value)
+            self._add_index_keys(newKeys)
         else:
+            added = self._new_index_keys(obj)
+            self._add_rows(index, obj)
+            self._add_index_keys(added)
+
+    def _add_rows(self, index, obj, workers: Optional[int] = None) -> None:
+        """ Helper func that adds rows, the first of which is at position 'index', to the index and the per-column
+            postings. When compact is True the row numbers are grouped by key first so every PostingsArray or
+            PostingsBitmap is only updated once per call. Enough rows with workers set go to '_add_rows_parallel'.
+        """
+        if workers is None:
+            workers = self.workers if len(obj) >= self.parallel_threshold else 0
+        if workers > 1 and len(obj) > 1:
+            return self._add_rows_parallel(index, obj, workers)
+        if not self.compact:
             for i, items in enumerate(obj, start=index):
                 for item in items:
                     self.__index[item].add(i)
+            if self.column_index:
+                self._update_column_postings(index, obj)
+            return None
+
+        batch = defaultdict(list)
+        for i, items in enumerate(obj, start=index):
+            for item in items:
+                batch[item].append(i)
+        self._update_postings(self.__index, batch)
+        if self.column_index:
+            for column in range(max((len(items) for items in obj), default=0)):
+                columnBatch = defaultdict(list)
+                for i, items in enumerate(obj, start=index):
+                    if len(items) > column:
+                        columnBatch[items[column]].append(i)
+                postings = self.__column_postings.get(column)
+                if postings is None:
+                    postings = self.__column_postings[column] = defaultdict(PostingsArray)
+                self._update_postings(postings, columnBatch)
+
+    def _add_rows_parallel(self, index, obj, workers: int) -> None:
+        """ Helper func for '_add_rows' that splits the rows into one chunk per worker, has '_chunk_postings' build the
+            postings of each chunk in its own process and merges them in order, so the row ids of every key stay
+            ascending. Compact postings are gathered per key first so '_update_postings' sees each key once. The workers
+            are only forked while this is the only thread, as a fork can copy a lock another thread holds and hang on
+            it, otherwise they are spawned and sent their chunk.
+        """
+        length = len(obj)
+        size = -(-length // workers)
+        starts = range(0, length, size)
+        stops = [min(start + size, length) for start in starts]
+        chunks: Iterable
+        if 'fork' in get_all_start_methods() and active_count() == 1:
+            pool = ProcessPoolExecutor(len(starts), mp_context=get_context('fork'), initializer=_share_rows,
+                                       initargs=(obj,))
+            chunks = repeat(None)
+        else:
+            pool = ProcessPoolExecutor(len(starts), mp_context=get_context('spawn'))
+            chunks = (obj[start:stop] for start, stop in zip(starts, stops))
+        targets: List[defaultdict] = []
+        batches: List[dict] = []
+        with paused_gc() if length > self.gc_threshold else nullcontext(), pool as executor:
+            for parts in executor.map(_chunk_postings, starts, stops, (index + start for start in starts),
+                                      repeat(self.column_index), chunks):
+                for number, (keys, counts, rowIds) in enumerate(parts):
+                    if number == len(targets):
+                        targets.append(self.__index if number == 0 else self.__column_postings.setdefault(
+                            number - 1, defaultdict(self._postings_type())))
+                        batches.append({})
+                    ends = list(accumulate(counts))
+                    slices = map(rowIds.__getitem__, map(slice, chain((0,), ends), ends))
+                    # Most keys are only found within one chunk, so only the keys already seen are merged one by one
+                    if self.compact:
+                        chunk = dict(zip(keys, slices))
+                        batch = batches[number]
+                        for key in chunk.keys() & batch.keys():
+                            batch[key] += chunk.pop(key)
+                        batch.update(chunk)
+                    else:
+                        chunk = dict(zip(keys, map(set, slices)))
+                        postings = targets[number]
+                        for key in chunk.keys() & postings.keys():
+                            postings[key] |= chunk.pop(key)
+                        postings.update(chunk)
+        if self.compact:
+            for postings, batch in zip(targets, batches):
+                self._update_postings(postings, batch)
+
+    @staticmethod
+    def _update_postings(index: dict, batch: dict) -> None:
+        """ Helper func for '_add_rows' that adds a batch of (key -> ascending row numbers) to compact postings. The
+            PostingsArray of keys found in more than 1 of every 32 rows is turned into a PostingsBitmap, which is
+            smaller at that density, and bitmaps that dropped below 1 in 64 rows are turned back into arrays.
+        """
+        for key, rows in batch.items():
+            postings = index.get(key)
+            if postings is None:
+                postings = index[key] = array.__new__(PostingsArray, 'I', rows if len(rows) == 1 else
+                                                      dict.fromkeys(rows))
+            else:
+                postings.update(rows)
+            if type(postings) is PostingsArray:
+                if len(postings) << 5 > postings[-1]:
+                    index[key] = PostingsBitmap(postings)
+            elif len(postings) << 6 < postings.bits.bit_length():
+                index[key] = PostingsArray(postings)
+
+    def _add_delta_rows(self, index, obj) -> None:
+        """ Helper func that adds rows to the delta segment instead of the index. Keys new to the index are still added
+            to it, with empty postings, so checking or listing the keys of the index never needs the delta segment.
+            Rows in the delta segment are the ones with a row id from '__delta_start' on.
+        """
+        if not self.__pending:
+            self.__delta_start = index
+        added = self._new_index_keys(obj)
+        factory = self._postings_type()
+        delta = self.__delta.setdefault(None, defaultdict(factory))
+        for i, items in enumerate(obj, start=index):
+            for item in items:
+                if item not in self.__index:
+                    self.__index[item] = factory()
+                delta[item].add(i)
+        if self.column_index:
+            for i, items in enumerate(obj, start=index):
+                for column, item in enumerate(items):
+                    postings = self.__column_postings.get(column)
+                    if postings is None:
+                        postings = self.__column_postings[column] = defaultdict(factory)
+                    if item not in postings:
+                        postings[item] = factory()
+                    self.__delta.setdefault(column, defaultdict(factory))[item].add(i)
+        self._add_index_keys(added)
+        self.__pending += len(obj)
+
+    def _remove_delta_row(self, index, obj) -> None:
+        """ Helper func that removes a row from the delta segment, and its keys from the index once no row has them """
+        removed = []
+        for column, items in chain(((None, dict.fromkeys(obj)),),
+                                   ((column, (item,)) for column, item in enumerate(obj) if self.column_index)):
+            postings = self.__index if column is None else self.__column_postings[column]
+            delta = self.__delta[column]
+            for item in items:
+                delta[item].remove(index)
+                if not delta[item]:
+                    del delta[item]
+                    if not postings[item]:
+                        del postings[item]
+                        if column is None:
+                            removed.append(item)
+        self._remove_index_keys(removed)
+        self.__pending -= 1
+
+    def _key_postings(self, keys: Iterable, column: Optional[Hashable] = None) -> Iterable:
+        """ Helper func that yields the postings of each key within the index, or the per-column postings of 'column',
+            followed by its postings within the delta segment if it has any.
+        """
+        number = None if column is None else self._column_number(column)
+        index = self.__index if number is None else self.__column_postings.get(number, {})
+        delta = self.__delta.get(number, {})
+        for key in keys:
+            yield index[key]
+            if key in delta:
+                yield delta[key]
+
+    def _new_index_keys(self, obj) -> Iterable:
+        """ Helper func that finds the keys within new rows that are not in the index yet. This is only needed when
+            there is a secondary index built over the keys of the index.
+        """
+        if self.__folded is None and self.__grams is None and self.__fuzzy is None:
+            return ()
+        return {item for items in obj for item in items if item not in self.__index}
+
+    def _add_index_keys(self, keys: Iterable) -> None:
+        """ Helper func that adds keys that are new to the index to the secondary indexes built over those keys """
+        if self.__grams is not None:
+            for key in keys:
+                self.__grams.add(key)
+        if self.__fuzzy is not None:
+            for key in keys:
+                self.__fuzzy.add(key)
+        if self.__folded is not None:
+            for key in keys:
+                folded = self._fold(key)
+                if self.__folded_grams is not None and folded not in self.__folded:
+                    self.__folded_grams.add(folded)
+                self.__folded[folded].add(key)
+
+    def _remove_index_keys(self, keys: Iterable) -> None:
+        """ Helper func that drops keys no longer found within the index from the secondary indexes over those keys """
+        if self.__grams is not None:
+            for key in keys:
+                self.__grams.discard(key)
+        if self.__fuzzy is not None:
+            for key in keys:
+                self.__fuzzy.discard(key)
+        if self.__folded is not None:
+            for key in keys:
+                folded = self._fold(key)
+                self.__folded[folded].discard(key)
+                if not self.__folded[folded]:
+                    del self.__folded[folded]
+                    if self.__folded_grams is not None:
+                        self.__folded_grams.discard(folded)
+
+    def _folded_index(self) -> defaultdict:
+        """ Helper func that returns the case-insensitive shadow index (lower case key -> original keys). It is only
+            built the first time it is asked for.
+        """
+        if self.__folded is None:
+            folded: defaultdict = defaultdict(set)
+            for key in self.__index:
+                folded[self._fold(key)].add(key)
+            self.__folded = folded
+        return self.__folded
+
+    def _gram_index(self, ignore_case: bool) -> NGramIndex:
+        """ Helper func that returns the NGramIndex over the keys of the index, or over the keys of the shadow index
+            when ignore_case is True. Like the shadow index they are only built the first time they are asked for.
+        """
+        if ignore_case is True:
+            if self.__folded_grams is None:
+                self.__folded_grams = NGramIndex(self._folded_index(), n=self.ngram)
+            return self.__folded_grams
+        if self.__grams is None:
+            self.__grams = NGramIndex(self.__index, n=self.ngram)
+        return self.__grams
+
+    def _fuzzy_matches(self, word, n: int, cutoff: float) -> list:
+        """ Helper func that runs 'get_close_matches' against the keys of the index using a FuzzyIndex when
+            fuzzy_index is True or difflib otherwise. The FuzzyIndex is built the first time it is asked for.
+        """
+        if not self.fuzzy_index:
+            return fmatch(word, self.__index, n=n, cutoff=cutoff)
+        if self.__fuzzy is None:
+            self.__fuzzy = FuzzyIndex(self.__index)
+        return self.__fuzzy.get_close_matches(word, n=n, cutoff=cutoff)
+
+    def _keys_containing(self, keyword, ignore_case: bool, keys: Optional[dict] = None) -> Iterable:
+        """ Helper func that yields the keys of the index which contain the keyword. When ngram is enabled the gram
+            index narrows the keys down first, otherwise every key of 'keys' (the index by default) is checked. The
+            gram index may yield keys that are not in 'keys' so callers should use 'keys.get'.
+        """
+        if ignore_case is True:
+            keyword = self._fold(keyword)
+        candidates = self._gram_index(ignore_case).candidates(keyword) if self.ngram > 0 else None
+        if candidates is None:
+            if keys is None:
+                keys = self.__index
+            if ignore_case is True:
+                return (key for key in keys if keyword in getattr(key, 'lower', dummy_func)())
+            return (key for key in keys if keyword in key)
+        if ignore_case is True:
+            folded = self._folded_index()
+            return (key for value in candidates if keyword in value for key in folded[value])
+        return (key for key in candidates if keyword in key)
+
+    @staticmethod
+    def _fold(value) -> Any:
+        """ Helper func that lower cases a value the same way every ignore_case comparison in this class does """
+        return getattr(value, 'lower', dummy_func)()
+
+    def _update_column_postings(self, index, obj, remove=False) -> None:
+        """ Helper func that keeps the per-column postings in sync the same way '_update_index' does for the index """
+        for i, items in enumerate(obj, start=index):
+            for column, item in enumerate(items):
+                postings = self.__column_postings.get(column)
+                if postings is None:
+                    postings = self.__column_postings[column] = defaultdict(self._postings_type())
+                if remove is True:
+                    postings[item].discard(i)
+                    if not postings[item] and item not in self.__delta.get(column, ()):
+                        del postings[item]
+                else:
+                    postings[item].add(i)
+
+    def _join_lookup(self, column: Hashable) -> Tuple[Dict[Any, array], int]:
+        """ Helper func for 'join' that reads the groups from the postings of the column when there are any, read
+            '_join_lookup' of KeyedTable.
+        """
+        if self._column_postings(column) is None:
+            return super()._join_lookup(column)
+        grouped = self.group_by(column, sort=False)
+        width = max(max(map(len, self), default=0), self._column_number(column) + 1)
+        return dict(zip(grouped.keys, grouped.members)), width
+
+    def _column_postings(self, column: Hashable) -> Optional[dict]:
+        """ Helper func that returns the postings (value -> row set) of a column. None means the caller should fall
+            back to scanning the column, either because column_index is off or the column can't be resolved.
+        """
+        if not self.column_index:
+            return None
+        try:
+            number = self._column_number(column)
+        except:
+            return None
+        if not isinstance(number, int) or number < 0:
+            return None
+        return self.__column_postings.get(number, {})
+
+    def _has_column_value(self, postings: dict, value, explicit: bool, ignore_case: bool) -> bool:
+        """ Helper func for 'has_pair' that checks the distinct values of a column instead of each row """
+        for _ in self._column_values(postings, [value], explicit, ignore_case):
+            return True
+        return False
+
+    def _column_values(self, postings: dict, keywords: list, explicit: bool, ignore_case: bool) -> Iterable:
+        """ Helper func that yields the values within the postings of a column matching any of the keywords, once for
+            each keyword they match. Keywords are lower cased again when ignore_case is True.
+        """
+        if explicit is True and ignore_case is False:
+            return (key for key in dict.fromkeys(keywords) if key in postings)
+        if explicit is True and ignore_case is True:
+            folded = self._folded_index()
+            return (value for key in keywords for value in folded.get(self._fold(key), ()) if value in postings)
+        return (value for key in keywords for value in self._keys_containing(key, ignore_case, postings)
+                if value in postings)
 
     # KeyedTable/List overrides
+    @write_locked
+    def __setitem__(self, index, value) -> None:
+        """ Replaces rows with 'pop' and 'insert' so the index sees the rows that leave and the rows that arrive """
+        positions = range(len(self))[index]
+        if not isinstance(positions, range):
+            self.pop(positions)
+            self.insert(positions, value)
+            return None
+        rows = list(value)
+        if positions.step != 1:
+            if len(rows) != len(positions):
+                raise ValueError(f'attempt to assign sequence of size {len(rows)} to extended slice of size '
+                                 f'{len(positions)}')
+            for position, row in zip(positions, rows):
+                self[position] = row
+            return None
+        for position in reversed(positions):
+            self.pop(position)
+        if positions.start >= len(self):
+            return self.extend(rows)
+        for position, row in enumerate(rows, start=positions.start):
+            self.insert(position, row)
+
+    @write_locked
+    def __delitem__(self, index) -> None:
+        """ Removes rows with 'pop' so the index sees them leave """
+        positions = range(len(self))[index]
+        if not isinstance(positions, range):
+            self.pop(positions)
+        elif len(positions) == len(self):
+            self.clear()
+        else:
+            for position in sorted(positions, reverse=True):
+                self.pop(position)
+
+    @write_locked
+    def __iadd__(self, other):  # type: ignore[misc]
+        self.extend(other)
+        return self
+
+    @write_locked
     def append(self, obj) -> None:
         super(IndexedTable, self).append(obj)
-        self._update_index(len(self) - 1, [obj])
+        self._append_rows([obj])
 
+    @write_locked
     def extend(self, iterable) -> None:
         newList = list(iterable)
-        length = len(self)
         super(IndexedTable, self).extend(newList)
-        self._update_index(length, newList)
+        self._append_rows(newList)
 
+    @write_locked
     def insert(self, index, obj) -> None:
-        super(IndexedTable, self).insert(index, obj)
-        if index == len(self):
-            return self._update_index(index, obj)
-        self.build_index(rebuild=True)
-
+        length = len(self)
+        position = min(index, length) if index >= 0 else max(index + length, 0)
+        if position == length:
+            return self.append(obj)
+        self.merge_delta()
+        self.generation += 1
+        if self.__row_ids is None and position == 0 and self.__base > 0:
+            self.__base -= 1
+            rowId = self.__base
+        else:
+            rowIds = self._row_id_list()
+            rowId = self.__next_row_id
+            self.__next_row_id += 1
+            rowIds.insert(position, rowId)
+            if self.__positions is not None and position == 0:
+                self.__shift -= 1
+                self.__positions[rowId] = self.__shift
+            else:
+                self.__positions = None
+        super(IndexedTable, self).insert(position, obj)
+        for number, ranges in self.__ranges.items():
+            if len(obj) > number:
+                ranges.add(obj[number], rowId)
+        self._update_index(rowId, [obj])
+
+    @write_locked
     def pop(self, index=-1) -> list:
         obj = super(IndexedTable, self).pop(index)
-        if index == -1 or index == len(self):
-            self._update_index(len(self), obj, remove=True)
-            return obj
-        self.build_index(rebuild=True)
+        self.generation += 1
+        rowId = self._pop_row_id(index if index >= 0 else index + len(self) + 1)
+        if self.__pending and rowId >= self.__delta_start:
+            self._remove_delta_row(rowId, obj)
+        else:
+            self._update_index(rowId, obj, remove=True)
+        for number, ranges in self.__ranges.items():
+            if len(obj) > number:
+                ranges.discard(obj[number], rowId)
+        if self.__next_row_id > (len(self) << 1) + 64 and (self.compact or self.__row_ids is not None):
+            self._renumber()
         return obj
 
+    @write_locked
     def clear(self) -> None:
         self.__index.clear()
         super(IndexedTable, self).clear()
+        self.build_index()
 
+    @read_locked
     def copy(self, convert=True) -> Union[list, IndexedTable]:
         if convert:
-            return IndexedTable(super(IndexedTable, self).copy(), columns=self.columns)
+            return IndexedTable(super(IndexedTable, self).copy(), columns=self.columns, frozen=self.frozen,
+                                records=self.records)
         return super(IndexedTable, self).copy()
 
+    @write_locked
     def remove(self, value: list) -> None:
-        super(IndexedTable, self).remove(value)
-        self.build_index(rebuild=True)
+        self.pop(self.index(value))
 
+    @write_locked
     def reverse(self) -> None:
+        self.generation += 1
+        rowIds = self._row_id_list()
         super(IndexedTable, self).reverse()
-        self.build_index(rebuild=True)
+        rowIds.reverse()
+        self.__positions = None
 
+    @write_locked
     def sort(self, key=None, reverse=False):
-        super(IndexedTable, self).sort(key=key, reverse=reverse)
-        self.build_index(rebuild=True)
+        rows = list(self)
+        self._reorder(sorted(range(len(rows)), key=rows.__getitem__ if key is None else lambda i: key(rows[i]),
+                             reverse=reverse))
+
+    # Row id helpers
+    def _append_rows(self, rows: list) -> None:
+        """ Helper func that gives rows added to the end of the table new row ids and adds them to the index """
+        self.generation += 1
+        rowId = self.__next_row_id
+        self.__next_row_id += len(rows)
+        if self.__row_ids is not None:
+            self.__row_ids.extend(range(rowId, self.__next_row_id))
+            if self.__positions is not None:
+                self.__positions.update(zip(range(rowId, self.__next_row_id),
+                                            range(len(self) - len(rows) + self.__shift, len(self) + self.__shift)))
+        for number, ranges in self.__ranges.items():
+            ranges.update((row[number], i) for i, row in enumerate(rows, start=rowId) if len(row) > number)
+        if not self.delta:
+            return self._update_index(rowId, rows)
+        if self.__pending + len(rows) >= self.delta:
+            self.merge_delta()
+            return self._update_index(rowId, rows)
+        self._add_delta_rows(rowId, rows)
+
+    def _pop_row_id(self, position: int) -> int:
+        """ Helper func that forgets the row id of the row that was removed from 'position' and returns it. Removing
+            the first or last row keeps the row ids in line with the positions, anything else needs a row id list.
+        """
+        if self.__row_ids is None:
+            rowId = self.__base + position
+            if position == 0:
+                self.__base += 1
+                return rowId
+            if position == len(self):
+                self.__next_row_id -= 1
+                return rowId
+            self._row_id_list()
+        rowIds: list = self.__row_ids  # type: ignore
+        rowId = rowIds.pop(position)
+        if self.__positions is not None:
+            del self.__positions[rowId]
+            if position == 0:
+                self.__shift += 1
+            elif position != len(self):
+                self.__positions = None
+        return rowId
+
+    def _row_id_list(self) -> list:
+        """ Helper func that returns the row id of every position, creating the list when the row ids still follow
+            the positions. Callers that move rows around must also reset the positions built from it.
+        """
+        if self.__row_ids is None:
+            self.__row_ids = list(range(self.__base, self.__next_row_id))
+            self.__positions = None
+        return self.__row_ids
+
+    def _positions_by_id(self) -> dict:
+        """ Helper func that lazily maps row ids to their position plus '__shift'. The shift lets rows be removed from
+            or added to the front of the table without touching the position of every other row.
+        """
+        if self.__positions is None:
+            self.__shift = 0
+            self.__positions = {rowId: position for position, rowId in enumerate(self._row_id_list())}
+        return self.__positions
+
+    def _row_positions(self, rows: Iterable) -> Iterable:
+        """ Helper func that turns row ids taken from postings into positions within the table """
+        if self.__row_ids is None:
+            base = self.__base
+            return rows if base == 0 else (row - base for row in rows)
+        positions = self._positions_by_id()
+        shift = self.__shift
+        return (positions[row] - shift for row in rows)
+
+    def _row_ids_at(self, positions: Iterable) -> Iterable:
+        """ Helper func that turns positions within the table into the row ids used by the postings """
+        if self.__row_ids is None:
+            base = self.__base
+            return positions if base == 0 else (position + base for position in positions)
+        rowIds = self.__row_ids
+        return (rowIds[position] for position in positions)
+
+    @write_locked
+    def _reorder(self, order: Iterable) -> None:
+        """ Helper func used by 'sort' and 'sort_by_column' that moves the row at position order[i] to position i.
+            Only the row ids move with the rows, the postings stay as they are.
+        """
+        order = list(order)
+        self.generation += 1
+        rowIds = self._row_id_list()
+        super()._reorder(order)
+        self.__row_ids = [rowIds[i] for i in order]
+        self.__positions = None
+
+    def _renumber(self) -> None:
+        """ Helper func that rewrites the row ids within the postings to be the positions of the rows again. 'pop'
+            calls this once more than half of the row ids handed out belong to removed rows, which keeps the bitmaps
+            of a compact table from growing forever and drops the row id list.
+        """
+        self.merge_delta()
+        if self.__row_ids is None:
+            base = self.__base
+            mapping: Callable = base.__rsub__
+        else:
+            positions = self._positions_by_id()
+            shift = self.__shift
+            mapping = lambda row: positions[row] - shift  # noqa: E731
+        for index in chain((self.__index,), self.__column_postings.values()):
+            for key, postings in index.items():
+                if isinstance(postings, PostingsBitmap):
+                    if self.__row_ids is None:
+                        index[key] = PostingsBitmap(postings.bits >> base)
+                    else:
+                        index[key] = PostingsBitmap(map(mapping, postings))
+                elif isinstance(postings, PostingsArray):
+                    index[key] = PostingsArray(sorted(map(mapping, postings)))
+                else:
+                    index[key] = set(map(mapping, postings))
+        for ranges in self.__ranges.values():
+            ranges.remap(mapping)
+        self.__base = 0
+        self.__next_row_id = len(self)
+        self.__row_ids = None
+        self.__positions = None
+        self.__shift = 0
+
+    def _pack_postings(self, name: str, postings: Iterable) -> Dict[str, bytes]:
+        """ Helper func for 'save' that turns the postings of each key into the positions of its rows and packs them
+            into the sections of 'name'. 'counts' holds how many positions each key has and 'gaps' the gap from each
+            position to the one before it, across keys, so a single running sum gives back every position. The bitmaps
+            of a compact table whose row ids are still the positions plus '__base' are written as they are to 'bits'
+            instead, with their length in bytes in 'sizes'.
+        """
+        counts, positions, sizes, bits = array('Q'), array('q'), array('Q'), bytearray()
+        aligned = self.__row_ids is None
+        base = self.__base
+        if aligned and not base and not self.compact:
+            postings = list(postings)
+            counts.extend(map(len, postings))
+            positions.extend(chain.from_iterable(map(sorted, postings)))
+            postings = ()
+        for rows in postings:
+            if aligned and isinstance(rows, PostingsBitmap):
+                shifted = rows.bits >> base
+                data = shifted.to_bytes((shifted.bit_length() + 7) >> 3, 'little')
+                counts.append(0)
+                sizes.append(len(data))
+                bits += data
+                continue
+            counts.append(len(rows))
+            sizes.append(0)
+            positions.extend(iter(rows) if aligned and not base and isinstance(rows, PostingsArray) else
+                             sorted(self._row_positions(rows)))
+        gaps = array('q', positions[:1])
+        gaps.extend(map(sub, islice(positions, 1, None), positions))
+        sections = {f'{name}.counts': SnapshotFile.pack(counts), f'{name}.gaps': SnapshotFile.pack(gaps)}
+        if bits:
+            sections[f'{name}.sizes'] = SnapshotFile.pack(sizes)
+            sections[f'{name}.bits'] = bytes(bits)
+        return sections
+
+    def _unpack_postings(self, snapshot: SnapshotFile, name: str, keys: list) -> defaultdict:
+        """ Helper func for 'load' that reads back the postings written by '_pack_postings' for each key. Compact
+            postings pick a PostingsArray or PostingsBitmap the same way '_update_postings' does.
+        """
+        counts = SnapshotFile.unpack(snapshot.read(f'{name}.counts'))
+        positions = list(accumulate(SnapshotFile.unpack(snapshot.read(f'{name}.gaps'))))
+        stops = list(accumulate(counts))
+        slices = map(positions.__getitem__, map(slice, chain((0,), stops), stops))
+        index: defaultdict = defaultdict(self._postings_type())
+        if not self.compact:
+            index.update(zip(compress(keys, counts), map(set, compress(slices, counts))))
+            return index
+        sizes: Iterable = repeat(0)
+        bits = b''
+        if f'{name}.bits' in snapshot:
+            sizes = SnapshotFile.unpack(snapshot.read(f'{name}.sizes'))
+            bits = snapshot.read(f'{name}.bits')
+        offset = 0
+        for key, rows, size in zip(keys, slices, sizes):
+            if size:
+                index[key] = PostingsBitmap(int.from_bytes(bits[offset:offset + size], 'little'))
+                offset += size
+            elif rows:
+                postings = array.__new__(PostingsArray, 'I', rows)
+                index[key] = PostingsBitmap(postings) if len(rows) << 5 > rows[-1] else postings
+        return index
+
+    def _load_postings(self, snapshot: SnapshotFile, keys: list, columns: list) -> None:
+        """ Helper func for 'load' that fills the index and per-column postings from a snapshot and then closes it """
+        try:
+            self.__index = self._unpack_postings(snapshot, 'index', keys)
+            self.__column_postings = {
+                number: self._unpack_postings(snapshot, f'column.{number}',
+                                              list(map(keys.__getitem__,
+                                                       SnapshotFile.unpack(snapshot.read(f'column.{number}.keys')))))
+                for number in columns}
+        finally:
+            snapshot.close()
+
+    def _build_ranges(self) -> None:
+        """ Helper func that builds a RangeIndex for every column in 'range_columns' """
+        self.__ranges = {}
+        for column, column_type in list(self.range_columns.items()):
+            self.build_range_index(column, column_type)
+
+    def _ranked_positions(self, ranges: RangeIndex, k: int, largest: bool) -> Iterator[int]:
+        """ Helper func that returns the row numbers of the k smallest or largest keys of a RangeIndex. Rows with equal
+            keys are in the order of the table, the same order 'sort_by_column' leaves them in.
+        """
+        positions: list = []
+        for rowIds in ranges.groups(largest):
+            if len(positions) >= k:
+                break
+            positions.extend(sorted(self._row_positions(rowIds)))
+        return iter(positions[:max(k, 0)])
+
+    def _range_index(self, column: Hashable) -> RangeIndex:
+        """ Helper func that returns the RangeIndex of a column or raises a KeyError if it does not have one """
+        ranges = self.__ranges.get(self._column_number(column))
+        if ranges is None:
+            raise KeyError(f'There is no RangeIndex on the column {column!r}, see range_columns')
+        return ranges
+
+
+class ColumnarIndexedTable(IndexedTable, ColumnarTable):
+    """ <a name="ColumnarIndexedTable"></a>
+        ColumnarIndexedTable is an IndexedTable that stores its rows the way ColumnarTable does, one list per column.
+        It takes the same arguments as IndexedTable and the index, searches and row ids work exactly the same. As with
+        ColumnarTable the rows it returns are copies, changing one changes neither the table nor its index.
+
+        It also takes encoded, read the ColumnarTable doc string. With encoded=True the keys of the index are the values
+        stored in the vocabulary, so each distinct value is only held once for both the rows and the index.
+    """
+
+    def __init__(self, *args, encoded: bool = False, **kwargs):
+        self.encoded = encoded
+        super().__init__(*args, **kwargs)
+
+
+class MappedIndexedTable(IndexedTable, MappedTable):
+    """ <a name="MappedIndexedTable"></a>
+        MappedIndexedTable is an IndexedTable over a memory mapped text file, read MappedTable. It takes the arguments
+        of MappedTable, IE: MappedIndexedTable('ps.txt', header=True), followed by the keyword arguments of
+        IndexedTable. It is read only so the methods that would change its rows raise a TypeError. It pickles as the
+        arguments it was opened with, like MappedTable, and 'load' reads a snapshot back as a plain IndexedTable.
+    """
+
+    def __init__(self, path: Any = None, tokenizer: Optional[Tokenizer] = None, header: bool = False, skip: int = 0,
+                 encoding: str = 'utf-8', **kwargs):
+        super().__init__(path, tokenizer, header, skip, encoding, **kwargs)
+
+    __setitem__ = __delitem__ = __iadd__ = append = extend = insert = pop = remove = clear = reverse = sort = \
+        _reorder = MappedTable._readonly
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        function, arguments = MappedTable.__reduce_ex__(self, protocol)
+        return partial(function, **self._options()), arguments
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike], lazy_postings: bool = False) -> IndexedTable:
+        """ Reads back a table written by 'save' as an IndexedTable, the rows of a snapshot are not a text file that
+            could be mapped. Read 'IndexedTable.load' for more information.
+        """
+        return IndexedTable.load(path, lazy_postings)
+
+
+def _shard_worker(connection: Any, columns: Dict, options: Dict) -> None:
+    """ The loop run by every process of a ShardedIndexedTable. It holds the IndexedTable of one shard and answers
+        (name, args, kwargs) messages from the connection with (True, result) or (False, exception) until it gets None.
+        Names starting with an underscore are the few requests that need more than a single method call.
+    """
+    table = IndexedTable(columns=columns, **options)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        name, args, kwargs = message
+        result: Any
+        try:
+            if name == '_rows':
+                positions, column = args
+                if column is None:
+                    result = [table[position] for position in positions]
+                else:
+                    result = [table[position][column] for position in positions]
+            elif name == '_ranked':
+                column, k, largest = args
+                ranges = table._range_index(column)
+                indices = table.indices_of_largest(column, k) if largest else table.indices_of_smallest(column, k)
+                result = [(ranges.convert(table.get_cell(index, column)), index) for index in indices]
+            elif name == '_top_k':
+                column, k, columnType, reverse = args
+                result = [(columnType(table.get_cell(index, column)), index)
+                          for index in table.indices_of_top_k(column, k, columnType, reverse)]
+            elif name == '_index':
+                result = table.index(args[0]) if args[0] in table else None
+            else:
+                result = getattr(table, name)(*args, **kwargs)
+                if isinstance(result, Iterator):
+                    result = list(result)
+        except Exception as error:
+            connection.send((False, error))
+        else:
+            connection.send((True, result))
+    connection.close()
+
+
+class ShardedIndexedTable(KeyedTable):
+    """ <a name="ShardedIndexedTable"></a>
+        ShardedIndexedTable splits its rows across 'shards' worker processes, each holding an IndexedTable of its own
+        rows and index. Searches are sent to every shard at once and the row numbers they find are merged back into
+        the order the rows were added in, so a table too large to index or search quickly in one process is spread
+        over several CPUs, and their memory.
+
+        It has the same search methods, keyword arguments and results as an IndexedTable. Keyword arguments not used
+        by ShardedIndexedTable itself, like column_index, compact or range_columns, are passed on to the IndexedTable
+        of every shard. 'workers' is not one of them as every shard already runs in a process of its own, nor is
+        'thread_safe' as a ShardedIndexedTable is only meant to be used from one thread.
+
+        New rows go to the shards in turn, or when 'shard_by' names a column, to the shard picked by the hash of their
+        cell in that column. Exact, case sensitive 'search_by_column' and 'correlation' lookups on that column then
+        only ask the shard holding the value.
+
+        Rows can only be added to the end with 'append', 'extend' or '+=', or all removed with 'clear'. The other
+        methods that would change the table raise a TypeError, the same as MappedTable. Rows are copies so changing one
+        changes nothing. Call 'close' (or use the table in a with statement) to stop the worker processes, otherwise
+        they stop when the table is garbage collected or the program exits.
+
+        :var shards: The number of worker processes.
+        :var shard_by: The column whose cells pick the shard of each row, or None to take turns.
+        :var batch_size: The number of rows read from the shards at a time when iterating over the table.
+    """
+
+    batch_size = 10000
+    lock: Optional[ReadWriteLock] = None
+
+    def __init__(self, *args, columns: Optional[Dict] = None, shards: int = 2, shard_by: Optional[Hashable] = None,
+                 explicit: bool = True, ignore_case: bool = False, ordered: bool = True, convert: bool = True,
+                 lazy: bool = False, **kwargs):
+        super().__init__(columns=columns)
+        unknown = set(kwargs) - {name for name, parameter in signature(IndexedTable.__init__).parameters.items()
+                                 if parameter.kind is parameter.KEYWORD_ONLY and
+                                 name not in ('columns', 'workers', 'thread_safe')}
+        if unknown:
+            raise TypeError(f'ShardedIndexedTable got unexpected keyword arguments {sorted(unknown)}')
+        if not 0 < shards < 1 << 16:
+            raise ValueError(f'shards must be between 1 and {(1 << 16) - 1} not {shards}')
+        self.explicit = explicit
+        self.ignore_case = ignore_case
+        self.ordered = ordered
+        self.convert = convert
+        self.lazy = lazy
+        self.range_columns = dict(kwargs.get('range_columns') or {})
+        kwargs.update(explicit=explicit, ignore_case=ignore_case, ordered=ordered, convert=convert, lazy=lazy)
+        self.shards = shards
+        self.shard_by = shard_by
+        self.__shard_of = array('H')
+        self.__globals = [array('Q') for _ in range(shards)]
+        self.__connections: list = []
+        self.__processes: list = []
+        context = get_context()
+        for _ in range(shards):
+            connection, child = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child, self.columns, kwargs), daemon=True)
+            process.start()
+            child.close()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+        self.__finalizer = finalize(self, ShardedIndexedTable._stop, self.__connections, self.__processes)
+        if args:
+            self.extend(*args)
+
+    @staticmethod
+    def _readonly(*args, **kwargs):
+        raise TypeError('ShardedIndexedTable only supports adding rows to the end')
+
+    __setitem__ = __delitem__ = insert = pop = remove = reverse = sort = _reorder = _readonly
+
+    def __enter__(self) -> ShardedIndexedTable:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.__shard_of)
+
+    def __bool__(self) -> bool:
+        return len(self.__shard_of) > 0
+
+    def __iter__(self) -> Iterator[list]:
+        return chain.from_iterable(self._rows(range(start, min(start + self.batch_size, len(self))))
+                                   for start in range(0, len(self), self.batch_size))
+
+    def __reversed__(self) -> Iterator[list]:
+        return chain.from_iterable(reversed(self._rows(range(max(stop - self.batch_size, 0), stop)))
+                                   for stop in range(len(self), 0, -self.batch_size))
+
+    def __contains__(self, value: Any) -> bool:
+        return any(self._query('__contains__', value).values())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ShardedIndexedTable, MappedTable, ColumnarTable)):
+            other = list(other)
+        return list(self) == other
 
-    def sort_by_column(self, column: Hashable, column_type: Any, reverse: bool = False) -> None:
-        super(IndexedTable, self).sort_by_column(column, column_type=column_type, reverse=reverse)
-        self.build_index(rebuild=True)
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    __str__ = IndexedTable.__str__
+
+    def __iadd__(self, other: Iterable) -> ShardedIndexedTable:  # type: ignore[override, misc]
+        self.extend(other)
+        return self
+
+    @no_type_check
+    def __getitem__(self, item: Union[Hashable, slice]) -> list:
+        if isinstance(item, int):
+            return self._rows((range(len(self))[item],))[0]
+        if isinstance(item, slice):
+            return self._rows(range(len(self))[item])
+        return super().__getitem__(item)
+
+    def append(self, value: Any) -> None:
+        self.extend((value,))
+
+    def extend(self, values: Iterable) -> None:
+        rows = list(values)
+        if not rows:
+            return None
+        routes = array('H', self._route(rows))
+        selectors = [list(map(shard.__eq__, routes)) for shard in range(self.shards)]
+        self._call({shard: ('extend', (list(compress(rows, selector)),), {})
+                    for shard, selector in enumerate(selectors) if any(selector)})
+        self.generation += 1
+        start = len(self)
+        self.__shard_of.extend(routes)
+        for ids, selector in zip(self.__globals, selectors):
+            ids.extend(compress(range(start, start + len(rows)), selector))
+
+    def clear(self) -> None:
+        self._broadcast('clear')
+        self.generation += 1
+        self.__shard_of = array('H')
+        self.__globals = [array('Q') for _ in range(self.shards)]
+
+    def index(self, value: Any, start: int = 0, stop: int = sys.maxsize) -> int:  # type: ignore[override]
+        if start == 0 and stop >= len(self):
+            found = [self.__globals[shard][local]
+                     for shard, local in self._query('_index', value).items() if local is not None]
+            if found:
+                return min(found)
+            raise ValueError(f'{value!r} is not in list')
+        for position in range(*slice(start, stop).indices(len(self))):
+            if self[position] == value:
+                return position
+        raise ValueError(f'{value!r} is not in list')
+
+    def count(self, value: Any) -> int:  # type: ignore[override]
+        return sum(self._query('count', value).values())
+
+    def copy(self, convert=True) -> Union[list, IndexedTable]:  # type: ignore[override]
+        return self._convert(list(self), convert=convert)
+
+    def close(self) -> None:
+        """ Stops the worker processes. The table cannot be used afterwards. """
+        self.__finalizer()
+
+    def build_index(self, rebuild=True) -> None:
+        """ Rebuilds the index of every shard, read 'IndexedTable.build_index' """
+        self._broadcast('build_index', rebuild)
+
+    def build_range_index(self, column: Hashable, column_type: Callable = float) -> None:
+        """ Adds a RangeIndex over a column to every shard, read 'IndexedTable.build_range_index' """
+        self._broadcast('build_range_index', column, column_type)
+        self.range_columns[column] = column_type
+
+    def merge_delta(self) -> None:
+        """ Merges the delta segment of every shard into its index, read 'IndexedTable.merge_delta' """
+        self._broadcast('merge_delta')
+
+    def cache_info(self) -> NamespaceDict:
+        """ Returns the statistics of the result caches of all the shards added together """
+        infos = self._broadcast('cache_info')
+        return NamespaceDict(**{name: sum(getattr(info, name) for info in infos)
+                                for name in ('hits', 'misses', 'evictions', 'size', 'cache_size')})
+
+    def cache_clear(self) -> None:
+        """ Empties the result cache of every shard """
+        self._broadcast('cache_clear')
+
+    def explain(self, method: str, *args, **kwargs) -> list:
+        """ Returns the output of 'IndexedTable.explain' for every shard, as a list with one list per shard """
+        return self._broadcast('explain', method, *args, **kwargs)
+
+    def has_value(self, value: Hashable, **kwargs) -> bool:
+        return any(self._query('has_value', value, **kwargs).values())
+
+    def has_pair(self, column, value, **kwargs) -> bool:
+        return any(self._query('has_pair', column, value, **kwargs).values())
+
+    def indices_of_value_by_keyword(self, keyword, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_value_by_keyword', (keyword,), kwargs)
+
+    def indices_of_search(self, *args, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_search', args, kwargs)
+
+    def indices_of_search_by_column(self, column: Hashable, keywords, **kwargs) -> Iterable:
+        explicit, ignore_case = self._processKwargs('explicit', 'ignore_case', **kwargs)
+        return self._indices_of('indices_of_search_by_column', (column, keywords), kwargs,
+                                self._owners(column, keywords, explicit, ignore_case))
+
+    def indices_of_correlation(self, *args, **kwargs) -> Iterable:
+        shards = None
+        for searchPair in args:
+            explicit, ignore_case = self._processKwargs('explicit', 'ignore_case', **dict(
+                zip(('explicit', 'ignore_case'), searchPair[2:]), **kwargs))
+            owners = self._owners(searchPair[0], searchPair[1], explicit, ignore_case)
+            if owners is not None:
+                shards = owners if shards is None else shards & owners
+        return self._indices_of('indices_of_correlation', args, kwargs, shards)
+
+    def indices_of_where(self, column: Hashable, op: str, value: Any, column_type: Callable = float) -> Iterable:
+        return self._merged(self._query('indices_of_where', column, op, value, column_type), True)
+
+    def indices_of_range(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                         include_high: bool = True, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_range', (column, low, high, include_low, include_high), kwargs)
+
+    def indices_of_smallest(self, column: Hashable, k: int = 1, **kwargs) -> Iterable:
+        return iter([index for _, index in self._ranked(column, k, largest=False)])
+
+    def indices_of_largest(self, column: Hashable, k: int = 1, **kwargs) -> Iterable:
+        return iter([index for _, index in self._ranked(column, k, largest=True)])
+
+    def indices_of_top_k(self, column: Hashable, k: int = 1, column_type: Callable = float, reverse: bool = False,
+                         **kwargs) -> Iterable:
+        pairs = sorted(((value, self.__globals[shard][index]) for shard, ranked in
+                        self._query('_top_k', column, k, column_type, reverse).items() for value, index in ranked),
+                       key=itemgetter(1))
+        return iter([index for _, index in (nlargest if reverse else nsmallest)(k, pairs, key=itemgetter(0))])
+
+    def min_value(self, column: Hashable, default: Any = None) -> Any:
+        values = [value for value in self._query('min_value', column).values() if value is not None]
+        return min(values) if values else default
+
+    def max_value(self, column: Hashable, default: Any = None) -> Any:
+        values = [value for value in self._query('max_value', column).values() if value is not None]
+        return max(values) if values else default
+
+    def fuzzy_has_value(self, value: str, similarity=0.6) -> bool:
+        return any(self._query('fuzzy_has_value', value, similarity).values())
+
+    def fuzzy_get_values(self, value: str, similarity=0.6) -> list:
+        matches = set(chain.from_iterable(self._query('fuzzy_get_values', value, similarity).values()))
+        return fmatch(value, matches, n=len(matches), cutoff=similarity) if matches else []
+
+    def fuzzy_has_pair(self, column, value, similarity=0.6) -> bool:
+        return any(self._query('fuzzy_has_pair', column, value, similarity).values())
+
+    def fuzzy_get_pairs(self, column, value, similarity=0.6) -> list:
+        matches = list(chain.from_iterable(self._query('fuzzy_get_pairs', column, value, similarity).values()))
+        return fmatch(value, matches, n=len(matches), cutoff=similarity) if matches else []
+
+    def indices_of_fuzzy_search(self, *args, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_fuzzy_search', args, kwargs)
+
+    def indices_of_fuzzy_column(self, column: str, keywords, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_fuzzy_column', (column, keywords), kwargs)
+
+    def indices_of_fuzzy_correlation(self, *args, **kwargs) -> Iterable:
+        return self._indices_of('indices_of_fuzzy_correlation', args, kwargs)
+
+    def value_by_keyword(self, keyword, **kwargs) -> Iterable:
+        return self._result(self.indices_of_value_by_keyword(keyword, **kwargs), **kwargs)
+
+    def search(self, *args, **kwargs) -> Iterable:
+        return self._result(self.indices_of_search(*args, **kwargs), **kwargs)
+
+    def search_by_column(self, column: Hashable, keywords, **kwargs) -> Iterable:
+        return self._result(self.indices_of_search_by_column(column, keywords, **kwargs), **kwargs)
+
+    def correlation(self, *args, **kwargs) -> Iterable:
+        return self._result(self.indices_of_correlation(*args, **kwargs), **kwargs)
+
+    def where(self, column: Hashable, op: str, value: Any, column_type: Callable = float, **kwargs) -> Iterable:
+        return self._result(self.indices_of_where(column, op, value, column_type), **kwargs)
+
+    def range_search(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                     include_high: bool = True, **kwargs) -> Iterable:
+        return self._result(self.indices_of_range(column, low, high, include_low, include_high, **kwargs), **kwargs)
+
+    def top_k(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+              reverse: bool = False, **kwargs) -> Iterable:
+        return self._result(self.indices_of_top_k(column, k, column_type, reverse), **kwargs)
+
+    def nsmallest(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+                  convert: Optional[bool] = None, lazy: Optional[bool] = None) -> Iterable:
+        return IndexedTable.nsmallest(self, column, k, column_type, convert, lazy)  # type: ignore[arg-type]
+
+    def nlargest(self, column: Hashable, k: int = 1, column_type: Callable = float,  # type: ignore[override]
+                 convert: Optional[bool] = None, lazy: Optional[bool] = None) -> Iterable:
+        return IndexedTable.nlargest(self, column, k, column_type, convert, lazy)  # type: ignore[arg-type]
+
+    def incomplete_row_search(self, *args, words_left: float = 0.4, **kwargs) -> Iterable:
+        return IndexedTable.incomplete_row_search(self, *args, words_left=words_left, **kwargs)  # type: ignore[arg-type]
+
+    def fuzzy_search(self, *args, **kwargs) -> Iterable:
+        return self._result(self.indices_of_fuzzy_search(*args, **kwargs), **kwargs)
+
+    def fuzzy_column(self, column: str, keywords, **kwargs) -> Iterable:
+        return self._result(self.indices_of_fuzzy_column(column, keywords, **kwargs), **kwargs)
+
+    def fuzzy_correlation(self, *args, **kwargs) -> Iterable:
+        return self._result(self.indices_of_fuzzy_correlation(*args, **kwargs), **kwargs)
+
+    def _processKwargs(self, *args, **kwargs):
+        if len(args) > 1:
+            return [kwargs.get(key, getattr(self, key, None)) for key in args]
+        return kwargs.get(args[0], getattr(self, args[0], None))
+
+    def _result(self, indices: Iterable, **kwargs) -> Iterable:
+        """ Helper function that reads the rows found by a search from the shards, read 'IndexedTable._result' """
+        if self._processKwargs('lazy', **kwargs):
+            return IndexedTableView(self, indices)  # type: ignore[arg-type]
+        return self._convert(self._rows(indices), convert=self._processKwargs('convert', **kwargs))
+
+    def _convert(self, output, convert=True) -> Any:
+        if convert:
+            return IndexedTable(output, columns=self.columns)
+        return output
+
+    def _cells(self, number: int) -> Iterator:
+        return chain.from_iterable(self._rows(range(start, min(start + self.batch_size, len(self))), number)
+                                   for start in range(0, len(self), self.batch_size))
+
+    def _route(self, rows: list) -> Iterable[int]:
+        """ Helper function that returns the shard of every row in rows, which are about to be added to the end """
+        shards = self.shards
+        if self.shard_by is None:
+            return (position % shards for position in range(len(self), len(self) + len(rows)))
+        number = self._column_number(self.shard_by)
+        return (hash(row[number]) % shards if len(row) > number else 0 for row in rows)
+
+    def _owners(self, column: Hashable, keywords, explicit: bool, ignore_case: bool) -> Optional[set]:
+        """ Helper function that returns the shards that can hold a column lookup when it is an exact match on the
+            'shard_by' column, otherwise None meaning all of them.
+        """
+        if self.shard_by is None or explicit is not True or ignore_case is not False:
+            return None
+        try:
+            if self._column_number(column) != self._column_number(self.shard_by):
+                return None
+        except KeyError:
+            return None
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        return {hash(keyword) % self.shards for keyword in keywords}
+
+    def _call(self, calls: Dict[int, tuple]) -> Dict[int, Any]:
+        """ Helper function that sends a (name, args, kwargs) call to each shard in calls, then waits for all of them.
+            Every answer is read before raising the first error so the connections stay in step.
+        """
+        if not self.__finalizer.alive:
+            raise ValueError('ShardedIndexedTable is closed')
+        for shard, call in calls.items():
+            self.__connections[shard].send(call)
+        results = {}
+        errors = []
+        for shard in calls:
+            ok, result = self.__connections[shard].recv()
+            if ok:
+                results[shard] = result
+            else:
+                errors.append(result)
+        if errors:
+            raise errors[0]
+        return results
+
+    def _broadcast(self, name: str, *args, **kwargs) -> list:
+        """ Helper function that calls a method on every shard and returns their results in shard order """
+        results = self._call({shard: (name, args, kwargs) for shard in range(self.shards)})
+        return [results[shard] for shard in range(self.shards)]
+
+    def _query(self, name: str, *args, **kwargs) -> Dict[int, Any]:
+        """ Helper function that calls a method on every shard holding rows and returns their results by shard """
+        return self._call({shard: (name, args, kwargs) for shard, ids in enumerate(self.__globals) if ids})
+
+    def _indices_of(self, name: str, args: tuple, kwargs: dict, shards: Optional[Iterable[int]] = None) -> Iterable:
+        """ Helper function that runs an 'indices_of' method on the shards holding rows, or only those in shards, and
+            returns the row numbers they found within this table.
+        """
+        ordered = self._processKwargs('ordered', **kwargs)
+        kwargs = {key: value for key, value in kwargs.items() if key not in ('convert', 'lazy')}
+        kwargs['ordered'] = ordered
+        calls = {shard: (name, args, kwargs)
+                 for shard, ids in enumerate(self.__globals) if ids and (shards is None or shard in shards)}
+        return self._merged(self._call(calls), ordered)
+
+    def _merged(self, results: Dict[int, list], ordered) -> Iterator[int]:
+        """ Helper function that maps the row numbers found by each shard to row numbers within this table. Each shard
+            returns them in ascending order when ordered is True, and so they are merged rather than sorted.
+        """
+        found = [list(map(self.__globals[shard].__getitem__, indices)) for shard, indices in results.items()]
+        if ordered:
+            return merge(*found)
+        return chain.from_iterable(found)
+
+    def _ranked(self, column: Hashable, k: int, largest: bool) -> list:
+        """ Helper function that returns the (value, row number) pairs of the k smallest or largest values in a column
+            across the shards. Ties keep the same order as within an IndexedTable.
+        """
+        pairs = sorted(((value, self.__globals[shard][index])
+                        for shard, ranked in self._query('_ranked', column, k, largest).items()
+                        for value, index in ranked), key=itemgetter(1))
+        return (nlargest if largest else nsmallest)(k, pairs, key=itemgetter(0))
+
+    def _rows(self, positions: Iterable[int], column: Optional[int] = None) -> list:
+        """ Helper function that reads the rows at positions from the shards, or only their cells in column """
+        positions = list(positions)
+        byShard: Dict[int, list] = defaultdict(list)
+        shardOf, globalIds = self.__shard_of, self.__globals
+        for position in positions:
+            shard = shardOf[position]
+            byShard[shard].append(bisect_left(globalIds[shard], position))
+        results = {shard: iter(rows)
+                   for shard, rows in self._call({shard: ('_rows', (local, column), {})
+                                                  for shard, local in byShard.items()}).items()}
+        return [next(results[shardOf[position]]) for position in positions]
+
+    @staticmethod
+    def _stop(connections: list, processes: list) -> None:
+        """ Helper function that stops the worker processes. It does not hold on to the table so it can be used by
+            weakref.finalize.
+        """
+        for connection in connections:
+            try:
+                connection.send(None)
+            except (OSError, ValueError):
+                pass
+            connection.close()
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+
+
+class IndexedTableView:
+    """ <a name="IndexedTableView"></a>
+        IndexedTableView is a read-only view over some rows of an IndexedTable. It is what the search methods of an
+        IndexedTable return when lazy=True. It only holds the row numbers of the results in 'rows' and reads the rows
+        themselves from 'table', so creating one costs as much as the search that produced it and nothing more.
+
+        It supports len, iteration, indexing by row number, slice or column like a KeyedTable, and the same search
+        methods as an IndexedTable. Those run against the index of 'table' and keep the rows that are also in this
+        view, which means drilling down into results never builds a new index. Results keep the order of this view
+        and the 'indices_of' methods return the position of the rows within this view. Searches on a view return
+        another view unless lazy=False is passed.
+        Call 'materialize' to get a stand alone IndexedTable or list.
+
+        The view does not follow changes made to 'table' after it was created. Changing 'table' can make it return
+        different rows or raise IndexError, so materialize the view first if the table is going to change.
+
+        :var table: The IndexedTable the rows are read from.
+        :var rows: A list of row numbers within 'table'.
+    """
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self, table: IndexedTable, rows: Iterable = ()):
+        self.table = table
+        self.rows = list(rows)
+        self.__positions: Optional[dict] = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        table = self.table
+        return (table[row] for row in self.rows)
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    def __eq__(self, other):
+        if isinstance(other, IndexedTableView):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+    def __str__(self):
+        return '\n'.join((' '.join(item) for item in self))
+
+    @no_type_check
+    def __getitem__(self, item: Union[Hashable, slice]) -> Any:
+        """ Returns a row for an int, a new view for a slice and the values of a column for a string """
+        if isinstance(item, int):
+            return self.table[self.rows[item]]
+        if isinstance(item, slice):
+            return IndexedTableView(self.table, self.rows[item])
+        if not isinstance(item, str):
+            raise TypeError(f'IndexedTableView indices must be either integers, slices or strings not {type(item)}')
+        return list(self.iter_column(item))
+
+    @property
+    def columns(self) -> dict:
+        return self.table.columns
+
+    def get(self, item: Hashable, default: Any = None) -> Union[list, Any]:
+        """ Like KeyedTable's 'get' but only returns the values from the rows in this view """
+        values = self.iter_column(item)
+        if values is None:
+            return default
+        try:
+            return list(values)
+        except IndexError:
+            return default
+
+    def get_cell(self, row: int, col: Hashable, default: Any = None) -> Any:
+        """ Like KeyedTable's 'get_cell' where row is the position of the row within this view """
+        try:
+            return self.table.get_cell(self.rows[row], col, default)
+        except IndexError:
+            return default
+
+    def iter_column(self, col: Hashable, default: Any = None) -> Union[Iterable, Any]:
+        """ Like KeyedTable's 'iter_column' but only yields the values from the rows in this view """
+        try:
+            column = self.table._column_number(col)
+        except KeyError:
+            return default
+        table = self.table
+        return (table[row][column] for row in self.rows)
+
+    def iter_row(self, row: int, default: Any = None) -> Union[Iterable, Any]:
+        """ Like KeyedTable's 'iter_row' where row is the position of the row within this view """
+        try:
+            return iter(self[row])
+        except IndexError:
+            return default
+
+    def materialize(self, convert: bool = True, **kwargs) -> Union[list, IndexedTable]:
+        """ Copies the rows of this view out of 'table'. With convert, the default, they are put in a new IndexedTable
+            that is given the columns of 'table' and any other keyword arguments IndexedTable accepts on init.
+            Otherwise a list is returned.
+        """
+        rows = list(self)
+        if convert:
+            return IndexedTable(rows, columns=self.columns, **kwargs)
+        return rows
+
+    def has_value(self, value: Hashable, **kwargs) -> bool:
+        """ Returns true if the value exists within a row of this view """
+        return any(True for _ in self.indices_of_value_by_keyword(value, ordered=False, **kwargs))
+
+    def has_pair(self, column, value, **kwargs) -> bool:
+        """ Looks for a value within a column of this view and returns True if it exists """
+        return any(True for _ in self.indices_of_search_by_column(column, value, ordered=False, **kwargs))
+
+    def indices_of_value_by_keyword(self, keyword, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_value_by_keyword(keyword, **self._table_kwargs(kwargs)))
+
+    def value_by_keyword(self, keyword, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_value_by_keyword(keyword, **self._table_kwargs(kwargs)), kwargs)
+
+    def indices_of_search(self, *args, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_search(*args, **self._table_kwargs(kwargs)))
+
+    def search(self, *args, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_search(*args, **self._table_kwargs(kwargs)), kwargs)
+
+    def indices_of_search_by_column(self, column: Hashable, keywords, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_search_by_column(column, keywords,
+                                                                         **self._table_kwargs(kwargs)))
+
+    def search_by_column(self, column: Hashable, keywords, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_search_by_column(column, keywords, **self._table_kwargs(kwargs)),
+                            kwargs)
+
+    def indices_of_correlation(self, *args, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_correlation(*args, **self._table_kwargs(kwargs)))
+
+    def correlation(self, *args, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_correlation(*args, **self._table_kwargs(kwargs)), kwargs)
+
+    def indices_of_where(self, column: Hashable, op: str, value: Any, column_type: Callable = float) -> Iterable:
+        return self._positions_of(self.table.indices_of_where(column, op, value, column_type))
+
+    def where(self, column: Hashable, op: str, value: Any, column_type: Callable = float, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_where(column, op, value, column_type), kwargs)
+
+    def indices_of_range(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                         include_high: bool = True, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_range(column, low, high, include_low, include_high,
+                                                              **self._table_kwargs(kwargs)))
+
+    def range_search(self, column: Hashable, low: Any = None, high: Any = None, include_low: bool = True,
+                     include_high: bool = True, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_range(column, low, high, include_low, include_high,
+                                                        **self._table_kwargs(kwargs)), kwargs)
+
+    def indices_of_fuzzy_search(self, *args, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_fuzzy_search(*args, **self._table_kwargs(kwargs)))
+
+    def fuzzy_search(self, *args, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_fuzzy_search(*args, **self._table_kwargs(kwargs)), kwargs)
+
+    def indices_of_fuzzy_column(self, column: str, keywords, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_fuzzy_column(column, keywords, **self._table_kwargs(kwargs)))
+
+    def fuzzy_column(self, column: str, keywords, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_fuzzy_column(column, keywords, **self._table_kwargs(kwargs)),
+                            kwargs)
+
+    def indices_of_fuzzy_correlation(self, *args, **kwargs) -> Iterable:
+        return self._positions_of(self.table.indices_of_fuzzy_correlation(*args, **self._table_kwargs(kwargs)))
+
+    def fuzzy_correlation(self, *args, **kwargs) -> Iterable:
+        return self._result(self.table.indices_of_fuzzy_correlation(*args, **self._table_kwargs(kwargs)), kwargs)
+
+    @staticmethod
+    def _table_kwargs(kwargs: dict) -> dict:
+        """ Helper function that strips the keyword arguments that only this view acts on before calling 'table'.
+            The rows come back in the order of this view so 'table' does not need to sort them.
+        """
+        kwargs = {key: value for key, value in kwargs.items() if key not in ('convert', 'lazy')}
+        kwargs['ordered'] = False
+        return kwargs
+
+    def _positions(self) -> dict:
+        """ Helper function that lazily maps the row numbers of 'table' to their position within this view """
+        if self.__positions is None:
+            self.__positions = {row: position for position, row in enumerate(self.rows)}
+        return self.__positions
+
+    def _positions_of(self, indices: Iterable) -> Iterable:
+        """ Helper function that keeps the row numbers from 'table' that are within this view, as positions within this
+            view in ascending order.
+        """
+        positions = self._positions()
+        return iter(sorted({positions[row] for row in indices if row in positions}))
+
+    def _result(self, indices: Iterable, kwargs: dict) -> Iterable:
+        """ Helper function that narrows this view to the rows of 'table' found by a search. Searches return a new view
+            unless lazy=False is passed, in which case 'convert' decides between an IndexedTable and a list.
+        """
+        view = IndexedTableView(self.table, (self.rows[position] for position in self._positions_of(indices)))
+        if kwargs.get('lazy', True):
+            return view
+        return view.materialize(convert=kwargs.get('convert', self.table.convert))
 
 
 class NamespaceDict(Namespace):
@@ -0,0 +1,141 @@
+import copy
+import json
+import pickle
+
+from PyCustomCollections.CustomDataStructures import ColumnarTable, ColumnarIndexedTable, IndexedTable, KeyedTable
+
+
+table = [['Alice', 'Admin', 'Paris'],
+         ['Bob', 'User', 'London'],
+         ['Carol', 'Admin', 'London'],
+         ['Dave', 'User', 'Paris'],
+         ['Erin', 'Admin', 'Berlin']]
+table_columns = {'Name': 0, 'Role': 1, 'City': 2}
+
+
+def test_columnartable_init():
+    ct = ColumnarTable([['1', '2'], ['3', '4']], columns={'One': 0, 'Two': 1})
+    assert isinstance(ct, KeyedTable)
+    assert len(ct) == 2
+    assert str(ct) == "[['1', '2'], ['3', '4']]"
+    assert ct == [['1', '2'], ['3', '4']]
+    assert ct[0] == ['1', '2']  # Get Row
+    assert ct[-1] == ['3', '4']
+    assert ct[:1] == [['1', '2']]
+    assert ct['One'] == ['1', '3']  # Get Column
+    assert ct.get('Two') == ['2', '4']
+    assert ct.get('Cheese', default='Test') == 'Test'
+    assert ct.get_cell(1, 'Two') == '4'
+    assert list(ct.iter_column('One')) == ['1', '3']
+
+
+def test_columnartable_list_methods():
+    ct = ColumnarTable([list(row) for row in table], columns=table_columns)
+    rows = [list(row) for row in table]
+    for target in (ct, rows):
+        target.append(['Frank', 'User', 'Rome'])
+        target.insert(1, ['Gina', 'Admin', 'Oslo'])
+        target.pop(0)
+        target.remove(['Dave', 'User', 'Paris'])
+        target[0] = ['Hank', 'User', 'Lima']
+        del target[1]
+        target.reverse()
+    assert ct == rows
+    assert ct.index(['Hank', 'User', 'Lima']) == rows.index(['Hank', 'User', 'Lima'])
+    assert ['Erin', 'Admin', 'Berlin'] in ct
+    ct.sort()
+    rows.sort()
+    assert ct == rows
+    ct.sort_by_column('City', str, reverse=True)
+    assert ct['City'] == sorted(row[2] for row in rows)[::-1]
+    ct[0][0] = 'Changed'
+    assert ct[0][0] != 'Changed'
+
+
+def test_columnartable_ragged_rows():
+    ct = ColumnarTable([['1', '2'], ['3']])
+    ct.append(['4', '5', '6'])
+    assert ct == [['1', '2'], ['3'], ['4', '5', '6']]
+    assert ct['0'] == ['1', '3', '4']
+    assert ct.pop(1) == ['3']
+    assert list(reversed(ct)) == [['4', '5', '6'], ['1', '2']]
+
+
+def test_columnarindexedtable():
+    cit = ColumnarIndexedTable(table, columns=table_columns)
+    it = IndexedTable(table, columns=table_columns)
+    assert cit == it
+    assert cit.search('Admin') == it.search('Admin')
+    assert list(cit.indices_of_correlation(('Role', 'Admin'), ('City', 'London'))) == [2]
+    for target in (cit, it):
+        target.append(['Frank', 'Admin', 'London'])
+        target.pop(0)
+        target.sort_by_column('Name', str, reverse=True)
+    assert cit == it
+    assert cit.search('London') == it.search('London')
+    assert list(cit.indices_of_correlation(('Role', 'Admin'), ('City', 'London'))) == \
+        list(it.indices_of_correlation(('Role', 'Admin'), ('City', 'London')))
+
+
+def test_columnartable_encoded():
+    rows = [['root', 1, 1.0], ['www', True], ['root', (1, 2), 'x', None]]
+    ct = ColumnarTable(rows, encoded=True)
+    assert ct.encoded and ct == rows
+    assert [type(cell) for row in ct for cell in row] == [type(cell) for row in rows for cell in row]
+    assert ct[0][0] is ct[2][0]
+    assert ct['0'] == ['root', 'www', 'root']
+    assert ct.get_cell(2, 1) == (1, 2)
+    for target in (ct, rows):
+        target.append(['cron', 1.0, 1])
+        target.insert(0, ['init'])
+        target[1] = ['root', 'root', 'root', 'root']
+        del target[2]
+        target.reverse()
+    assert ct == rows
+    ct.sort_by_column('0', str)
+    assert ct['0'] == sorted(row[0] for row in rows)
+    ct.clear()
+    ct.append(['a', 'b'])
+    assert ct == [['a', 'b']]
+
+
+def test_columnarindexedtable_encoded(tmp_path):
+    cit = ColumnarIndexedTable(table, columns=table_columns, encoded=True)
+    it = IndexedTable(table, columns=table_columns)
+    assert cit == it
+    assert cit.search('Admin') == it.search('Admin')
+    assert cit.search_by_column('City', 'London') == it.search_by_column('City', 'London')
+    assert list(cit.iter_column('Role')) == list(it.iter_column('Role'))
+    cit.append(['Frank', 'Admin', 'London'])
+    assert list(cit.indices_of_correlation(('Role', 'Admin'), ('City', 'London'))) == [2, 5]
+    cit.save(tmp_path / 'table.snapshot')
+    loaded = ColumnarIndexedTable.load(tmp_path / 'table.snapshot')
+    assert loaded.encoded and loaded == cit
+
+
+def test_columnartable_list_operators():
+    rows = [list(row) for row in table]
+    for encoded in (False, True):
+        ct = ColumnarTable(rows, columns=table_columns, encoded=encoded)
+        assert ct * 2 == rows * 2 and 2 * ct == rows * 2
+        assert [['Zed']] + ct == [['Zed']] + rows and ct + [['Zed']] == rows + [['Zed']]
+        assert ct < [['Zed']] and ct <= rows and ct >= rows and [['Aaron']] < ct and ct > [['Aaron']]
+        assert not ct < ColumnarTable(rows) and ct <= ColumnarTable(rows)
+        assert json.dumps(list(ct)) == json.dumps(rows)
+        for loaded in (pickle.loads(pickle.dumps(ct)), copy.copy(ct), copy.deepcopy(ct)):
+            assert type(loaded) is ColumnarTable and loaded == rows
+            assert loaded.columns == table_columns and loaded.encoded == encoded
+        ct *= 2
+        assert ct == rows * 2 and len(ct) == 10
+        ct *= 0
+        assert ct == [] and not ct
+
+
+def test_columnarindexedtable_pickle():
+    cit = ColumnarIndexedTable(table, columns=table_columns, encoded=True, column_index=True)
+    loaded = pickle.loads(pickle.dumps(cit))
+    assert type(loaded) is ColumnarIndexedTable and loaded == cit
+    assert loaded.encoded and loaded.column_index and loaded.columns == table_columns
+    assert list(loaded.indices_of_correlation(('Role', 'Admin'), ('City', 'London'))) == [2]
+    assert pickle.loads(pickle.dumps(IndexedTable(table, columns=table_columns))).search('Paris') == \
+        [table[0], table[3]]
@@ -0,0 +1,47 @@
+import random
+import pytest
+from difflib import get_close_matches
+from PyCustomCollections.CustomDataStructures import FuzzyIndex
+
+
+words = ['One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Crazyness', 'Jumping Jacks',
+         'Lazer Eyes', 'Flight', '', 'aaa', 'aab', 'abba']
+
+
+def test_fuzzyindex_matches_difflib():
+    fi = FuzzyIndex(words)
+    for word in ('one', 'ne', 've', 'on', 'Flite', 'azer', 'aaab', '', 'zzz'):
+        for cutoff in (0.0, 0.4, 0.5, 0.6, 0.8, 1.0):
+            for n in (1, 3, len(words)):
+                assert fi.get_close_matches(word, n=n, cutoff=cutoff) == \
+                    get_close_matches(word, words, n=n, cutoff=cutoff)
+
+
+def test_fuzzyindex_matches_difflib_random():
+    rng = random.Random(1234)
+    keys = {''.join(rng.choice('abcde') for _ in range(rng.randint(1, 8))) for _ in range(300)}
+    fi = FuzzyIndex(keys)
+    for _ in range(50):
+        word = ''.join(rng.choice('abcdef') for _ in range(rng.randint(1, 8)))
+        assert fi.get_close_matches(word, n=len(keys), cutoff=0.6) == \
+            get_close_matches(word, keys, n=len(keys), cutoff=0.6)
+
+
+def test_fuzzyindex_add_discard():
+    fi = FuzzyIndex(['Seven', 'Ten'])
+    assert fi.get_close_matches('even', cutoff=0.6) == ['Seven']
+    fi.discard('Seven')
+    assert fi.get_close_matches('even', cutoff=0.6) == []
+    assert len(fi) == 1
+    fi.add('Seven')
+    fi.add(7)
+    assert len(fi) == 2
+    assert fi.get_close_matches('even', cutoff=0.6) == ['Seven']
+
+
+def test_fuzzyindex_bad_arguments():
+    fi = FuzzyIndex(words)
+    with pytest.raises(ValueError):
+        fi.get_close_matches('one', n=0)
+    with pytest.raises(ValueError):
+        fi.get_close_matches('one', cutoff=1.5)
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import pytest
+from PyCustomCollections import CustomDataStructures
 from PyCustomCollections.CustomDataStructures import IndexedTable as IT
 from collections import defaultdict
 
@@ -57,6 +61,18 @@ def test_indexedtable_has_pair():
     assert it.has_pair('1', 'ouR', explicit=False, ignore_case=True) is True
 
 
+@pytest.mark.parametrize('compact', [False, True])
+def test_indexedtable_has_pair_other_column(compact):
+    it = IT(index_table + [['Two']], columns=index_table_columns, compact=compact)
+    assert it.has_pair('2', 'Four') is False
+    assert it.has_pair('2', 'Two') is True
+    assert it.has_pair('2', 'two', ignore_case=True) is True
+    assert it.has_pair('1', 'two', ignore_case=True) is True
+    assert it.has_pair('2', 'ive', explicit=False) is True
+    assert it.has_pair('3', 'Three') is False
+    assert it.has_pair('missing', 'Two') is False
+
+
 def test_indexedtable_indices_of_value_by_keyword():
     it = IT(index_table, columns=index_table_columns)
     assert list(it.indices_of_value_by_keyword('Eight')) == [2]
@@ -240,3 +256,497 @@ def test_indexedtable_fuzzy_correlation():
     assert list(it.correlation(('1', 'One'))) == [['One', 'Two', 'Three']]
     assert type(it.correlation(('1', 'One'))) is IT
     assert type(it.correlation(('1', 'One'), convert=False)) is list
+
+
+def test_indexedtable_column_index():
+    it = IT(index_table, columns=index_table_columns, column_index=True)
+    assert it.has_pair('1', 'Four') is True
+    assert it.has_pair('2', 'Four') is False
+    assert it.has_pair('1', 'four', ignore_case=True) is True
+    assert it.has_pair('1', 'ouR', explicit=False, ignore_case=True) is True
+    assert list(it.indices_of_search_by_column(column='1', keywords=('One', 'Four', 'Seven'))) == [0, 1, 2]
+    assert list(it.indices_of_search_by_column(column=0, keywords='on', explicit=False)) == []
+    assert list(it.indices_of_search_by_column(column=0, keywords='on', explicit=False, ignore_case=True)) == [0]
+    assert list(it.indices_of_correlation(('1', 'One'), ('2', 'Two'))) == [0]
+    assert list(it.indices_of_correlation(('1', 'One'), ('2', 'two', False, True))) == [0]
+    assert list(it.indices_of_correlation(('1', 'One'), ('1', 'Four'))) == []
+
+
+def test_indexedtable_column_index_sync():
+    it = IT(index_table, columns=index_table_columns, column_index=True)
+    it.append(['Ten', 'Eleven', 'Twelve'])
+    it.extend([['One', 'Eleven', 'Thirteen']])
+    assert list(it.indices_of_search_by_column(column='2', keywords='Eleven')) == [3, 4]
+    it.pop()
+    assert list(it.indices_of_search_by_column(column='2', keywords='Eleven')) == [3]
+    it.pop(0)
+    assert list(it.indices_of_search_by_column(column='1', keywords=('One', 'Ten'))) == [2]
+    it.insert(0, ['One', 'Two', 'Three'])
+    assert list(it.indices_of_correlation(('1', 'One'), ('2', 'Two'))) == [0]
+    assert list(it.indices_of_search_by_column(column='1', keywords='Ten')) == [3]
+
+
+def test_indexedtable_folded_index():
+    it = IT(index_table, columns=index_table_columns)
+    assert it._IndexedTable__folded is None
+    assert it.has_value('ONE', ignore_case=True) is True
+    assert it._IndexedTable__folded['one'] == {'One'}
+    it.append(['ONE', 'two', 'Ten'])
+    assert it._IndexedTable__folded['one'] == {'One', 'ONE'}
+    assert list(it.indices_of_value_by_keyword('one', ignore_case=True)) == [0, 3]
+    assert it.has_pair('2', 'TWO', ignore_case=True) is True
+    it.pop()
+    assert it._IndexedTable__folded['one'] == {'One'}
+    assert 'ten' not in it._IndexedTable__folded
+    assert it.has_value('ten', ignore_case=True) is False
+    it.build_index()
+    assert it._IndexedTable__folded is None
+
+
+def test_indexedtable_ngram_index():
+    it = IT(index_table, columns=index_table_columns, ngram=3)
+    plain = IT(index_table, columns=index_table_columns)
+    for keyword in ('ight', 'IGHT', 'Sev', 'sev', 'ne', 'ree', 'x'):
+        for ignore_case in (True, False):
+            assert it.has_value(keyword, explicit=False, ignore_case=ignore_case) == \
+                plain.has_value(keyword, explicit=False, ignore_case=ignore_case)
+            assert list(it.indices_of_value_by_keyword(keyword, explicit=False, ignore_case=ignore_case)) == \
+                list(plain.indices_of_value_by_keyword(keyword, explicit=False, ignore_case=ignore_case))
+    assert it._IndexedTable__grams.candidates('igh') == {'Eight'}
+    assert it._IndexedTable__folded_grams.candidates('igh') == {'eight'}
+    it.extend([['Ten', 'Eleven', 'Twelve'], ['Thirteen', 'Fourteen', 'Fifteen']])
+    assert list(it.indices_of_value_by_keyword('teen', explicit=False)) == [4, 4, 4]
+    assert list(it.indices_of_value_by_keyword('TEEN', explicit=False, ignore_case=True)) == [4, 4, 4]
+    it.pop()
+    assert it.has_value('teen', explicit=False) is False
+    assert it.has_value('EVEN', explicit=False, ignore_case=True) is True
+    assert 'tee' not in it._IndexedTable__folded_grams.grams
+
+
+def test_indexedtable_fuzzy_index():
+    it = IT(index_table, columns=index_table_columns, fuzzy_index=True)
+    plain = IT(index_table, columns=index_table_columns)
+    for keyword in ('One', 'one', 'ne', 've', 'on', 'Sevn'):
+        for similarity in (0.4, 0.5, 0.6):
+            assert it.fuzzy_has_value(keyword, similarity=similarity) == \
+                plain.fuzzy_has_value(keyword, similarity=similarity)
+            assert it.fuzzy_get_values(keyword, similarity=similarity) == \
+                plain.fuzzy_get_values(keyword, similarity=similarity)
+            assert list(it.indices_of_fuzzy_search(keyword, similarity=similarity)) == \
+                list(plain.indices_of_fuzzy_search(keyword, similarity=similarity))
+            assert list(it.indices_of_fuzzy_column(0, keyword, similarity=similarity)) == \
+                list(plain.indices_of_fuzzy_column(0, keyword, similarity=similarity))
+    it.append(['Ten', 'Eleven', 'Twelve'])
+    assert it.fuzzy_get_values('even', similarity=0.6) == ['Seven', 'Eleven', 'Twelve']
+    it.pop()
+    assert it.fuzzy_get_values('even', similarity=0.6) == ['Seven']
+
+
+def test_indexedtable_compact():
+    it = IT(index_table, columns=index_table_columns, compact=True, column_index=True)
+    plain = IT(index_table, columns=index_table_columns)
+    assert it._IndexedTable__index['One'].bits == 0b1
+    for args, kwargs in ((('Seven',), {}), (('One', 'Seven'), {}), (('One', 'Seven'), {'AND': True}),
+                         (('four', 'five'), {'AND': True, 'ignore_case': True}),
+                         (('ne', 'even'), {'AND': True, 'explicit': False})):
+        assert list(it.indices_of_search(*args, **kwargs)) == list(plain.indices_of_search(*args, **kwargs))
+    assert list(it.indices_of_correlation(('1', 'One'), ('2', 'two', False, True))) == [0]
+    assert list(it.indices_of_correlation(('1', 'One'), ('1', 'Four'))) == []
+    it.extend([['One', 'Two', 'Ten']] * 40)
+    assert list(it.indices_of_search('One', 'Ten', AND=True)) == list(range(3, 43))
+    assert type(it._IndexedTable__index['One']).__name__ == 'PostingsBitmap'
+    it.pop()
+    assert list(it.indices_of_correlation(('1', 'One'), ('3', 'Ten'))) == []
+    assert list(it.indices_of_correlation(('1', 'One'), (2, 'Ten'))) == list(range(3, 42))
+    it.clear()
+    assert list(it.indices_of_search('One')) == []
+
+
+def test_indexedtable_incremental_updates():
+    rows = [['a', 'x', 'b'], ['b', 'y', 'y'], ['c', 'x', 'a'], ['a', 'z', 'c'], ['d', 'y', 'b']]
+    for options in ({}, {'compact': True, 'column_index': True}):
+        it = IT(rows, columns={'A': 0, 'B': 1, 'C': 2}, **options)
+        index = it._IndexedTable__index
+        it.pop(0)
+        it.pop(2)
+        it.insert(1, ['e', 'x', 'a'])
+        it.insert(0, ['a', 'y', 'b'])
+        it.remove(['c', 'x', 'a'])
+        it.reverse()
+        it.sort_by_column('A', str)
+        it.append(['b', 'z', 'z'])
+        assert it._IndexedTable__index is index
+        assert it == [['a', 'y', 'b'], ['b', 'y', 'y'], ['d', 'y', 'b'], ['e', 'x', 'a'], ['b', 'z', 'z']]
+        for keywords in (('a',), ('b',), ('y',), ('b', 'y')):
+            assert list(it.indices_of_search(*keywords)) == list(IT(list(it)).indices_of_search(*keywords))
+        assert list(it.indices_of_search('b', 'y', AND=True)) == [0, 1, 2]
+        assert list(it.indices_of_search_by_column('C', 'b')) == [0, 2]
+        assert list(it.indices_of_correlation(('B', 'y'), ('C', 'b'))) == [0, 2]
+        assert it.search('z') == [['b', 'z', 'z']]
+
+
+def test_indexedtable_rolling_window():
+    it = IT([[str(i), 'even' if i % 2 == 0 else 'odd'] for i in range(10)], compact=True)
+    for i in range(10, 500):
+        it.append([str(i), 'even' if i % 2 == 0 else 'odd'])
+        it.pop(0)
+    assert it._IndexedTable__next_row_id < 3 * len(it) + 64
+    assert list(it.indices_of_search('495')) == [5]
+    assert list(it.indices_of_search('even')) == [0, 2, 4, 6, 8]
+
+
+def test_indexedtable_delta():
+    for options in ({}, {'compact': True, 'column_index': True, 'ngram': 2}):
+        it = IT(index_table, columns=index_table_columns, delta=4, **options)
+        it.append(['One', 'Ten', 'Eleven'])
+        it.extend([['Four', 'Ten', 'Twelve'], ['Nine', 'Two', 'Twelve']])
+        assert it._IndexedTable__pending == 3
+        assert it._IndexedTable__index['Ten'] == it._postings_type()()
+        assert list(it.indices_of_search('One')) == [0, 3]
+        assert list(it.indices_of_search('Ten', 'One', AND=True)) == [3]
+        assert list(it.indices_of_search('lve', explicit=False)) == [4, 5]
+        assert list(it.indices_of_search_by_column('2', 'Ten')) == [3, 4]
+        assert list(it.indices_of_correlation(('1', 'Four'), ('2', 'Ten'))) == [4]
+        assert it.has_value('Eleven') is True
+        it.pop(3)
+        assert it.has_value('Eleven') is False
+        assert list(it.indices_of_search('Ten')) == [3]
+        it.merge_delta()
+        assert it._IndexedTable__pending == 0
+        assert list(it.indices_of_search('Twelve')) == [3, 4]
+        it.extend([['Ten']] * 4)
+        assert it._IndexedTable__pending == 0
+        assert list(it.indices_of_search('Ten')) == [3, 5, 6, 7, 8]
+
+
+def test_indexedtable_cache():
+    it = IT(index_table, columns=index_table_columns, cache_size=2)
+    assert list(it.indices_of_search('One', 'Four')) == [0, 1]
+    assert list(it.indices_of_search('One', 'Four')) == [0, 1]
+    assert it.search('One', 'Four') == [index_table[0], index_table[1]]
+    assert it.cache_info().copy() == {'hits': 2, 'misses': 1, 'evictions': 0, 'size': 1, 'cache_size': 2}
+    assert list(it.indices_of_search('one', ignore_case=True)) == [0]
+    assert list(it.indices_of_correlation(('1', 'Seven'), ('2', 'Eight'))) == [2]
+    assert it.cache_info().evictions == 1
+    assert list(it.indices_of_search_by_column('1', ['One', 'Four'])) == [0, 1]
+    assert it.cache_info().misses == 3
+    generation = it.generation
+    it.append(['One', 'Ten', 'Eleven'])
+    assert it.generation > generation
+    assert list(it.indices_of_search('One', 'Four')) == [0, 1, 3]
+    it.sort()
+    assert list(it.indices_of_search('One', 'Four')) == [0, 1, 2]
+    it.cache_clear()
+    assert it.cache_info().copy() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'cache_size': 2}
+
+
+def test_indexedtable_cache_threads():
+    it = IT(index_table, columns=index_table_columns, cache_size=2, thread_safe=True)
+    it._IndexedTable__caching.active = True
+    thread = threading.Thread(target=lambda: list(it.indices_of_search('One')))
+    thread.start()
+    thread.join()
+    assert it.cache_info().misses == 1 and it.cache_info().size == 1
+
+
+def test_indexedtable_explain():
+    rows = [['a', 'x', str(i)] for i in range(20)] + [['b', 'x', 'a']]
+    for options in ({}, {'column_index': True}, {'compact': True}):
+        it = IT(rows, columns={'A': 0, 'B': 1, 'C': 2}, **options)
+        steps = it.explain('search', 'x', 'a', '7')
+        assert [(step.term, step.estimate, step.rows) for step in steps] == [('7', 1, 1), ('x', 21, 1), ('a', 21, 1)]
+        assert steps[0].step == 'union'
+        assert list(it.indices_of_search('x', 'a', '7', AND=True)) == [7]
+        steps = it.explain('search', 'x', 'missing', 'a')
+        assert [(step.term, step.rows, step.step) for step in steps] == [('missing', 0, 'union'), ('x', 0, 'skipped'),
+                                                                         ('a', 0, 'skipped')]
+        steps = it.explain('correlation', ('A', 'a'), ('C', 'a'))
+        if it.column_index:
+            assert [(step.term, step.estimate) for step in steps] == [(('C', 'a'), 1), (('A', 'a'), 20)]
+        else:
+            assert [(step.term, step.estimate) for step in steps] == [(('A', 'a'), 21), (('C', 'a'), 21)]
+        assert steps[-1].rows == 0
+        assert list(it.indices_of_correlation(('A', 'a'), ('C', '3'))) == [3]
+        assert list(it.indices_of_correlation(('C', 'a'), ('A', 'b'))) == [20]
+        assert list(it.indices_of_correlation(('Cheese', 'a'), ('A', 'b'))) == []
+
+
+def test_indexedtable_range_index():
+    rows = [['10:00:02', 'sshd', '512'], ['10:00:00', 'cron', '64'], ['10:00:05', 'sshd', '-'],
+            ['10:00:01', 'nginx', '2048'], ['10:00:03', 'cron', '128']]
+    seconds = lambda value: sum(int(part) * 60 ** i for i, part in enumerate(reversed(value.split(':'))))  # noqa: E731
+    it = IT(rows, columns={'TIME': 0, 'CMD': 1, 'RSS': 2}, range_columns={'TIME': seconds})
+    assert list(it.indices_of_range('TIME', '10:00:01', '10:00:03', include_high=False)) == [0, 3]
+    assert list(it.indices_of_range('TIME', '10:00:01', '10:00:03', ordered=False)) == [3, 0, 4]
+    assert it.range_search('TIME', high='10:00:00') == [rows[1]]
+    with pytest.raises(KeyError):
+        it.range_search('RSS', 100)
+    it.build_range_index('RSS', int)
+    assert list(it.indices_of_largest('RSS', 2)) == [3, 0]
+    assert list(it.indices_of_smallest('RSS')) == [1]
+    assert (it.min_value('RSS'), it.max_value('RSS')) == (64, 2048)
+    it.append(['10:00:04', 'java', '4096'])
+    it.insert(0, ['09:59:59', 'init', '8'])
+    it.pop(2)
+    it.sort_by_column('CMD', str)
+    assert [it[i][1] for i in it.indices_of_range('RSS', 100)] == ['cron', 'java', 'nginx', 'sshd']
+    assert [it[i][0] for i in it.indices_of_largest('TIME', 2)] == ['10:00:05', '10:00:04']
+    assert it.max_value('RSS') == 4096
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_indexedtable_snapshot(tmp_path, compact):
+    rows = [[str(i % 7), 'even' if i % 2 == 0 else 'odd', i] for i in range(100)]
+    it = IT(rows, columns={'A': 0, 'B': 1, 'C': 2}, compact=compact, column_index=True, range_columns={'C': int})
+    it.pop(0)
+    it.insert(10, ['3', 'odd', 1.0])
+    it.append(['x', 'y'])
+    path = tmp_path / 'table.snapshot'
+    it.save(path)
+    for lazy in (False, True):
+        loaded = IT.load(path, lazy_postings=lazy)
+        assert loaded == it
+        assert loaded.columns == it.columns
+        assert (loaded.compact, loaded.column_index) == (compact, True)
+        assert type(loaded[10][2]) is float
+        assert list(loaded.indices_of_search('3')) == list(it.indices_of_search('3'))
+        assert list(loaded.indices_of_correlation(('A', '3'), ('B', 'odd'))) == \
+            list(it.indices_of_correlation(('A', '3'), ('B', 'odd')))
+        assert list(loaded.indices_of_range('C', 10, 20)) == list(it.indices_of_range('C', 10, 20))
+        loaded.append(['3', 'odd', 200])
+        assert list(loaded.indices_of_search('3'))[-1] == len(it)
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError):
+        IT.load(path)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_indexedtable_workers(monkeypatch, compact):
+    rows = [[str(i % 7), 'even' if i % 2 == 0 else 'odd', str(i)] for i in range(200)]
+    serial = IT(rows, compact=compact, column_index=True)
+    parallel = IT(rows, compact=compact, column_index=True)
+    parallel.build_index(workers=3)
+    for it in (serial, parallel):
+        it.extend([['3', 'odd', 'x']] * 50)
+    assert list(parallel.indices_of_search('3')) == list(serial.indices_of_search('3'))
+    assert list(parallel.indices_of_correlation((0, '3'), (1, 'odd'))) == \
+        list(serial.indices_of_correlation((0, '3'), (1, 'odd')))
+    monkeypatch.setattr(IT, 'parallel_threshold', 10)
+    monkeypatch.setattr(CustomDataStructures, 'get_all_start_methods', lambda: ['spawn'])
+    shipped = IT(rows, compact=compact, column_index=True, workers=2)
+    shipped.extend([['3', 'odd', 'x']] * 50)
+    assert list(shipped.indices_of_search('3')) == list(serial.indices_of_search('3'))
+    assert list(shipped.indices_of_search('199')) == [199]
+    assert CustomDataStructures._worker_rows is None
+
+
+def test_indexedtable_workers_threads():
+    tables, errors = {}, []
+
+    def build(name):
+        try:
+            tables[name] = IT([[name, str(i)] for i in range(100)], column_index=True)
+            tables[name].build_index(workers=2)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=build, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    for name in ('a', 'b'):
+        assert list(tables[name].indices_of_search(name)) == list(range(100))
+        assert list(tables[name].indices_of_search_by_column(1, '42')) == [42]
+
+
+def test_indexedtable_thread_safe():
+    it = IT([['k', str(number), 'x'] for number in range(2000)], columns={'a': 0, 'b': 1, 'c': 2},
+            thread_safe=True, cache_size=4)
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        try:
+            while not done.is_set():
+                with it.lock.reading():
+                    assert len(list(it.indices_of_value_by_keyword('k'))) == len(it.search('x', convert=False))
+        except Exception as error:
+            errors.append(error)
+
+    def writer():
+        for number in range(1000):
+            it.append(['k', f'new{number}', 'x'])
+            if number % 10 == 0:
+                it.pop(0)
+        done.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(3)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert not errors
+    assert len(it) == 2900 and it.lock is not None
+    assert list(it.indices_of_search('new999')) == [2899]
+
+
+def test_indexedtable_thread_safe_save(tmp_path):
+    it = IT(index_table, columns=index_table_columns, thread_safe=True, delta=10)
+    it.append(['Ten', 'Eleven', 'Twelve'])
+    it.save(tmp_path / 'table.snapshot')
+    loaded = IT.load(tmp_path / 'table.snapshot')
+    assert loaded == it and loaded.thread_safe and loaded.lock is not None
+    assert list(loaded.indices_of_search('Eleven')) == [3]
+
+
+def test_indexedtable_async():
+    it = IT([['k', str(number), 'x' if number % 2 else 'y'] for number in range(100)], columns={'a': 0, 'b': 1, 'c': 2})
+
+    async def main():
+        assert await it.asearch('x', convert=False) == it.search('x', convert=False)
+        assert await it.asearch_by_column('b', '7') == it.search_by_column('b', '7')
+        assert await it.acorrelation(('a', 'k'), ('c', 'y')) == it.correlation(('a', 'k'), ('c', 'y'))
+        assert await it.afuzzy_column('c', 'yy') == it.fuzzy_column('c', 'yy')
+        assert await it.aincomplete_row_search('k 7 x') == it.incomplete_row_search('k 7 x')
+        assert [index async for index in it.aiter_indices('search', 'y', batch_size=7)] == list(range(0, 100, 2))
+        assert [row async for row in it.aiter_rows('search_by_column', 'b', ('1', '2'))] == [it[1], it[2]]
+        rows = it.aiter_rows('search', 'x', batch_size=10)
+        assert await rows.__anext__() == it[1]
+        await rows.aclose()
+
+        async def consume():
+            async for _ in it.aiter_indices('search', 'k', batch_size=1):
+                await asyncio.sleep(1)
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
+def test_indexedtable_records():
+    it = IT([['root', '1'], ['www', '20'], ['root', '31']], columns={'USER': 0, 'PID': 1}, records=True)
+    it.append(['cron', '40'])
+    it.remove(['www', '20'])
+    result = it.search('root')
+    assert result.records and [row.PID for row in result] == ['1', '31']
+    assert list(it.indices_of_search_by_column('USER', 'cron')) == [2]
+    with pytest.raises(TypeError):
+        it[0][0] = 'www'
+    assert it.copy().row_type is it.row_type
+
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_indexedtable_group_by(compact):
+    rows = [[str(i % 7), 'even' if i % 2 == 0 else 'odd', str(i)] for i in range(100)]
+    it = IT(rows, columns={'A': 0, 'B': 1, 'C': 2}, compact=compact, column_index=True)
+    it.pop(3)
+    it.extend([['3', 'odd', '500'], ['x', 'odd', '-']])
+    scanned = CustomDataStructures.KeyedTable(list(it), columns=it.columns)
+    aggregates = ('count', ('sum', 'C', int), ('max', 'C'), ('distinct', 'B'))
+    assert it.group_by('A').agg(*aggregates) == scanned.group_by('A').agg(*aggregates)
+    assert it.group_by('B').mean('C') == scanned.group_by('B').mean('C')
+    assert IT(rows).group_by(1).count() == [['even', 50], ['odd', 50]]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_indexedtable_join(compact):
+    left = [[str(i), str(i % 5)] for i in range(50)]
+    right = [[str(i % 7), 'x' + str(i)] for i in range(30)]
+    expected = CustomDataStructures.KeyedTable(left).join(CustomDataStructures.KeyedTable(right), on=(1, 0))
+    assert len(expected) == sum(1 for row in left for other in right if row[1] == other[0])
+    for column_index in (False, True):
+        it = IT(right, compact=compact, column_index=column_index)
+        it.append(['3', 'y'])
+        assert IT(left, column_index=column_index).join(it, on=(1, 0)) == \
+            CustomDataStructures.KeyedTable(left).join(CustomDataStructures.KeyedTable(list(it)), on=(1, 0))
+        assert it.join(IT(left, column_index=True), on=(0, 1), how='left')[-1] == ['3', 'y', '48']
+
+
+def test_indexedtable_top_k():
+    rows = [[str(i), str((i * 37) % 11)] for i in range(30)]
+    plain = CustomDataStructures.KeyedTable(rows, columns={'ID': 0, 'N': 1})
+    for range_columns in (None, {'N': int}):
+        it = IT(rows, columns={'ID': 0, 'N': 1}, range_columns=range_columns, cache_size=4)
+        generation = it.generation
+        assert it.top_k('N', 5, int) == plain.top_k('N', 5, int)
+        assert it.nlargest('N', 5, int) == plain.nlargest('N', 5, int)
+        assert it.nsmallest('N', 3, int, convert=False) == plain.nsmallest('N', 3, int)
+        assert isinstance(it.nsmallest('N', 3, int, convert=False), list)
+        assert list(it.nlargest('N', 2, int, lazy=True).rows) == list(it.indices_of_top_k('N', 2, int, True))
+        with pytest.raises(TypeError):
+            it.nlargest('N', 2, int, reverse=False)
+        assert isinstance(it.top_k('N', 2, int), IT) and isinstance(it.top_k('N', 2, int, convert=False), list)
+        assert list(it.top_k('N', 2, int, lazy=True).rows) == list(it.indices_of_top_k('N', 2, int))
+        assert it.generation == generation and it == rows
+
+
+@pytest.mark.parametrize('frozen', [False, True])
+def test_indexedtable_setitem_delitem_iadd(frozen):
+    rows = [[str(i), 'even' if i % 2 == 0 else 'odd', str(i % 3)] for i in range(12)]
+    it = IT(rows, columns={'A': 0, 'B': 1, 'C': 2}, frozen=frozen, column_index=True, range_columns={'A': int})
+    expected = [list(row) for row in rows]
+
+    def check():
+        fresh = IT(expected, columns=it.columns, frozen=frozen, column_index=True, range_columns={'A': int})
+        assert it == fresh
+        for key in {cell for row in expected for cell in row} | {'gone'}:
+            assert list(it.indices_of_search(key)) == list(fresh.indices_of_search(key))
+        assert list(it.indices_of_correlation(('B', 'odd'), ('C', '1'))) == \
+            list(fresh.indices_of_correlation(('B', 'odd'), ('C', '1')))
+        assert list(it.indices_of_range('A', 3, 30)) == list(fresh.indices_of_range('A', 3, 30))
+
+    for target in (it, expected):
+        target[0] = ['new', 'odd', '1']
+    assert list(it.indices_of_search('new')) == [0] and list(it.indices_of_search('0')) == [3, 6, 9]
+    check()
+    for target in (it, expected):
+        target += [['20', 'even', '2'], ['21', 'odd', '0']]
+    assert list(it.indices_of_search('21')) == [13]
+    check()
+    for target in (it, expected):
+        del target[0]
+    assert list(it.indices_of_search('new')) == []
+    check()
+    for target in (it, expected):
+        target[2:5] = [['30', 'odd', '1']]
+        target[-2] = ['31', 'even', '2']
+        target[::4] = [['40', 'odd', '1']] * len(target[::4])
+        target[len(target):] = [['50', 'even', '0']]
+        del target[1:3]
+        del target[::-3]
+        del target[-1]
+    check()
+    with pytest.raises(ValueError):
+        it[::2] = [['x', 'y', 'z']]
+    with pytest.raises(IndexError):
+        it[100] = ['x', 'y', 'z']
+    with pytest.raises(IndexError):
+        del it[100]
+    del it[:]
+    assert it == [] and list(it.indices_of_search('odd')) == []
+
+
+def test_indexedtable_top_k_ties():
+    rows = [[str(i), str((i * 37) % 4)] for i in range(20)]
+    tables = [IT(rows, columns={'ID': 0, 'N': 1}, range_columns=range_columns) for range_columns in (None, {'N': int})]
+    for it in tables:
+        it.insert(0, ['first', '3'])
+        it.insert(5, ['middle', '0'])
+        it.sort_by_column('ID', str, reverse=True)
+        it.append(['last', '3'])
+    plain = CustomDataStructures.KeyedTable(list(tables[0]), columns={'ID': 0, 'N': 1})
+    for reverse in (False, True):
+        for k in (1, 4, 7, 30):
+            expected = list(plain.indices_of_top_k('N', k, int, reverse))
+            for it in tables:
+                assert list(it.indices_of_top_k('N', k, int, reverse)) == expected
+        expected = list(plain.indices_of_top_k('N', 7, int, reverse))
+        ranked = tables[1].indices_of_largest('N', 7) if reverse else tables[1].indices_of_smallest('N', 7)
+        assert list(ranked) == expected
@@ -0,0 +1,64 @@
+from PyCustomCollections.CustomDataStructures import IndexedTable, IndexedTableView
+
+
+table = [['Alice', 'Admin', 'Paris'],
+         ['Bob', 'User', 'London'],
+         ['Carol', 'Admin', 'London'],
+         ['Dave', 'User', 'Paris'],
+         ['Erin', 'Admin', 'Berlin']]
+table_columns = {'Name': 0, 'Role': 1, 'City': 2}
+
+
+def test_indexedtableview_search():
+    it = IndexedTable(table, columns=table_columns, lazy=True)
+    view = it.search('Admin')
+    assert isinstance(view, IndexedTableView)
+    assert view.rows == [0, 2, 4]
+    assert len(view) == 3
+    assert view == [table[0], table[2], table[4]]
+    assert view[1] == table[2]
+    assert view[-1] == table[4]
+    assert view[1:].rows == [2, 4]
+    assert view['Name'] == ['Alice', 'Carol', 'Erin']
+    assert view.get('Cheese', default='Test') == 'Test'
+    assert view.get_cell(1, 'City') == 'London'
+    assert list(view.iter_row(0)) == table[0]
+    assert str(view) == 'Alice Admin Paris\nCarol Admin London\nErin Admin Berlin'
+    assert it.search('Admin', lazy=False) == view
+
+
+def test_indexedtableview_chained():
+    it = IndexedTable(table, columns=table_columns)
+    view = it.search('Admin', lazy=True)
+    assert view.search('London') == [table[2]]
+    assert list(view.indices_of_search('London', 'Berlin')) == [1, 2]
+    assert view.search_by_column('City', 'Paris').rows == [0]
+    assert view.correlation(('Role', 'Admin'), ('City', 'London')).rows == [2]
+    assert view.value_by_keyword('Bob') == []
+    assert view.has_value('Erin') is True
+    assert view.has_value('Dave') is False
+    assert view.has_pair('City', 'Berlin') is True
+    assert view.has_pair('City', 'lon', explicit=False, ignore_case=True) is True
+    assert view.fuzzy_search('Londn').rows == [2]
+    assert view.search('London').search('Carol').rows == [2]
+
+
+def test_indexedtableview_materialize():
+    it = IndexedTable(table, columns=table_columns)
+    view = it.search('London', lazy=True)
+    materialized = view.materialize()
+    assert isinstance(materialized, IndexedTable)
+    assert materialized.columns == table_columns
+    assert materialized.has_value('Bob') is True
+    assert view.materialize(convert=False) == [table[1], table[2]]
+    assert isinstance(view.search('Bob', lazy=False), IndexedTable)
+    assert view.search('Bob', lazy=False, convert=False) == [table[1]]
+
+
+def test_indexedtableview_empty():
+    it = IndexedTable(table, columns=table_columns, lazy=True)
+    view = it.search('Nobody')
+    assert len(view) == 0
+    assert not view
+    assert view == []
+    assert it.incomplete_row_search('Nobody here today') == []
@@ -1,4 +1,8 @@
-from PyCustomCollections.CustomDataStructures import KeyedTable
+import io
+import pickle
+import pytest
+from PyCustomCollections import CustomDataStructures
+from PyCustomCollections.CustomDataStructures import KeyedTable, IndexedTable, Tokenizer
 from collections.abc import Iterable
 
 
@@ -73,3 +77,187 @@ def test_keytable_sort_by_column():
     kt = KeyedTable([['4', '5', '6'], ['7', '8', '9'], ['1', '2', '3']], columns={'One': 0, 'Two': 1, 'Three': 3})
     kt.sort_by_column('One', str, reverse=True)
     assert kt[0] == ['7', '8', '9']
+
+
+def test_keyedtable_indices_of_where(monkeypatch):
+    rows = [['1', '12.5', '4096'], ['2', '0.0', '-'], ['3', '55.1', '1024'], ['4', '12.5', '8192']]
+    for np in (CustomDataStructures.np, None):
+        monkeypatch.setattr(CustomDataStructures, 'np', np)
+        kt = KeyedTable([list(row) for row in rows], columns={'PID': 0, '%CPU': 1, 'RSS': 2})
+        assert list(kt.indices_of_where('%CPU', '==', 12.5)) == [0, 3]
+        assert list(kt.indices_of_where('%CPU', '>', '10')) == [0, 2, 3]
+        assert list(kt.indices_of_where('RSS', '!=', 1024, int)) == [0, 3]
+        assert list(kt.indices_of_where('RSS', 'between', (1024, 4096), int)) == [0, 2]
+        assert list(kt.indices_of_where('PID', 'isin', ('2', '4'), int)) == [1, 3]
+        assert kt.typed_column('PID', int) is kt.typed_column('PID', int)
+        kt.append(['5', '99.9', '2048'])
+        assert list(kt.indices_of_where('%CPU', '>', 50)) == [2, 4]
+        kt.sort_by_column('RSS', str)
+        kt.sort_by_column('%CPU', float, reverse=True)
+        assert kt['PID'] == ['5', '3', '1', '4', '2']
+        with pytest.raises(ValueError):
+            kt.indices_of_where('PID', '=~', 1)
+
+
+def test_keyedtable_ingest():
+    ps = b'ps output\nUSER PID %CPU COMMAND\nroot 1 0.0 /sbin/init splash\n\nryan 42 12.5 python -m http.server\n'
+    kt = KeyedTable()
+    assert kt.ingest(io.BytesIO(ps), header=True, skip=1) == 2
+    assert kt.columns == {'USER': 0, 'PID': 1, '%CPU': 2, 'COMMAND': 3}
+    assert kt['COMMAND'] == ['/sbin/init splash', 'python -m http.server']
+    it = IndexedTable()
+    lines = ['10:0%d [%s] event %d\n' % (i, 'WARN' if i % 3 else 'INFO', i) for i in range(10)]
+    assert it.ingest(lines, Tokenizer(pattern=r'(?P<TIME>\S+) \[(?P<LEVEL>\w+)\] (?P<MSG>.*)'), batch_size=4) == 10
+    assert it.columns == {'TIME': 0, 'LEVEL': 1, 'MSG': 2}
+    assert list(it.indices_of_search_by_column('LEVEL', 'INFO')) == [0, 3, 6, 9]
+
+
+def test_keyedtable_frozen_and_records():
+    kt = KeyedTable([['root', '1'], ['www', '20']], columns={'USER': 0, 'PID': 1}, frozen=True)
+    kt.append(['cron', '31'])
+    kt.insert(0, ['init', '0'])
+    kt[1] = ['sshd', '5']
+    kt += [['bash', '7']]
+    assert kt.row_type is tuple and all(type(row) is tuple for row in kt)
+    assert ['www', '20'] in kt and kt.index(['cron', '31']) == 3 and kt.count(('bash', '7')) == 1
+    kt.remove(['www', '20'])
+    with pytest.raises(TypeError):
+        kt[0][0] = 'changed'
+    kt.sort_by_column('PID', int)
+    assert kt['USER'] == ['init', 'sshd', 'bash', 'cron']
+
+    rt = KeyedTable([['root', '1', 'x'], ['www']], columns={'USER': 0, 'PID': 1, 'count': 2, 'not valid': 2},
+                    records=True)
+    assert isinstance(rt[0], tuple) and rt[0] == ('root', '1', 'x')
+    assert rt[0].USER == 'root' and rt[0].PID == '1' and rt[1].USER == 'www'
+    assert rt[0].count('x') == 1
+    with pytest.raises(AttributeError):
+        rt[0].USER = 'changed'
+    assert type(pickle.loads(pickle.dumps(rt[0]))) is rt.row_type
+    assert KeyedTable(columns={'USER': 0, 'PID': 1, 'count': 2, 'not valid': 2}, records=True).row_type is rt.row_type
+
+
+
+def test_keyedtable_typed_column_beyond_int64(monkeypatch):
+    big = 2 ** 63
+    rows = [['a', str(big + 1)], ['b', str(big)], ['a', '5'], ['b', str(big)]]
+    for np in (CustomDataStructures.np, None):
+        monkeypatch.setattr(CustomDataStructures, 'np', np)
+        kt = KeyedTable([list(row) for row in rows], columns={'USER': 0, 'ID': 1})
+        assert list(kt.typed_column('ID', int)) == [big + 1, big, 5, big]
+        assert list(kt.indices_of_where('ID', '==', big, int)) == [1, 3]
+        assert list(kt.indices_of_top_k('ID', 2, int, reverse=True)) == [0, 1]
+        assert kt.group_by('USER').sum('ID', int)['sum(ID)'] == [big + 6, 2 * big]
+        kt.sort_by_column('ID', int)
+        assert kt['ID'] == ['5', str(big), str(big), str(big + 1)]
+        kt.append(['c', '-'])
+        assert list(kt.typed_column('ID', int)) == [5, big, big, big + 1, None]
+        assert kt.group_by('USER').max('ID', int)['max(ID)'] == [big + 1, big, None]
+
+
+def test_keyedtable_group_by(monkeypatch):
+    rows = [['root', '1', '4096'], ['www', '20', '-'], ['root', '31', '1024'], ['db', '7', '8192'], ['www', '9', '2']]
+    outputs = []
+    for np in (CustomDataStructures.np, None):
+        monkeypatch.setattr(CustomDataStructures, 'np', np)
+        kt = KeyedTable([list(row) for row in rows], columns={'USER': 0, 'PID': 1, 'RSS': 2})
+        grouped = kt.group_by('USER')
+        assert len(grouped) == 3 and grouped.keys == ['db', 'root', 'www']
+        result = grouped.agg('count', ('sum', 'RSS', int), ('mean', 'RSS'), ('count', 'RSS'), ('distinct', 'PID'),
+                             top=('max', 'RSS', int), low=('min', 'PID', int))
+        assert isinstance(result, KeyedTable)
+        assert result.columns == {'USER': 0, 'count': 1, 'sum(RSS)': 2, 'mean(RSS)': 3, 'count(RSS)': 4,
+                                  'distinct(PID)': 5, 'top': 6, 'low': 7}
+        assert result == [['db', 1, 8192, 8192.0, 1, 1, 8192, 7],
+                          ['root', 2, 5120, 2560.0, 2, 2, 4096, 1],
+                          ['www', 2, 2, 2.0, 1, 2, 2, 9]]
+        assert result['sum(RSS)'] == [8192, 5120, 2]
+        by_pid = kt.group_by('PID').agg(('sum', 'RSS', int), ('min', 'RSS', int), ('sum', 'RSS'), ('mean', 'RSS', int))
+        assert by_pid['sum(RSS)'] == [4096, 0, 1024, 8192, 2] and by_pid[1][2] is None
+        outputs.append([result, by_pid])
+        assert kt.group_by('USER', sort=False).count() == [['root', 2], ['www', 2], ['db', 1]]
+        assert kt.group_by('PID').min('RSS')['min(RSS)'] == [4096.0, None, 1024.0, 8192.0, 2.0]
+        assert kt.group_by('USER').sum('PID', int)['sum(PID)'] == [7, 32, 29]
+        assert KeyedTable([]).group_by(0).agg('count', ('max', 1)) == []
+        kt.append(['db', '8', '1'])
+        with pytest.raises(RuntimeError):
+            grouped.agg('count')
+        with pytest.raises(ValueError):
+            kt.group_by('USER').agg('median')
+        with pytest.raises(ValueError):
+            kt.group_by('USER').agg(('sum',))
+    assert outputs[0] == outputs[1]
+    assert [[[type(cell) for cell in row] for row in output] for output in outputs[0]] == \
+        [[[type(cell) for cell in row] for row in output] for output in outputs[1]]
+
+
+def test_keyedtable_join():
+    ps = KeyedTable([['root', '1', 'init'], ['www', '20', 'nginx'], ['root', '31', 'sshd'], ['db', '7']],
+                    columns={'USER': 0, 'PID': 1, 'COMMAND': 2})
+    netstat = KeyedTable([['tcp', '80', '20'], ['tcp', '22', '31'], ['udp', '53', '99'], ['tcp', '443', '20']],
+                         columns={'PROTO': 0, 'PORT': 1, 'PID': 2})
+    joined = ps.join(netstat, on='PID')
+    assert isinstance(joined, KeyedTable)
+    assert joined.columns == {'USER': 0, 'PID': 1, 'COMMAND': 2, 'PROTO': 3, 'PORT': 4}
+    assert joined == [['www', '20', 'nginx', 'tcp', '80'], ['www', '20', 'nginx', 'tcp', '443'],
+                      ['root', '31', 'sshd', 'tcp', '22']]
+    assert joined['PORT'] == ['80', '443', '22']
+    assert netstat.join(ps, on=('PID', 'PID')) == [['tcp', '80', '20', 'www', 'nginx'], ['tcp', '22', '31', 'root', 'sshd'],
+                                                   ['tcp', '443', '20', 'www', 'nginx']]
+    assert ps.join(netstat, on='PID', how='left') == [['root', '1', 'init', None, None],
+                                                      ['www', '20', 'nginx', 'tcp', '80'],
+                                                      ['www', '20', 'nginx', 'tcp', '443'],
+                                                      ['root', '31', 'sshd', 'tcp', '22'],
+                                                      ['db', '7', None, None, None]]
+    assert ps.join(ps, on='PID').columns == {'USER': 0, 'PID': 1, 'COMMAND': 2, 'USER_right': 3, 'COMMAND_right': 4}
+    assert ps.join(KeyedTable([]), on=('PID', 0), how='left')[0] == ['root', '1', 'init']
+    with pytest.raises(ValueError):
+        ps.join(netstat, on='PID', how='outer')
+    suffixed = KeyedTable([['root', '1', 'init', 'x']], columns={'USER': 0, 'PID': 1, 'COMMAND': 2, 'USER_right': 3})
+    with pytest.raises(ValueError, match='USER_right'):
+        suffixed.join(ps, on='PID')
+    with pytest.raises(ValueError, match='USER_right'):
+        ps.join(KeyedTable([['1', 'a', 'b']], columns={'PID': 0, 'USER_right': 1, 'USER': 2}), on='PID')
+    assert suffixed.join(ps, on='PID', suffix='_ps').columns == {'USER': 0, 'PID': 1, 'COMMAND': 2, 'USER_right': 3,
+                                                                  'USER_ps': 4, 'COMMAND_ps': 5}
+
+
+def test_keyedtable_join_short_rows():
+    ps = KeyedTable([['root', '1', 'init'], ['www'], ['db', '7']], columns={'USER': 0, 'PID': 1, 'COMMAND': 2})
+    netstat = KeyedTable([['tcp', '80', '7'], ['udp'], ['tcp', '22', '1', 'x']], columns={'PROTO': 0, 'PORT': 1, 'PID': 2})
+    assert ps.join(netstat, on='PID') == [['root', '1', 'init', 'tcp', '22', 'x'], ['db', '7', None, 'tcp', '80', None]]
+    assert ps.join(netstat, on='PID', how='left') == [['root', '1', 'init', 'tcp', '22', 'x'],
+                                                      ['www', None, None, None, None, None],
+                                                      ['db', '7', None, 'tcp', '80', None]]
+    assert netstat.join(ps, on='PID') == [['tcp', '80', '7', None, 'db', None], ['tcp', '22', '1', 'x', 'root', 'init']]
+    assert KeyedTable([['1']] * 5).join(netstat, on=(0, 'PID')) == [['1', 'tcp', '22', 'x']] * 5
+    assert KeyedTable([['7'], ['1']]).join(netstat, on=(0, 'PID')) == [['7', 'tcp', '80', None],
+                                                                     ['1', 'tcp', '22', 'x']]
+    indexed = IndexedTable(list(netstat), columns=netstat.columns, column_index=True)
+    assert ps.join(indexed, on='PID') == ps.join(netstat, on='PID')
+    assert KeyedTable([['7'], ['1']]).join(indexed, on=(0, 'PID'), how='left') == [['7', 'tcp', '80', None],
+                                                                                 ['1', 'tcp', '22', 'x']]
+
+
+def test_keyedtable_top_k(monkeypatch):
+    rows = [['1', '12.5'], ['2', '-'], ['3', '55.1'], ['4', '12.5'], ['5', '0.5'], ['6', '99.9'], ['7', '12.5']]
+    for np in (CustomDataStructures.np, None):
+        monkeypatch.setattr(CustomDataStructures, 'np', np)
+        kt = KeyedTable([list(row) for row in rows], columns={'PID': 0, '%CPU': 1})
+        assert list(kt.indices_of_top_k('%CPU', 3)) == [4, 0, 3]
+        assert list(kt.indices_of_top_k('%CPU', 3, reverse=True)) == [5, 2, 0]
+        assert list(kt.indices_of_top_k('%CPU', 4, reverse=True)) == [5, 2, 0, 3]
+        assert list(kt.indices_of_top_k('%CPU', 10)) == [4, 0, 3, 6, 2, 5]
+        assert list(kt.indices_of_top_k('PID', 2, int, reverse=True)) == [6, 5]
+        assert list(kt.indices_of_top_k('%CPU', 0)) == []
+        top = kt.top_k('%CPU', 2, reverse=True)
+        assert isinstance(top, KeyedTable) and top.columns == kt.columns
+        assert top == [['6', '99.9'], ['3', '55.1']]
+        assert kt.nlargest('%CPU', 2) == top
+        assert kt.nsmallest('PID', 2, int) == [['1', '12.5'], ['2', '-']]
+        with pytest.raises(TypeError):
+            kt.nsmallest('PID', 2, int, reverse=True)
+        assert kt == rows
+        sorted_kt = KeyedTable([list(row) for row in rows if row[1] != '-'], columns=kt.columns)
+        sorted_kt.sort_by_column('%CPU', float, reverse=True)
+        assert kt.top_k('%CPU', 6, reverse=True) == sorted_kt
@@ -0,0 +1,86 @@
+import pickle
+
+import pytest
+
+from PyCustomCollections import CustomDataStructures
+from PyCustomCollections.CustomDataStructures import MappedTable, MappedIndexedTable, KeyedTable, Tokenizer, IndexedTable
+
+
+log = ('# generated by ps\r\n'
+       'USER PID COMMAND\r\n'
+       'root 1 /sbin/init splash\r\n'
+       '\r\n'
+       'www 20 nginx: worker\r\n'
+       'root 31 sshd\r\n')
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'ps.txt'
+    path.write_bytes(log.encode())
+    return path
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_mappedtable(path, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(CustomDataStructures, 'np', None)
+    with MappedTable(path, header=True, skip=1) as mt:
+        assert isinstance(mt, KeyedTable)
+        assert mt.columns == {'USER': 0, 'PID': 1, 'COMMAND': 2}
+        assert len(mt) == 3
+        assert mt == [['root', '1', '/sbin/init splash'], ['www', '20', 'nginx: worker'], ['root', '31', 'sshd']]
+        assert mt[-1] == ['root', '31', 'sshd']
+        assert mt[1:] == [['www', '20', 'nginx: worker'], ['root', '31', 'sshd']]
+        assert mt['USER'] == ['root', 'www', 'root']
+        assert mt.get_cell(1, 'PID') == '20'
+        assert ['www', '20', 'nginx: worker'] in mt
+        assert mt.count(['root', '31', 'sshd']) == 1
+        assert list(mt.indices_of_where('PID', '>', 10)) == [1, 2]
+        with pytest.raises(TypeError):
+            mt.append(['root', '40', 'cron'])
+        with pytest.raises(TypeError):
+            mt.sort_by_column('PID')
+        copied = mt.copy()
+    assert copied == [['root', '1', '/sbin/init splash'], ['www', '20', 'nginx: worker'], ['root', '31', 'sshd']]
+    assert not MappedTable(path, skip=10)
+
+
+def test_mappedtable_empty_and_tokenizer(tmp_path):
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert len(MappedTable(empty)) == 0
+    csv = tmp_path / 'data.csv'
+    csv.write_bytes(b'a,b\n1,2\n3,4')
+    mt = MappedTable(csv, tokenizer=Tokenizer(delimiter=','), header=True)
+    assert mt == [['1', '2'], ['3', '4']]
+    assert mt['b'] == ['2', '4']
+
+
+def test_mappedindexedtable(path):
+    mit = MappedIndexedTable(path, header=True, skip=1, range_columns={'PID': float})
+    assert mit.search('root') == [['root', '1', '/sbin/init splash'], ['root', '31', 'sshd']]
+    assert list(mit.indices_of_correlation(('USER', 'root'), ('PID', '31'))) == [2]
+    assert list(mit.indices_of_range('PID', 10, 40)) == [1, 2]
+    with pytest.raises(TypeError):
+        mit.append(['root', '40', 'cron'])
+    with pytest.raises(TypeError):
+        mit.pop()
+    mit.close()
+
+
+def test_mappedtable_pickle(path, tmp_path):
+    rows = [['root', '1', '/sbin/init splash'], ['www', '20', 'nginx: worker'], ['root', '31', 'sshd']]
+    mt = MappedTable(path, header=True, skip=1)
+    copied = pickle.loads(pickle.dumps(mt))
+    assert type(copied) is MappedTable and copied == rows and copied.columns == mt.columns
+    mit = MappedIndexedTable(path, header=True, skip=1, range_columns={'PID': float}, column_index=True)
+    copied = pickle.loads(pickle.dumps(mit))
+    assert type(copied) is MappedIndexedTable and copied == rows and copied.column_index is True
+    assert copied.search('root') == [rows[0], rows[2]]
+    assert list(copied.indices_of_range('PID', 10, 40)) == [1, 2]
+    mit.save(tmp_path / 'ps.snapshot')
+    loaded = MappedIndexedTable.load(tmp_path / 'ps.snapshot')
+    assert type(loaded) is IndexedTable and loaded == rows and loaded.search('www') == [rows[1]]
+    mt.close()
+    assert pickle.loads(pickle.dumps(mt)) == []
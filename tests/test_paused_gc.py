@@ -0,0 +1,58 @@
+import gc
+import threading
+
+from PyCustomCollections.CustomDataStructures import IndexedTable, paused_gc
+
+
+def test_paused_gc_overlapping():
+    assert gc.isenabled()
+    first, second = paused_gc(), paused_gc()
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    assert not gc.isenabled()
+    second.__exit__(None, None, None)
+    assert gc.isenabled()
+
+
+def test_paused_gc_threads():
+    entered, release = threading.Barrier(3), threading.Event()
+
+    def pause():
+        with paused_gc():
+            entered.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=pause) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+    assert not gc.isenabled()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert gc.isenabled()
+
+
+def test_paused_gc_already_disabled():
+    gc.disable()
+    try:
+        with paused_gc():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_paused_gc_indexedtable(monkeypatch):
+    pauses = []
+    monkeypatch.setattr(gc, 'disable', lambda: pauses.append(True))
+    monkeypatch.setattr(IndexedTable, 'gc_threshold', 10)
+    it = IndexedTable([['a', str(i)] for i in range(5)])
+    for i in range(20):
+        it.append(['b', str(i)])
+    it.extend([['c', str(i)] for i in range(20)])
+    it.group_by(0).count()
+    assert pauses == []
+    it.build_index()
+    assert pauses == [True]
@@ -0,0 +1,48 @@
+import pytest
+from PyCustomCollections.CustomDataStructures import PostingsArray, PostingsBitmap
+
+
+def test_postingsarray_add_discard():
+    pa = PostingsArray()
+    for row in (5, 1, 9, 5, 3):
+        pa.add(row)
+    assert list(pa) == [1, 3, 5, 9]
+    assert 5 in pa
+    assert 4 not in pa
+    pa.discard(4)
+    pa.discard(5)
+    assert list(pa) == [1, 3, 9]
+    pa.remove(1)
+    with pytest.raises(KeyError):
+        pa.remove(1)
+    assert list(pa.union({2, 9})) == [2, 3, 9]
+
+
+def test_postingsarray_bits():
+    assert PostingsArray([0, 3, 9]).bits == 0b1000001001
+    assert PostingsArray().bits == 0
+
+
+def test_postingsbitmap_encode_decode():
+    rows = [0, 7, 8, 15, 64, 1000, 1001]
+    bits = PostingsBitmap.encode(rows)
+    assert PostingsBitmap.decode(bits) == rows
+    assert PostingsBitmap.decode(0) == []
+    assert list(PostingsBitmap(rows)) == rows
+    assert len(PostingsBitmap(rows)) == len(rows)
+
+
+def test_postingsbitmap_add_discard():
+    pb = PostingsBitmap([1, 2])
+    pb.add(10)
+    assert 10 in pb
+    assert -1 not in pb
+    pb.discard(2)
+    pb.discard(3)
+    assert list(pb) == [1, 10]
+    pb.remove(1)
+    with pytest.raises(KeyError):
+        pb.remove(1)
+    assert bool(PostingsBitmap()) is False
+    assert list(pb.union(PostingsArray([4]))) == [4, 10]
+    assert list(pb.union([5])) == [5, 10]
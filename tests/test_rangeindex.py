@@ -0,0 +1,42 @@
+import pytest
+
+from PyCustomCollections.CustomDataStructures import RangeIndex
+
+
+def test_rangeindex_between():
+    ri = RangeIndex([('3', 0), ('1', 1), ('x', 2), ('2', 3), ('nan', 4), ('2', 5)], column_type=float)
+    assert len(ri) == 4
+    assert list(ri.items()) == [(1.0, 1), (2.0, 3), (2.0, 5), (3.0, 0)]
+    assert ri.between(2, 3) == [3, 5, 0]
+    assert ri.between('2', None, include_low=False) == [0]
+    assert ri.between(None, 2, include_high=False) == [1]
+    assert ri.between(3, 1) == []
+    assert ri.smallest(2) == [1, 3]
+    assert ri.largest(2) == [0, 3]
+    assert ri.largest(3) == [0, 3, 5] and list(map(sorted, ri.groups(largest=True))) == [[0], [3, 5], [1]]
+    assert (ri.min(), ri.max()) == (1.0, 3.0)
+
+
+def test_rangeindex_add_discard():
+    ri = RangeIndex(column_type=int)
+    ri.load = 2
+    ri.update((str(value), value) for value in range(10))
+    ri.add('4', 10)
+    ri.update([('-1', 11), ('20', 12)])
+    ri.discard('4', 4)
+    ri.discard('7', 99)
+    assert [key for key, _ in ri.items()] == [-1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 20]
+    assert ri.between(4, 4) == [10]
+    assert all(len(keys) <= 2 * ri.load for keys in ri.keys)
+    ri.remap(lambda rowId: rowId + 100)
+    assert ri.largest(1) == [112]
+    assert RangeIndex().min('empty') == 'empty'
+
+
+def test_rangeindex_between_bad_bound():
+    ri = RangeIndex([('3', 0), ('1', 1)], column_type=int)
+    with pytest.raises(ValueError, match="low bound 'x'"):
+        ri.between('x', 3)
+    with pytest.raises(ValueError, match="high bound 'nan'"):
+        RangeIndex([('3', 0)]).between(None, 'nan')
+    assert ri.between('1', '3') == [1, 0]
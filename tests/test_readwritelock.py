@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from PyCustomCollections.CustomDataStructures import ReadWriteLock
+
+
+def test_readwritelock_reentrant():
+    lock = ReadWriteLock()
+    with lock.reading():
+        with lock.reading():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.writing():
+        with lock.writing():
+            with lock.reading():
+                pass
+
+
+def test_readwritelock_readers_share_writers_wait():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+    events = []
+
+    def reader():
+        with lock.reading():
+            inside.wait()
+            events.append('read')
+
+    def writer():
+        with lock.writing():
+            events.append('write')
+
+    with lock.reading():
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        inside.wait()
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+    for thread in readers + [thread]:
+        thread.join(5)
+    assert events == ['read', 'read', 'write']
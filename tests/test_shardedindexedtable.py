@@ -0,0 +1,118 @@
+import pytest
+
+from PyCustomCollections.CustomDataStructures import ShardedIndexedTable, IndexedTable, IndexedTableView, KeyedTable
+
+
+table = [['Alice', 'Admin', 'Paris', '31'],
+         ['Bob', 'User', 'London', '25'],
+         ['Carol', 'Admin', 'London', '47'],
+         ['Dave', 'User', 'Paris', '25'],
+         ['Erin', 'Admin', 'Berlin', '52'],
+         ['Frank', 'Guest', 'Paris', '19'],
+         ['Gina', 'User', 'Berlin', '38']]
+table_columns = {'Name': 0, 'Role': 1, 'City': 2, 'Age': 3}
+
+
+@pytest.fixture(params=[None, 'City'])
+def sit(request):
+    with ShardedIndexedTable(table, columns=table_columns, shards=3, shard_by=request.param,
+                             column_index=True, range_columns={'Age': int}) as sit:
+        yield sit
+
+
+def test_shardedindexedtable_rows(sit):
+    assert isinstance(sit, KeyedTable)
+    assert len(sit) == 7
+    assert sit == table
+    assert sit[0] == table[0]
+    assert sit[-1] == table[-1]
+    assert sit[2:5] == table[2:5]
+    assert sit['Name'] == [row[0] for row in table]
+    assert sit.get_cell(3, 'City') == 'Paris'
+    assert list(reversed(sit)) == table[::-1]
+    assert table[4] in sit
+    assert sit.index(table[4]) == 4
+    assert sit.count(table[4]) == 1
+    assert sit.copy() == IndexedTable(table, columns=table_columns)
+    with pytest.raises(IndexError):
+        sit[7]
+
+
+def test_shardedindexedtable_search(sit):
+    it = IndexedTable(table, columns=table_columns, column_index=True, range_columns={'Age': int})
+    assert sit.has_value('Berlin') and not sit.has_value('Rome')
+    assert sit.has_pair('Role', 'Guest') and not sit.has_pair('Role', 'Paris')
+    assert sit.search('Paris') == it.search('Paris')
+    assert sit.search('Admin', 'Paris', AND=True) == it.search('Admin', 'Paris', AND=True)
+    assert sit.search_by_column('City', ('Paris', 'Berlin')) == it.search_by_column('City', ('Paris', 'Berlin'))
+    assert sit.search_by_column('City', 'paris', ignore_case=True) == it.search_by_column('City', 'Paris')
+    assert sit.correlation(('City', 'London'), ('Role', 'Admin')) == [['Carol', 'Admin', 'London', '47']]
+    assert list(sit.indices_of_search('Paris', ordered=False)) != []
+    assert sit.value_by_keyword('User') == it.value_by_keyword('User')
+    assert sit.where('Age', '>', 30, int) == it.where('Age', '>', 30, int)
+    assert sit.range_search('Age', 25, 40) == it.range_search('Age', 25, 40)
+    assert list(sit.indices_of_smallest('Age', 3)) == list(it.indices_of_smallest('Age', 3))
+    assert list(sit.indices_of_largest('Age', 3)) == list(it.indices_of_largest('Age', 3))
+    assert (sit.min_value('Age'), sit.max_value('Age')) == (19, 52)
+    assert sit.incomplete_row_search('Dave User Paris 99') == it.incomplete_row_search('Dave User Paris 99')
+    assert sit.fuzzy_has_value('Pariss') and sit.fuzzy_get_values('Pariss') == it.fuzzy_get_values('Pariss')
+    assert sit.fuzzy_get_pairs('Name', 'Erinn') == it.fuzzy_get_pairs('Name', 'Erinn')
+    assert sit.fuzzy_search('Londn') == it.fuzzy_search('Londn')
+    assert sit.fuzzy_column('City', 'Berln') == it.fuzzy_column('City', 'Berln')
+    assert sit.fuzzy_correlation(('City', 'Pariss'), ('Role', 'Usr')) == it.fuzzy_correlation(('City', 'Pariss'),
+                                                                                               ('Role', 'Usr'))
+    view = sit.search('Admin', lazy=True)
+    assert isinstance(view, IndexedTableView)
+    assert view.search('London', lazy=False, convert=False) == [['Carol', 'Admin', 'London', '47']]
+    assert isinstance(sit.search('Admin', convert=False), list)
+
+
+def test_shardedindexedtable_changes(sit):
+    sit.append(['Hank', 'Guest', 'Rome', '60'])
+    sit += [['Ivy', 'Admin', 'Rome', '22'], ['Jack', 'User', 'Paris', '33']]
+    assert sit[7:] == [['Hank', 'Guest', 'Rome', '60'], ['Ivy', 'Admin', 'Rome', '22'], ['Jack', 'User', 'Paris', '33']]
+    assert list(sit.indices_of_search('Rome')) == [7, 8]
+    assert list(sit.indices_of_search_by_column('City', 'Paris')) == [0, 3, 5, 9]
+    assert sit.max_value('Age') == 60
+    for method, args in (('insert', (0, table[0])), ('pop', ()), ('remove', (table[0],)), ('sort', ()),
+                         ('reverse', ()), ('__setitem__', (0, table[0])), ('__delitem__', (0,))):
+        with pytest.raises(TypeError):
+            getattr(sit, method)(*args)
+    with pytest.raises(TypeError):
+        sit.sort_by_column('Name')
+    assert sit.search_by_column('Nope', 'Paris') == []
+    assert len(sit) == 10
+    sit.clear()
+    assert not sit and not sit.has_value('Paris')
+    sit.extend(table)
+    assert sit.search('Paris') == [table[0], table[3], table[5]]
+
+
+def test_shardedindexedtable_options():
+    with pytest.raises(TypeError):
+        ShardedIndexedTable(workers=2)
+    with pytest.raises(ValueError):
+        ShardedIndexedTable(shards=0)
+    sit = ShardedIndexedTable(table, columns=table_columns, shards=2, ignore_case=True, cache_size=8)
+    assert sit.search('paris', convert=False) == [table[0], table[3], table[5]]
+    assert sit.search_by_column('City', 'paris', convert=False) == [table[0], table[3], table[5]]
+    sit.search('paris')
+    assert (sit.cache_info().hits, sit.cache_info().misses) == (2, 4) and sit.cache_info().cache_size == 16
+    sit.close()
+    with pytest.raises(ValueError):
+        sit.search('Paris')
+    with ShardedIndexedTable(table, columns=table_columns, shards=4, shard_by='City', cache_size=8) as sit:
+        assert list(sit.indices_of_search_by_column('City', 'Paris')) == [0, 3, 5]
+        assert list(sit.indices_of_correlation(('Role', 'User'), ('City', 'Berlin'))) == [6]
+        assert sit.cache_info().misses == 2
+
+
+def test_shardedindexedtable_top_k(sit):
+    it = IndexedTable(table, columns=table_columns)
+    assert sit.top_k('Age', 3, int, reverse=True) == it.top_k('Age', 3, int, reverse=True)
+    assert list(sit.indices_of_top_k('Age', 3, int)) == [5, 1, 3]
+    assert list(sit.indices_of_smallest('Age', 3)) == [5, 1, 3]
+    sit.append(['Hank', 'Guest', 'Rome', '52'])
+    assert list(sit.indices_of_largest('Age', 3)) == [4, 7, 2]
+    assert list(sit.indices_of_top_k('Age', 3, int, reverse=True)) == [4, 7, 2]
+    assert sit.nsmallest('Age', 2, int, convert=False) == [table[5], table[1]]
@@ -0,0 +1,32 @@
+import pytest
+from array import array
+from PyCustomCollections.CustomDataStructures import SnapshotFile
+
+
+def test_snapshotfile(tmp_path):
+    path = tmp_path / 'data.snapshot'
+    SnapshotFile.write(path, {'small': SnapshotFile.pack([1, 2, 255]), 'signed': SnapshotFile.pack([-1, 300]),
+                              'text': b'hello' * 100}, level=6)
+    with SnapshotFile(path) as snapshot:
+        assert 'text' in snapshot
+        assert snapshot.read('text') == b'hello' * 100
+        assert SnapshotFile.unpack(snapshot.read('small')) == array('B', [1, 2, 255])
+        assert SnapshotFile.unpack(snapshot.read('signed')) == array('h', [-1, 300])
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_snapshotfile_errors(tmp_path):
+    path = tmp_path / 'data.snapshot'
+    path.write_bytes(b'not a snapshot at all')
+    with pytest.raises(ValueError, match='is not a snapshot'):
+        SnapshotFile(path)
+    SnapshotFile.write(path, {'text': b'hello'}, level=0)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='checksum'):
+        SnapshotFile(path).read('text')
+    data[8] += 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match='version'):
+        SnapshotFile(path)
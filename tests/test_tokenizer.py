@@ -0,0 +1,27 @@
+import io
+import pytest
+from PyCustomCollections.CustomDataStructures import Tokenizer, read_rows
+
+
+def test_tokenizer_modes():
+    assert Tokenizer()('root  1  0.0 /sbin/init splash\n') == ['root', '1', '0.0', '/sbin/init', 'splash']
+    assert Tokenizer(maxsplit=3)('root  1  0.0 /sbin/init splash\n') == ['root', '1', '0.0', '/sbin/init splash']
+    assert Tokenizer()('   \n') is None
+    assert Tokenizer(delimiter=',')('a, b ,c\r\n') == ['a', 'b', 'c']
+    assert Tokenizer(delimiter=',', strip=False)('a, b\n') == ['a', ' b']
+    assert Tokenizer(widths=(4, 3, None))('abcdefghijk\n') == ['abcd', 'efg', 'hijk']
+    tokenizer = Tokenizer(pattern=r'(?P<TIME>\S+) \[(?P<LEVEL>\w+)\] (?P<MSG>.*)')
+    assert tokenizer.columns == {'TIME': 0, 'LEVEL': 1, 'MSG': 2}
+    assert tokenizer('10:00 [INFO] started up\n') == ['10:00', 'INFO', 'started up']
+    assert tokenizer('garbage\n') is None
+    with pytest.raises(ValueError):
+        Tokenizer(delimiter=',', widths=(1, 2))
+
+
+def test_tokenizer_read_rows(tmp_path):
+    path = tmp_path / 'test.log'
+    path.write_text('# header\na b\n\nc d\n')
+    assert list(read_rows(path, skip=1)) == [['a', 'b'], ['c', 'd']]
+    assert list(read_rows(str(path), Tokenizer(delimiter=' '), skip=1)) == [['a', 'b'], ['c', 'd']]
+    assert list(read_rows(io.BytesIO(b'caf\xc3\xa9 1\n'))) == [['café', '1']]
+    assert list(read_rows(['x y\n', 'z\n'])) == [['x', 'y'], ['z']]